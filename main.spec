@@ -11,6 +11,28 @@ a = Analysis(
         ('src/calculations.py', '.'), 
         ('src/description_of_variable_hint.py', '.'),
         ('src/img_resource_path.py', '.'),
+        ('src/solver_options.py', '.'),
+        ('src/history_storage.py', '.'),
+        ('src/material_properties.py', '.'),
+        ('src/layers.py', '.'),
+        ('src/boundary_conditions.py', '.'),
+        ('src/heat_sources.py', '.'),
+        ('src/monte_carlo.py', '.'),
+        ('src/convergence_study.py', '.'),
+        ('src/run_workspace.py', '.'),
+        ('src/project_file.py', '.'),
+        ('src/parallel_stencil.py', '.'),
+        ('src/result_plots.py', '.'),
+        ('src/report_generator.py', '.'),
+        ('src/measured_logs.py', '.'),
+        ('src/probes.py', '.'),
+        ('src/events.py', '.'),
+        ('src/solver.py', '.'),
+        ('src/calibration.py', '.'),
+        ('src/result_io.py', '.'),
+        ('src/shared_results.py', '.'),
+        ('src/job_client.py', '.'),
+        ('src/job_server.py', '.'),
         ('img/*.png', 'img'), 
         ('img/*.ico', 'img')],
     hiddenimports=[],
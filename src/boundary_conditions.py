@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+# Типы граничных условий: заданная температура стенки (Дирихле), заданный тепловой
+# поток внутрь материала (Нейман) и теплообмен со средой (Робен)
+BOUNDARY_TYPES = ("temperature", "flux", "convection")
+
+# Виды графиков: кусочно-линейная таблица, ступенчатый график, синусоида
+SCHEDULE_KINDS = ("table", "step", "sine")
+
+
+def load_schedule_csv(filename):
+    """Загрузка графика из CSV (разделитель ";", десятичная запятая).
+
+    Первый столбец - время, с; второй - значение (температура, °C, или
+    тепловой поток, Вт/м²). Возвращает описание кусочно-линейного графика.
+    """
+    df = pd.read_csv(filename, sep=';', decimal=',', encoding='utf-8-sig')
+    if df.shape[1] < 2:
+        raise ValueError("Ожидаются столбцы времени и значения")
+    data = df.iloc[:, :2].dropna().to_numpy(dtype=float)
+    if len(data) == 0:
+        raise ValueError("В файле нет данных графика")
+    return {"kind": "table", "times": data[:, 0].tolist(), "values": data[:, 1].tolist()}
+
+
+def schedule_values(spec, times):
+    """Значения графика spec в моменты times (с).
+
+    spec - число (постоянное значение) или словарь:
+        {"kind": "table", "times": [...], "values": [...]} - линейная интерполяция
+            между точками, за пределами таблицы - крайние значения;
+        {"kind": "step", "times": [...], "values": [...]} - значение values[k]
+            действует с момента times[k] (до первого момента - values[0]);
+        {"kind": "sine", "mean": ..., "amplitude": ..., "period": ..., "phase": 0}
+            - mean + amplitude * sin(2π t / period + phase).
+    Для "table" и "step" ключ "period" (с) повторяет график с этим периодом
+    (например, 86400 для суточного тарифа), ключ "file" - загрузка точек из CSV.
+    """
+    times = np.asarray(times, dtype=float)
+    if not isinstance(spec, dict):
+        return np.full(times.shape, float(spec))
+
+    kind = spec.get("kind", "table")
+    if kind not in SCHEDULE_KINDS:
+        raise ValueError(f"Неизвестный вид графика '{kind}' (ожидается {', '.join(SCHEDULE_KINDS)})")
+
+    if kind == "sine":
+        period = float(spec["period"])
+        if not period > 0:
+            raise ValueError("Период синусоиды должен быть положительным")
+        return float(spec.get("mean", 0.0)) + float(spec.get("amplitude", 0.0)) * np.sin(
+            2 * np.pi * times / period + float(spec.get("phase", 0.0)))
+
+    if "file" in spec:
+        spec = dict(load_schedule_csv(spec["file"]), **{k: v for k, v in spec.items() if k != "file"})
+    points = np.asarray(spec["times"], dtype=float)
+    values = np.asarray(spec["values"], dtype=float)
+    if points.ndim != 1 or points.shape != values.shape or len(points) == 0:
+        raise ValueError("Моменты и значения графика должны быть списками одной длины")
+    order = np.argsort(points, kind='stable')
+    points, values = points[order], values[order]
+
+    if spec.get("period"):
+        times = np.mod(times, float(spec["period"]))
+    if kind == "table":
+        return np.interp(times, points, values)
+    index = np.searchsorted(points, times, side='right') - 1
+    return values[np.maximum(index, 0)]
+
+
+class BoundaryCondition:
+    """Граничное условие на одной стенке реактора.
+
+    Значения графика для всех шагов расчета вычисляются заранее
+    (precompute), поэтому на шаге остается только выборка по номеру шага
+    и стоимость шага не зависит от сложности графика:
+        temperature - values[n] - температура стенки, °C;
+        flux        - values[n] - тепловой поток внутрь материала, Вт/м²;
+        convection  - values[n] - температура среды, °C; h - коэффициент
+                      теплоотдачи, Вт/(м²·K).
+    """
+
+    def __init__(self, spec=None):
+        spec = dict(spec or {})
+        self.kind = spec.pop("type", "temperature")
+        if self.kind not in BOUNDARY_TYPES:
+            raise ValueError(f"Неизвестный тип граничного условия '{self.kind}' "
+                             f"(ожидается {', '.join(BOUNDARY_TYPES)})")
+        self.schedule = spec.pop("schedule", None)
+        self.h = float(spec.pop("h", 0.0))
+        if spec:
+            raise ValueError(f"Неизвестные ключи граничного условия: {', '.join(sorted(spec))}")
+        if self.kind != "temperature" and self.schedule is None:
+            raise ValueError(f"Для условия '{self.kind}' нужен график (ключ schedule)")
+        if self.kind == "convection" and not self.h > 0:
+            raise ValueError("Коэффициент теплоотдачи h должен быть положительным")
+        # Температура на стенке задана (узел стенки не рассчитывается)
+        self.fixed = self.kind == "temperature"
+        # Без графика - постоянная температура стенки T_wall (как раньше)
+        self.default = self.schedule is None
+
+    def precompute(self, times, T_wall, batch_shape):
+        """Значения для моментов times (..., Nt) в форме (Nt,) + batch_shape.
+
+        Постоянные и общие для пакета графики не копируются по пакету
+        (массивы с нулевым шагом).
+        """
+        shape = (len(times),) + batch_shape
+        if self.default:
+            self.values = np.broadcast_to(T_wall, shape)
+            self.initial = T_wall
+        else:
+            values = schedule_values(self.schedule, np.concatenate(([0.0], times)))
+            self.initial = values[0]
+            self.values = np.broadcast_to(values[1:].reshape((-1,) + (1,) * len(batch_shape)), shape)
+        return self.values
+
+    def temperature_range(self):
+        """Диапазон температур, задаваемых условием (None для теплового потока)"""
+        if self.kind == "flux":
+            return None
+        return float(np.min(self.values)), float(np.max(self.values))
+
+    def describe(self):
+        """Краткое описание для вывода и экспорта"""
+        if self.default:
+            return "T_wall"
+        if isinstance(self.schedule, dict):
+            schedule = {"table": "по таблице", "step": "ступенчатый график",
+                        "sine": "синусоида"}[self.schedule.get("kind", "table")]
+        else:
+            schedule = f"{float(self.schedule):g}"
+        if self.kind == "temperature":
+            return f"температура {schedule}"
+        if self.kind == "flux":
+            return f"поток {schedule} Вт/м²"
+        return f"теплообмен h={self.h:g} Вт/(м²·K), среда {schedule}"
@@ -1,18 +1,68 @@
+import gc
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-from PyQt5.QtWidgets import (QVBoxLayout, QFileDialog, QMessageBox)
+from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtWidgets import (QVBoxLayout, QFileDialog, QMessageBox, QInputDialog, QDialog, QDialogButtonBox,
+                             QListWidget, QListWidgetItem, QLineEdit)
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
 import openpyxl
 
+from calibration import load_measured_temperatures, calibrate
+from job_client import JobClient, JobServerError
+from boundary_conditions import load_schedule_csv
+from layers import load_layers_csv
+from material_properties import load_material_csv, load_substrate_library
+from measured_logs import load_measured_log
+from convergence_study import ConvergenceStudy
+from monte_carlo import MonteCarlo
+from project_file import Project, load_project, maps_file, result_in_memory, save_project
+from report_generator import ReportGenerator
+from result_plots import draw_accumulated_energy, draw_temperature_profiles, draw_temperature_slices
+from shared_results import SharedResultBuffer, run_shared
+from solver import HeatSolver, SimulationCancelled, CP_WATER
+from solver_options import load_solver_options
+
+# Рабочий процесс для расчетов вне процесса интерфейса (создается при первом использовании)
+_worker_pool = None
+
+
+def worker_pool():
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = ProcessPoolExecutor(max_workers=1)
+    return _worker_pool
+
+
+# Процессы для серий расчетов - Монте-Карло, проверка сходимости (создаются при первом использовании)
+_calculation_pool = None
+
+
+def calculation_pool(workers=None):
+    global _calculation_pool
+    if _calculation_pool is None:
+        _calculation_pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    return _calculation_pool
+
 class Calculations:
     def __init__(self, main_window):
         self.main_window = main_window
         self.ui = main_window.ui
 
-        # Инициализация параметров и модели
-        self.setup_parameters()
+        # Инициализация параметров и модели. Ошибка в настройках решателя (solver_options.json,
+        # настройки инструментов) не мешает запуску программы: решатель не создается, ошибка
+        # сохраняется в setup_error и повторно возникает при расчете или открытии проекта
+        self.setup_error = None
+        try:
+            self.setup_parameters()
+        except ValueError as e:
+            self.solver = None
+            self.setup_error = e
         
         # Создаем холсты для графиков
         self.setup_graph_widgets()
@@ -20,6 +70,34 @@ class Calculations:
         self.temperature_exported = False
         self.energy_exported = False
         self.all_exported = False
+
+        # Расчет вне процесса интерфейса: в рабочем процессе или на сервере заданий
+        self.shared_buffer = None
+        self.worker_future = None
+        self.job_client = None
+        self.job_id = None
+        # Таймеры опроса фоновых задач: имя метода опроса -> QTimer
+        self.poll_timers = {}
+
+        # Серия расчетов Монте-Карло: незавершенные пакеты и итоговые полосы неопределенности
+        self.monte_carlo_run = None
+        self.monte_carlo_futures = []
+        self.monte_carlo = None
+
+        # Проверка сходимости по сетке: расчеты на сетках, по одному на сетку
+        self.convergence_study = None
+        self.convergence_futures = []
+
+        # Отчет по расчетам рабочей области: задачи рисования графиков
+        self.report = None
+        self.report_futures = []
+
+        # Разбор журнала измерений в рабочем процессе
+        self.measured_future = None
+        self.measured_offset = 0.0
+
+        # Номер текущего расчета в рабочей области (для сравнения с прошлыми расчетами)
+        self.run_id = None
  
     def clear_layout(self, layout):
         """Очистка содержимого layout"""
@@ -88,43 +166,24 @@ class Calculations:
         self.Cp_dry =  self.get_float_value(self.ui.line_edit_heat_capacity.text(), 2500.0)
         self.lambda_dry = self.get_float_value(self.ui.line_edit_thermal_conductivity.text(), 0.1)
         
-        self.Cp_water = 4186.0
-        
-        # Теплопроводности
-        self.lambda_water = 0.6
-        self.b = 1e-3
-        self.T0 = 45
-        
-        # Расчет производных параметров
-        self.Nx = int(self.L / self.dx) + 1 if self.dx > 0 else 101
-        self.Nt = int(self.t_max / self.dt) if self.dt > 0 else 100
-        
-        # Расчет теплоемкости с учетом влажности
-        self.Cp = self.calculate_cp(self.H / 100.0)  # преобразуем % в долю
-        
-        # Расчет базовой теплопроводности
-        self.lambda0 = self.lambda_dry * (1 - self.H / 100.0) + self.lambda_water * (self.H / 100.0)
+        # Настройки решателя (solver_options.json и параметры, подобранные калибровкой)
+        self.options = load_solver_options()
+        self.options.update(getattr(self.main_window, 'solver_option_overrides', {}))
 
-        # Инициализация температурного поля
-        self.T = np.full(self.Nx, self.T_init)
-        self.T[0] = self.T_wall
-        self.T[-1] = self.T_wall
-
-        # Проверка устойчивости
-        self.check_stability()
-
-    def calculate_cp(self, H_fraction):
-        """Расчет удельной теплоемкости с учетом влажности"""
-        return self.Cp_dry * (1 - H_fraction) + self.Cp_water * H_fraction
-
-    def check_stability(self):
-        """Проверка устойчивости явной схемы"""
-        alpha = self.lambda0 / (self.rho * self.Cp)
-        sigma = alpha * self.dt / self.dx**2
-        if sigma > 0.5:
-            print(f"Предупреждение: Схема может быть неустойчивой! Число Куранта = {sigma:.2f} > 0.5")
-            print(f"Рекомендуется уменьшить шаг по времени до {0.5*self.dx**2/alpha:.2f} с")
+        self.params = {
+            "T_wall": self.T_wall, "L": self.L, "T_init": self.T_init, "dt": self.dt,
+            "t_max": self.t_max, "rho": self.rho, "H": self.H, "dx": self.dx,
+            "Cp_dry": self.Cp_dry, "lambda_dry": self.lambda_dry,
+        }
+        self.solver = HeatSolver(self.params, self.options)
 
+        # Производные параметры (длина слоистого реактора - сумма толщин слоев)
+        self.L = self.solver.L
+        self.Cp_water = CP_WATER
+        self.Nx = self.solver.Nx
+        self.Nt = self.solver.Nt
+        self.Cp = float(self.solver.Cp)
+        self.lambda0 = float(self.solver.lambda0)
 
     def get_float_value(self, text, default=0.0):
         """Получение float-значения из текста"""
@@ -137,149 +196,443 @@ class Calculations:
 
 
     def start_calculations(self):
-        """Основной расчетный цикл (без использования площади сечения)"""
+        """Основной расчетный цикл (без использования площади сечения).
+
+        Возвращает True, если расчет выполнен сразу, и False, если он передан
+        рабочему процессу или серверу заданий и результат придет позже.
+        """
         # Обновляем параметры перед расчетом
         self.setup_parameters()
-        
-        # Массивы для результатов
-        self.energy = np.zeros(self.Nt)  # Удельная энергия (Дж/м)
-        self.eta = np.zeros(self.Nt)
-        self.T_history = []
-        self.x = np.linspace(0, self.L, self.Nx)
-        
-        # Переменные для тепловых потоков
-        self.Q_heating = 0.0  # Суммарное удельное подведенное тепло (Дж/м)
-        self.energy_initial = 0.0  # Начальная энергия
-
-        # Расчет начальной энергии
-        for i in range(self.Nx):
-            self.energy_initial += self.rho * self.Cp * (self.T[i] - self.T_init) * self.dx
-
-        # Основной цикл
-        for n in range(self.Nt):
-            # Теплопроводность и коэффициент температуропроводности
-            lambdas = self.lambda0 * (1 + self.b * (self.T - self.T0))
-            alpha = lambdas / (self.rho * self.Cp)
-
-            # Явная схема
-            T_new = self.T.copy()
-            for i in range(1, self.Nx-1):
-                T_new[i] = self.T[i] + alpha[i] * self.dt / self.dx**2 * (self.T[i+1] - 2*self.T[i] + self.T[i-1])
-            
-            # Граничные условия
-            T_new[0] = self.T_wall
-            T_new[-1] = self.T_wall
-            self.T = T_new
-            self.T_history.append(self.T.copy())
-
-            # Тепловые потоки на границах (Вт/м)
-            q_left = -lambdas[0] * (self.T[1] - self.T[0]) / self.dx
-            q_right = -lambdas[-1] * (self.T[-1] - self.T[-2]) / self.dx
-            
-            # Удельное подведенное тепло (Дж/м)
-            dQ_heating = (q_left - q_right) * self.dt
-            self.Q_heating += dQ_heating
-            
-            # Удельная аккумулированная энергия (Дж/м)
-            accumulated_energy = 0.0
-            for i in range(self.Nx):
-                accumulated_energy += self.rho * self.Cp * (self.T[i] - self.T_init) * self.dx
-            self.energy[n] = accumulated_energy - self.energy_initial
-            
-            # КПД системы
-            if self.Q_heating > 0 and self.energy[n] > 0:
-                self.eta[n] = min(1.0, self.energy[n] / self.Q_heating)
-            else:
-                self.eta[n] = 0.0
 
+        if self.options["job_server_url"]:
+            self.start_remote_calculations()
+            return False
+        if self.options["run_in_worker_process"]:
+            self.start_worker_calculations()
+            return False
+
+        self.apply_result(self.solver.run())
+        self.show_results()
+        return True
+
+    def show_results(self):
+        """Вывод результатов расчета в консоль, метки и графики"""
         # Вывод результатов
         print(f"Итоговая аккумулированная энергия: {self.energy[-1]:.2e} Дж/м")
         print(f"Подведённое тепло: {self.Q_heating:.2e} Дж/м")
+        if self.solver.heat_source is not None:
+            print(f"Тепло биологического источника: {self.result.Q_source:.2e} Дж/м "
+                  f"({self.solver.heat_source.describe()})")
         print(f"КПД системы: {self.eta[-1]*100:.2f}%")
         print(f"Количество ячеек: {self.Nx}")
         print(f"Длина ячейки dx: {self.dx:.6f} м")
+        if self.solver.material is not None:
+            print(f"Материал: {self.solver.material.name} (табличные {', '.join(self.solver.material.tables)})")
+        for side, boundary in zip(("левой", "правой"), self.solver.boundaries):
+            if not boundary.default:
+                print(f"Граничное условие на {side} стенке: {boundary.describe()}")
+        for name, layer_energy in zip(self.layer_names, self.layer_energy[-1] if self.layer_names else ()):
+            print(f"Энергия слоя '{name}': {layer_energy:.2e} Дж/м")
+        if self.t_equilibrium is not None:
+            state = "расчет остановлен" if self.truncated else "остаток заполнен аналитически"
+            print(f"Тепловое равновесие достигнуто за {self.t_equilibrium/3600:.2f} ч ({state})")
+        for label, target, t_event in self.events:
+            if t_event is None:
+                print(f"Температура {target:.1f} °C ({label}) не достигнута")
+            else:
+                print(f"Температура {target:.1f} °C ({label}) достигнута за {t_event/3600:.2f} ч")
+        storage = self.result.history_storage
+        print(f"История ({self.options['history_mode']}, {storage.precision}): {storage.nbytes/2**20:.2f} МБ, "
+              f"макс. погрешность {storage.max_abs_error():.2e} K")
+        if storage.clipped:
+            print(f"Внимание: {storage.clipped} значений истории вне диапазона int16 обрезаны до его границ; "
+                  f"задайте history_range шире или точность float32")
+        print(f"Точки контроля ({len(self.probe_x)}): {self.probe_values.nbytes/2**20:.2f} МБ")
 
         # Обновляем метки с результатами
         self.ui.label_accumulated_thermal_energy.setText(f"{self.energy[-1]/1e6:.2f} МДж/м")
         self.ui.label_cop_base_heating.setText(f"{self.eta[-1]*100:.2f} %")
+        self.ui.label_equilibrium_time.setText(self.equilibrium_text())
+        self.ui.label_time_to_target.setText(self.events_text())
+
+        # Сжатая копия расчета в рабочей области для последующего сравнения
+        self.run_id = self.main_window.run_workspace.add_result(self.result)
         
         # Обновление графиков
         self.update_plots()
 
 
+    def start_polling(self, callback):
+        """Периодическая проверка задачи, выполняемой вне процесса интерфейса (свой таймер на каждый метод опроса)"""
+        self.stop_polling(callback)
+        timer = QTimer()
+        timer.timeout.connect(callback)
+        timer.start(self.options["job_poll_interval"])
+        self.poll_timers[callback.__name__] = timer
+
+    def stop_polling(self, callback):
+        timer = self.poll_timers.pop(callback.__name__, None)
+        if timer is not None:
+            timer.stop()
+
+    def start_worker_calculations(self):
+        """Расчет в рабочем процессе с записью результатов в разделяемую память"""
+        self.shared_buffer = SharedResultBuffer(self.solver)
+        self.worker_future = worker_pool().submit(run_shared, self.params, self.options,
+                                                  self.shared_buffer.descriptor)
+        self.ui.label_accumulated_thermal_energy.setText("расчет 0 %")
+        self.start_polling(self.poll_worker_job)
+
+    def poll_worker_job(self):
+        """Опрос рабочего процесса; по завершении - вывод результата без копирования массивов"""
+        if not self.worker_future.done():
+            self.ui.label_accumulated_thermal_energy.setText(f"расчет {self.shared_buffer.progress*100:.0f} %")
+            return
+
+        self.stop_polling(self.poll_worker_job)
+        future, self.worker_future = self.worker_future, None
+        try:
+            outcome = future.result()
+        except SimulationCancelled:
+            return
+        except Exception as e:
+            print(f"Ошибка расчета в рабочем процессе: {e}")
+            self.ui.label_accumulated_thermal_energy.setText("-")
+            self.main_window.notification.start_notification("img/error.png")
+            return
+
+        self.apply_result(self.shared_buffer.result(*outcome))
+        self.show_results()
+        self.main_window.notification.start_notification("img/success_modeling.png")
+
+    def start_remote_calculations(self):
+        """Передача расчета на сервер заданий и запуск опроса его состояния"""
+        self.job_client = JobClient(self.options["job_server_url"])
+        self.job_id = self.job_client.submit(self.params, self.options)
+        print(f"Задание {self.job_id} передано на сервер {self.options['job_server_url']}")
+        self.ui.label_accumulated_thermal_energy.setText("в очереди")
+        self.start_polling(self.poll_remote_job)
+
+    def poll_remote_job(self):
+        """Опрос сервера заданий; по завершении - загрузка и вывод результата"""
+        try:
+            status = self.job_client.status(self.job_id)
+            if status["status"] in ("queued", "running"):
+                text = "в очереди" if status["status"] == "queued" else f"расчет {status['progress']*100:.0f} %"
+                self.ui.label_accumulated_thermal_energy.setText(text)
+                return
+
+            self.stop_polling(self.poll_remote_job)
+            if status["status"] != "done":
+                message = status["error"] or "задание отменено"
+                print(f"Задание {self.job_id} не выполнено: {message}")
+                self.ui.label_accumulated_thermal_energy.setText("-")
+                self.main_window.notification.start_notification("img/error.png")
+                return
+
+            self.apply_result(self.job_client.result(self.job_id))
+            self.job_id = None
+        except JobServerError as e:
+            self.stop_polling(self.poll_remote_job)
+            print(e)
+            self.main_window.notification.start_notification("img/error.png")
+            return
+
+        self.show_results()
+        self.main_window.notification.start_notification("img/success_modeling.png")
+
+    def start_monte_carlo(self):
+        """Запуск серии расчетов Монте-Карло с выборками свойств материала"""
+        try:
+            self.setup_parameters()
+            settings = dict(self.options["monte_carlo"])
+            samples, ok = QInputDialog.getInt(self.main_window, "Монте-Карло",
+                                              "Число реализаций:", settings.get("samples", 1000), 2, 1000000)
+            if not ok:
+                return
+
+            self.stop_monte_carlo()
+            self.monte_carlo_run = MonteCarlo(self.params, self.options, samples,
+                                              batch_size=settings.get("batch_size", 50),
+                                              distributions=settings.get("distributions"),
+                                              seed=settings.get("seed"))
+            self.monte_carlo_futures = self.monte_carlo_run.submit(calculation_pool(self.options["parallel_workers"]))
+            print(f"Монте-Карло: {samples} реализаций, {len(self.monte_carlo_futures)} пакетов, "
+                  f"случайные параметры: {', '.join(self.monte_carlo_run.distributions)}")
+            self.ui.label_accumulated_thermal_energy.setText("Монте-Карло 0 %")
+            self.start_polling(self.poll_monte_carlo)
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка запуска Монте-Карло: {str(e)}")
+
+    def poll_monte_carlo(self):
+        """Учет завершенных пакетов Монте-Карло; по окончании - полосы на графике энергии"""
+        try:
+            pending = []
+            for future in self.monte_carlo_futures:
+                if future.done():
+                    self.monte_carlo_run.accumulate(future.result())
+                else:
+                    pending.append(future)
+            self.monte_carlo_futures = pending
+        except Exception as e:
+            self.stop_monte_carlo()
+            print(f"Ошибка расчета Монте-Карло: {e}")
+            self.ui.label_accumulated_thermal_energy.setText("-")
+            self.main_window.notification.start_notification("img/error.png")
+            return
+
+        if pending:
+            self.ui.label_accumulated_thermal_energy.setText(
+                f"Монте-Карло {self.monte_carlo_run.progress*100:.0f} %")
+            return
+
+        self.stop_polling(self.poll_monte_carlo)
+        self.monte_carlo = self.monte_carlo_run.result()
+        self.monte_carlo_run = None
+        self.show_monte_carlo()
+        self.main_window.notification.start_notification("img/success_modeling.png")
+
+    def show_monte_carlo(self):
+        """Вывод квантилей итоговой энергии и времен достижения целевых температур"""
+        mc = self.monte_carlo
+        p10, p50, p90 = (mc.band(q)[-1] / 1e6 for q in (0.1, 0.5, 0.9))
+        print(f"Монте-Карло ({mc.count} реализаций): энергия P10/P50/P90 = "
+              f"{p10:.2f} / {p50:.2f} / {p90:.2f} МДж/м, среднее {mc.energy_mean[-1]/1e6:.2f} ± "
+              f"{mc.energy_std[-1]/1e6:.2f} МДж/м")
+        for k, label in enumerate(mc.event_labels):
+            times = ["не достигнута" if np.isinf(t) else f"{t/3600:.2f} ч" for t in mc.event_quantiles[:, k]]
+            print(f"Температура {label}: P10/P50/P90 = {' / '.join(times)}, "
+                  f"достигнута в {mc.event_reached[k]*100:.0f} % реализаций")
+
+        self.ui.label_accumulated_thermal_energy.setText(f"{p50:.2f} МДж/м (P10 {p10:.2f}, P90 {p90:.2f})")
+        self.plot_accumulated_energy()
+        self.canvas2.draw()
+
+    def start_convergence_study(self):
+        """Проверка сходимости текущей конфигурации на последовательно измельчаемых сетках"""
+        try:
+            self.setup_parameters()
+            settings = dict(self.options["convergence_study"])
+            tolerance, ok = QInputDialog.getDouble(self.main_window, "Проверка сходимости",
+                                                   "Допустимая ошибка энергии и КПД, %:",
+                                                   settings.get("tolerance", 0.01) * 100, 0.001, 100.0, 3)
+            if not ok:
+                return
+
+            self.stop_convergence_study()
+            self.convergence_study = ConvergenceStudy(self.params, self.options, settings.get("levels", 4),
+                                                      settings.get("finer", 1), tolerance / 100)
+            self.convergence_futures = self.convergence_study.submit(calculation_pool(self.options["parallel_workers"]))
+            grids = ", ".join(f"{params['dx']:.4g} м / {params['dt']:.4g} с"
+                              for params in self.convergence_study.level_params)
+            print(f"Проверка сходимости: сетки dx / dt: {grids}")
+            self.ui.label_accumulated_thermal_energy.setText("сходимость 0 %")
+            self.start_polling(self.poll_convergence_study)
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка проверки сходимости: {str(e)}")
+
+    def poll_convergence_study(self):
+        """Учет завершенных расчетов на сетках; по окончании - рекомендация шагов"""
+        study = self.convergence_study
+        try:
+            for index, future in enumerate(self.convergence_futures):
+                if future.done() and study.values[index] is None:
+                    study.collect(index, future.result())
+        except Exception as e:
+            self.stop_convergence_study()
+            print(f"Ошибка проверки сходимости: {e}")
+            self.ui.label_accumulated_thermal_energy.setText("-")
+            self.main_window.notification.start_notification("img/error.png")
+            return
+
+        if study.progress < 1:
+            self.ui.label_accumulated_thermal_energy.setText(f"сходимость {study.progress*100:.0f} %")
+            return
+
+        self.stop_polling(self.poll_convergence_study)
+        self.convergence_futures = []
+        self.convergence_study = None
+        result = study.result()
+        print(result.summary())
+        self.ui.label_accumulated_thermal_energy.setText("-")
+        self.main_window.notification.start_notification("img/success_modeling.png")
+
+        if result.recommended is not None:
+            dx, dt = result.levels[result.recommended]["dx"], result.levels[result.recommended]["dt"]
+        elif result.required_dx is not None:
+            dx, dt = result.required_dx, result.required_dt
+        else:
+            return
+        answer = QMessageBox.question(
+            self.main_window,
+            "Проверка сходимости",
+            result.summary() + f"\n\nПрименить шаги dx = {dx:.4g} м, dt = {dt:.4g} с?"
+        )
+        if answer == QMessageBox.Yes:
+            self.ui.line_edit_length_step.setText(f"{dx:.6g}")
+            self.ui.line_edit_time_step.setText(f"{dt:.6g}")
+
+    def stop_calculation(self):
+        """Отмена незавершенного расчета вне процесса интерфейса и освобождение памяти его результатов.
+
+        Вызывается перед заменой результатов новым расчетом или проектом;
+        серии расчетов, отчет и разбор журнала не затрагиваются (см. take_background_tasks).
+        """
+        self.stop_polling(self.poll_worker_job)
+        self.stop_polling(self.poll_remote_job)
+        if self.shared_buffer is not None:
+            if self.worker_future is not None:
+                self.shared_buffer.cancel()
+                self.worker_future = None
+            self.shared_buffer.release()
+            self.shared_buffer = None
+        if self.job_id is None:
+            return
+        try:
+            self.job_client.cancel(self.job_id)
+        except JobServerError as e:
+            print(e)
+        self.job_id = None
+
+    def stop_monte_carlo(self):
+        self.stop_polling(self.poll_monte_carlo)
+        for future in self.monte_carlo_futures:
+            future.cancel()
+        self.monte_carlo_futures = []
+        self.monte_carlo_run = None
+
+    def stop_convergence_study(self):
+        self.stop_polling(self.poll_convergence_study)
+        for future in self.convergence_futures:
+            future.cancel()
+        self.convergence_futures = []
+        self.convergence_study = None
+
+    def stop_report(self):
+        self.stop_polling(self.poll_report)
+        for future in self.report_futures:
+            future.cancel()
+        self.report_futures = []
+        self.report = None
+
+    def stop_measured_log(self):
+        self.stop_polling(self.poll_measured_log)
+        if self.measured_future is not None:
+            self.measured_future.cancel()
+            self.measured_future = None
+
+    def take_background_tasks(self, previous):
+        """Перенос незавершенных серий расчетов, отчета и разбора журнала из прежнего объекта расчетов.
+
+        Эти задачи не зависят от заменяемого результата, поэтому продолжаются
+        и опрашиваются новым объектом.
+        """
+        for names, callback in ((("monte_carlo_run", "monte_carlo_futures"), self.poll_monte_carlo),
+                                (("convergence_study", "convergence_futures"), self.poll_convergence_study),
+                                (("report", "report_futures"), self.poll_report),
+                                (("measured_future", "measured_offset"), self.poll_measured_log)):
+            for name in names:
+                setattr(self, name, getattr(previous, name))
+            if callback.__name__ in previous.poll_timers:
+                previous.stop_polling(getattr(previous, callback.__name__))
+                self.start_polling(callback)
+
+    def apply_result(self, result):
+        """Перенос результатов расчета в атрибуты для графиков и экспорта"""
+        self.result = result
+        self.x = result.x
+        self.energy = result.energy
+        self.eta = result.eta
+        self.T_history = result.T_history
+        self.probe_x = result.probe_x
+        self.probe_values = result.probe_values
+        self.layer_names = result.layer_names
+        self.layer_energy = result.layer_energy
+        self.T = result.T_final
+        self.Q_heating = result.Q_heating
+        self.t_equilibrium = result.t_equilibrium
+        self.truncated = result.truncated
+        self.events = result.events
+        self.Nt = result.Nt
+
+    def equilibrium_text(self):
+        """Текст метки о времени выхода на тепловое равновесие"""
+        if self.options["steady_state_tol"] is None and self.options["steady_state_energy_rtol"] is None:
+            return "не проверялось"
+        if self.t_equilibrium is None:
+            return "не достигнуто"
+        return f"{self.t_equilibrium/3600:.2f} ч"
+
+    def events_text(self):
+        """Текст метки о времени достижения целевых температур"""
+        if not self.events:
+            return "не задано"
+        lines = []
+        for label, target, t_event in self.events:
+            value = "не достигнута" if t_event is None else f"{t_event/3600:.2f} ч"
+            lines.append(f"{target:.1f} °C ({label}): {value}")
+        return "\n".join(lines)
+
+    def compared_runs(self):
+        """Расчеты рабочей области, выбранные для наложения на графики (кроме текущего)"""
+        workspace = getattr(self.main_window, 'run_workspace', None)
+        if workspace is None:
+            return []
+        return workspace.get_many([run_id for run_id in sorted(workspace.selected)
+                                   if run_id != self.run_id and run_id in workspace])
+
     def update_plots(self):
         """Обновление всех графиков"""
-        self.plot_temperature_profiles()
-        self.plot_accumulated_energy()
-        self.plot_temperature_slices()
+        # Выбранные расчеты загружаются один раз для всех графиков
+        runs = self.compared_runs()
+        self.plot_temperature_profiles(runs)
+        self.plot_accumulated_energy(runs)
+        self.plot_temperature_slices(runs)
         
         # Перерисовка холстов
         self.canvas1.draw()
         self.canvas2.draw()
         self.canvas3.draw()
 
-    def plot_temperature_profiles(self):
-        """Температурные профили в разные моменты времени (для graph_temperature_profiles)"""
+    def plot_temperature_profiles(self, runs=None):
+        """Температурные профили в разные моменты времени (для graph_temperature_profiles).
+
+        runs - расчеты для сравнения (None - выбранные в рабочей области, см. compared_runs).
+        """
+        if runs is None:
+            runs = self.compared_runs()
         self.figure1.clear()
         ax = self.figure1.add_subplot(111)
+        profiles = [(idx * self.dt, profile) for idx, profile in self.result.profiles()]
+        draw_temperature_profiles(ax, self.x, profiles, self.solver.temperature_bounds, runs,
+                                  self.main_window.measured_log)
         
-        # Выбор моментов времени для отображения
-        save_indices = [0, self.Nt//4, self.Nt//2, 3*self.Nt//4, self.Nt-1]
-        time_labels = [f"{(i * self.dt)/3600:.1f} ч" for i in save_indices]
-        
-        for i, idx in enumerate(save_indices):
-            ax.plot(self.x, self.T_history[idx], label=time_labels[i])
-        
-        ax.set_xlabel('Длина реактора, м')
-        ax.set_ylabel('Температура, °C')
-        ax.set_title('Температурные профили во времени')
-        ax.legend()
-        ax.grid(True)       
-        
-        # Определение границ по Y
-        y_min = min(self.T_init, self.T_wall) - 5
-        y_max = max(self.T_init, self.T_wall) + 10
-        ax.set_ylim(y_min, y_max)
-        
-    def plot_accumulated_energy(self):
+    def plot_accumulated_energy(self, runs=None):
         """График накопленной энергии (для graph_thermal_energy)"""
+        if runs is None:
+            runs = self.compared_runs()
         self.figure2.clear()
         ax = self.figure2.add_subplot(111)
-        
-        time_hours = np.arange(self.Nt) * self.dt / 3600
-        ax.plot(time_hours, self.energy / 1e6)
-        
-        ax.set_xlabel('Время, ч')
-        ax.set_ylabel('Аккумулированная энергия, МДж')
-        ax.set_title('Накопленная тепловая энергия')
-        ax.grid(True)
+        energy = self.energy if hasattr(self, 'energy') else None
+        time_hours = np.arange(len(energy)) * self.dt / 3600 if energy is not None else None
+        draw_accumulated_energy(ax, time_hours, energy, self.monte_carlo, runs)
 
-    def plot_temperature_slices(self):
+    def plot_temperature_slices(self, runs=None):
         """Температура в фиксированных срезах (для graph_temperature_change)"""
+        if runs is None:
+            runs = self.compared_runs()
         self.figure3.clear()
         ax = self.figure3.add_subplot(111)
-        
         time_hours = np.arange(self.Nt) * self.dt / 3600
-        
-        # Выбор трех точек: начало, середина и конец реактора
-        idx1 = 0  # начало
-        idx2 = self.Nx // 2  # середина
-        idx3 = self.Nx - 1  # конец
-        
-        ax.plot(time_hours, [T[idx1] for T in self.T_history], label=f'x={self.x[idx1]:.2f} м (начало)')
-        ax.plot(time_hours, [T[idx2] for T in self.T_history], label=f'x={self.x[idx2]:.2f} м (середина)')
-        ax.plot(time_hours, [T[idx3] for T in self.T_history], label=f'x={self.x[idx3]:.2f} м (конец)')
-        
-        ax.set_xlabel('Время, ч')
-        ax.set_ylabel('Температура, °C')
-        ax.set_title('Температура в фиксированных срезах')
-        ax.legend()
-        ax.grid(True)
+        draw_temperature_slices(ax, time_hours, self.probe_x, self.probe_values, self.options["probes"] is None,
+                                runs, self.main_window.measured_log)
   
   
     def export_temperature_data(self):
         """Экспорт температурных данных в CSV в том же формате, что и в листе Temperature"""
-        if not hasattr(self, 'T_history') or len(self.T_history) == 0:
+        if not hasattr(self, 'result') or len(self.result.profiles()) == 0:
             QMessageBox.warning(self.main_window, "Нет данных", "Сначала выполните расчеты")
             return
             
@@ -294,9 +647,9 @@ class Calculations:
             if not filename:
                 return
                 
-            # Выбор моментов времени для экспорта (те же, что и в export_all_data)
-            save_indices = [0, self.Nt//4, self.Nt//2, 3*self.Nt//4, self.Nt-1]
-            time_points = [i * self.dt for i in save_indices]
+            # Моменты времени для экспорта (те же, что и в export_all_data)
+            profiles = self.result.profiles()
+            time_points = [idx * self.dt for idx, _ in profiles]
             
             # Создаем данные для экспорта
             headers = ["x (м)"] + [f"t = {tp:.1f} с" for tp in time_points]
@@ -305,9 +658,9 @@ class Calculations:
             # Добавляем строки с данными
             for i, x_val in enumerate(self.x):
                 row = [f"{x_val:.3f}".replace('.', ',')]  # Заменяем точку на запятую в координате X
-                for idx in save_indices:
+                for _, profile in profiles:
                     # Форматируем температуру с запятой в качестве разделителя
-                    temp_str = f"{self.T_history[idx][i]:.8f}".replace('.', ',')
+                    temp_str = f"{profile[i]:.8f}".replace('.', ',')
                     row.append(temp_str)
                 data.append(row)
             
@@ -360,9 +713,471 @@ class Calculations:
             QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка экспорта: {str(e)}")
    
 
+    def export_history_data(self):
+        """Сохранение полной истории расчета в сжатый бинарный файл .npz"""
+        if not hasattr(self, 'T_history'):
+            QMessageBox.warning(self.main_window, "Нет данных", "Сначала выполните расчеты")
+            return
+        if self.T_history is None:
+            QMessageBox.warning(self.main_window, "Нет данных",
+                                "Полная история не сохранялась (history_mode = \"snapshots\")")
+            return
+
+        try:
+            filename, _ = QFileDialog.getSaveFileName(
+                self.main_window,
+                "Сохранение результатов",
+                "simulation_results.npz",
+                "NumPy Files (*.npz)"
+            )
+
+            if not filename:
+                return
+
+            self.T_history.save(
+                filename,
+                compression=self.options["history_compression"],
+                chunk_rows=self.options["history_chunk_rows"],
+                extra_arrays={
+                    'x': self.x,
+                    't': np.arange(1, len(self.T_history) + 1) * self.dt,
+                    'energy': self.energy,
+                    'eta': self.eta,
+                    'probe_x': self.probe_x,
+                    'probe_values': self.probe_values,
+                    'max_abs_error': self.T_history.max_abs_error()
+                }
+            )
+
+            QMessageBox.information(self.main_window, "Успех", "Результаты успешно сохранены!")
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка сохранения: {str(e)}")
+
+    def calibrate_from_measurements(self):
+        """Подбор lambda_dry, Cp_dry и b по измеренному полю температур"""
+        try:
+            filename, _ = QFileDialog.getOpenFileName(
+                self.main_window,
+                "Загрузка измеренных температур",
+                "",
+                "CSV Files (*.csv)"
+            )
+
+            if not filename:
+                return
+
+            self.setup_parameters()
+            measured = load_measured_temperatures(filename)
+            result = calibrate(self.params, self.options, measured,
+                               initial=self.main_window.last_calibration)
+            self.main_window.last_calibration = result.params
+            print(result.summary())
+
+            answer = QMessageBox.question(
+                self.main_window,
+                "Результат калибровки",
+                result.summary() + "\n\nПрименить подобранные параметры?"
+            )
+            if answer != QMessageBox.Yes:
+                return
+
+            if "lambda_dry" in result.params:
+                self.ui.line_edit_thermal_conductivity.setText(f"{result.params['lambda_dry']:.6g}")
+            if "Cp_dry" in result.params:
+                self.ui.line_edit_heat_capacity.setText(f"{result.params['Cp_dry']:.6g}")
+            if "b" in result.params:
+                self.main_window.solver_option_overrides["conductivity_slope"] = result.params["b"]
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка калибровки: {str(e)}")
+
+    def choose_material(self):
+        """Выбор субстрата с табличными λ(T), Cp(T) из библиотеки или CSV-файла"""
+        try:
+            library = load_substrate_library()
+            linear = "Без таблицы (λ линейна по T, Cp постоянна)"
+            from_file = "Загрузить таблицу из CSV..."
+            items = [linear] + list(library) + [from_file]
+            current = self.options["material"]
+            index = items.index(current) if current in items else 0
+
+            item, ok = QInputDialog.getItem(self.main_window, "Материал субстрата",
+                                            "Свойства сухого вещества:", items, index, False)
+            if not ok:
+                return
+
+            if item == linear:
+                material = None
+            elif item == from_file:
+                filename, _ = QFileDialog.getOpenFileName(
+                    self.main_window,
+                    "Загрузка таблицы свойств материала",
+                    "",
+                    "CSV Files (*.csv)"
+                )
+                if not filename:
+                    return
+                load_material_csv(filename)  # Проверка формата до запуска расчета
+                material = filename
+            else:
+                material = item
+
+            self.main_window.solver_option_overrides["material"] = material
+            print(f"Материал субстрата: {material or 'линейная зависимость'}")
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка загрузки материала: {str(e)}")
+
+    def choose_layers(self):
+        """Загрузка описания слоев реактора из CSV (повторный выбор без файла - однородная среда)"""
+        try:
+            filename, _ = QFileDialog.getOpenFileName(
+                self.main_window,
+                "Загрузка слоев реактора",
+                "",
+                "CSV Files (*.csv)"
+            )
+            if not filename:
+                if self.main_window.solver_option_overrides.get("layers"):
+                    self.main_window.solver_option_overrides["layers"] = None
+                    print("Слои реактора сброшены: однородная среда")
+                return
+
+            layers = load_layers_csv(filename)
+            self.main_window.solver_option_overrides["layers"] = layers
+            print(f"Слои реактора ({len(layers)}), общая толщина {sum(layer['thickness'] for layer in layers):.3f} м")
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка загрузки слоев: {str(e)}")
+
+    def choose_wall_schedule(self):
+        """Загрузка графика температуры стенки из CSV (время, с; температура, °C)"""
+        try:
+            walls = {"Обе стенки": ("boundary_left", "boundary_right"),
+                     "Левая стенка (x = 0)": ("boundary_left",),
+                     "Правая стенка (x = L)": ("boundary_right",)}
+            reset = "Постоянная температура стенок (T_wall)"
+            item, ok = QInputDialog.getItem(self.main_window, "График температуры стенки",
+                                            "Стенка:", list(walls) + [reset], 0, False)
+            if not ok:
+                return
+
+            if item == reset:
+                for key in ("boundary_left", "boundary_right"):
+                    self.main_window.solver_option_overrides[key] = None
+                print("Граничные условия: постоянная температура стенок")
+                return
+
+            filename, _ = QFileDialog.getOpenFileName(
+                self.main_window,
+                "Загрузка графика температуры стенки",
+                "",
+                "CSV Files (*.csv)"
+            )
+            if not filename:
+                return
+
+            schedule = load_schedule_csv(filename)
+            # График повторяется с периодом, равным его длительности (например, суточный тариф)
+            period = max(schedule["times"]) - min(schedule["times"])
+            if period > 0:
+                schedule["period"] = period
+            for key in walls[item]:
+                self.main_window.solver_option_overrides[key] = {"type": "temperature", "schedule": schedule}
+            print(f"График температуры стенки ({item.lower()}): {len(schedule['times'])} точек, "
+                  f"период {period/3600:.2f} ч")
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка загрузки графика: {str(e)}")
+
+    def choose_heat_source(self):
+        """Выбор режима сбраживания и мощности биологического источника тепла"""
+        try:
+            presets = {"Мезофильный режим (10/38/45 °C)": "mesophilic",
+                       "Термофильный режим (40/55/65 °C)": "thermophilic"}
+            none = "Без источника тепла"
+            items = [none] + list(presets)
+            current = self.options["heat_source"]
+            index = 0
+            if current and current.get("model", "cardinal") == "cardinal":
+                index = 1 + list(presets.values()).index(current.get("preset", "mesophilic"))
+
+            item, ok = QInputDialog.getItem(self.main_window, "Биологический источник тепла",
+                                            "Режим сбраживания:", items, index, False)
+            if not ok:
+                return
+            if item == none:
+                self.main_window.solver_option_overrides["heat_source"] = None
+                print("Биологический источник тепла отключен")
+                return
+
+            q_max, ok = QInputDialog.getDouble(self.main_window, "Биологический источник тепла",
+                                               "Мощность при оптимальной температуре, Вт/м³:",
+                                               current.get("q_max", 50.0) if current else 50.0, 0.0, 1e6, 2)
+            if not ok:
+                return
+            spec = {"model": "cardinal", "preset": presets[item], "q_max": q_max}
+            if current and "loading" in current:
+                spec["loading"] = current["loading"]
+            self.main_window.solver_option_overrides["heat_source"] = spec
+            print(f"Биологический источник тепла: {item}, q_max = {q_max:g} Вт/м³")
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка настройки источника: {str(e)}")
+
+    def choose_compared_runs(self):
+        """Выбор прошлых расчетов рабочей области для наложения на графики"""
+        try:
+            workspace = self.main_window.run_workspace
+            if len(workspace) == 0:
+                QMessageBox.warning(self.main_window, "Нет данных", "Сначала выполните расчеты")
+                return
+
+            dialog = QDialog(self.main_window)
+            dialog.setWindowTitle("Сравнение расчетов")
+            layout = QVBoxLayout(dialog)
+            runs = QListWidget(dialog)
+            for run_id, record in sorted(workspace.records.items(), reverse=True):
+                text = (f"{record.label}: {record.summary['energy']/1e6:.2f} МДж/м, "
+                        f"КПД {record.summary['eta']*100:.2f} %")
+                if run_id == self.run_id:
+                    text += " (текущий)"
+                item = QListWidgetItem(text)
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(Qt.Checked if run_id in workspace.selected else Qt.Unchecked)
+                item.setData(Qt.UserRole, run_id)
+                runs.addItem(item)
+            layout.addWidget(runs)
+            buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, parent=dialog)
+            buttons.accepted.connect(dialog.accept)
+            buttons.rejected.connect(dialog.reject)
+            layout.addWidget(buttons)
+            dialog.resize(720, 360)
+            if dialog.exec_() != QDialog.Accepted:
+                return
+
+            workspace.selected = {runs.item(k).data(Qt.UserRole) for k in range(runs.count())
+                                  if runs.item(k).checkState() == Qt.Checked}
+            print(f"Расчеты для сравнения: {len(workspace.selected)} из {len(workspace)}, "
+                  f"память рабочей области {workspace.nbytes/2**20:.2f} МБ")
+            if hasattr(self, 'result'):
+                self.update_plots()
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка сравнения расчетов: {str(e)}")
+
+    def start_report(self):
+        """Отчет по расчетам рабочей области: графики каждого расчета (PNG) и сводный PDF"""
+        try:
+            workspace = self.main_window.run_workspace
+            if len(workspace) == 0:
+                QMessageBox.warning(self.main_window, "Нет данных", "Сначала выполните расчеты")
+                return
+
+            directory = QFileDialog.getExistingDirectory(self.main_window, "Каталог для отчета")
+            if not directory:
+                return
+            answer = QMessageBox.question(self.main_window, "Отчет по расчетам",
+                                          "Сформировать также сводный PDF с таблицей параметров?")
+            pdf_filename = os.path.join(directory, "report.pdf") if answer == QMessageBox.Yes else None
+
+            self.stop_report()
+            # Выгруженные на диск записи передаются без массивов: рабочий процесс читает их из файла
+            records = [workspace.records[run_id] for run_id in sorted(workspace.records)]
+            self.report = ReportGenerator(records, directory, pdf_filename)
+            self.report_futures = self.report.submit(calculation_pool(self.options["parallel_workers"]))
+            print(f"Отчет: {len(records)} расчетов, {len(self.report_futures)} задач, каталог {directory}")
+            self.ui.label_accumulated_thermal_energy.setText("отчет 0 %")
+            self.start_polling(self.poll_report)
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка формирования отчета: {str(e)}")
+
+    def poll_report(self):
+        """Учет завершенных задач отчета"""
+        try:
+            pending = []
+            for future in self.report_futures:
+                if future.done():
+                    self.report.collect(future.result())
+                else:
+                    pending.append(future)
+            self.report_futures = pending
+        except Exception as e:
+            self.stop_report()
+            print(f"Ошибка формирования отчета: {e}")
+            self.ui.label_accumulated_thermal_energy.setText("-")
+            self.main_window.notification.start_notification("img/error.png")
+            return
+
+        if pending:
+            self.ui.label_accumulated_thermal_energy.setText(f"отчет {self.report.progress*100:.0f} %")
+            return
+
+        self.stop_polling(self.poll_report)
+        print(f"Отчет сформирован: {len(self.report.files)} файлов в {self.report.directory}")
+        self.report = None
+        self.ui.label_accumulated_thermal_energy.setText("-")
+        self.main_window.notification.start_notification("img/success_modeling.png")
+
+    def choose_measured_log(self):
+        """Журнал измерений SCADA (.csv) для наложения на графики профилей и срезов"""
+        try:
+            filename, _ = QFileDialog.getOpenFileName(
+                self.main_window,
+                "Загрузка журнала измерений",
+                "",
+                "CSV Files (*.csv)"
+            )
+            if not filename:
+                # Отказ от выбора файла при загруженном журнале - предложение убрать его с графиков
+                if self.main_window.measured_log is not None:
+                    answer = QMessageBox.question(self.main_window, "Журнал измерений",
+                                                  "Убрать измерения с графиков?")
+                    if answer == QMessageBox.Yes:
+                        self.main_window.measured_log = None
+                        if hasattr(self, 'result'):
+                            self.update_plots()
+                return
+
+            offset, ok = QInputDialog.getDouble(self.main_window, "Журнал измерений",
+                                                "Начало расчета от начала журнала, ч:", 0.0,
+                                                -1e6, 1e6, 3)
+            if not ok:
+                return
+            self.measured_offset = offset * 3600
+
+            # Разобранный ранее журнал читается из кэша сразу, новый разбирается в рабочем процессе
+            settings = dict(self.options["measured_log"])
+            log = load_measured_log(filename, cached_only=True, **settings)
+            if log is not None:
+                self.show_measured_log(log)
+                return
+            self.stop_measured_log()
+            self.measured_future = calculation_pool(self.options["parallel_workers"]).submit(
+                load_measured_log, filename, **settings)
+            print(f"Разбор журнала измерений {filename} ({os.path.getsize(filename)/2**20:.1f} МБ)")
+            self.ui.label_accumulated_thermal_energy.setText("чтение журнала")
+            self.start_polling(self.poll_measured_log)
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка загрузки журнала измерений: {str(e)}")
+
+    def poll_measured_log(self):
+        """Проверка разбора журнала измерений"""
+        if not self.measured_future.done():
+            return
+        self.stop_polling(self.poll_measured_log)
+        future = self.measured_future
+        self.measured_future = None
+        self.ui.label_accumulated_thermal_energy.setText("-")
+        try:
+            log = future.result()
+        except Exception as e:
+            print(f"Ошибка разбора журнала измерений: {e}")
+            self.main_window.notification.start_notification("img/error.png")
+            return
+        self.show_measured_log(log)
+        self.main_window.notification.start_notification("img/success_modeling.png")
+
+    def show_measured_log(self, log):
+        """Наложение журнала измерений на графики"""
+        log.offset = self.measured_offset
+        self.main_window.measured_log = log
+        start = f", начало {log.start}" if log.start is not None else ""
+        print(f"Журнал измерений: {log.rows} записей, {len(log.t)} моментов, {len(log.names)} датчиков "
+              f"({int(log.located.sum())} с координатой), {log.duration/3600:.1f} ч{start}")
+        if hasattr(self, 'result'):
+            self.update_plots()
+
+    def input_texts(self):
+        """Тексты полей ввода параметров (имя поля -> текст)"""
+        layout = self.ui.grid_layout_line_text
+        texts = {}
+        for row in range(layout.rowCount()):
+            for col in range(layout.columnCount()):
+                item = layout.itemAtPosition(row, col)
+                if item is not None and isinstance(item.widget(), QLineEdit):
+                    texts[item.widget().objectName()] = item.widget().text()
+        return texts
+
+    def save_project(self):
+        """Сохранение параметров, настроек инструментов и результата расчета в файл проекта"""
+        try:
+            filename, _ = QFileDialog.getSaveFileName(
+                self.main_window,
+                "Сохранение проекта",
+                "project.bgproj",
+                "BioGas Project (*.bgproj)"
+            )
+            if not filename:
+                return
+
+            result = self.result if hasattr(self, 'result') else None
+            if result is not None and maps_file(result, filename):
+                # Повторное сохранение открытого проекта: отображенный в память файл нельзя заменить
+                # (Windows), поэтому результат и графики переводятся на копию массивов в памяти
+                self.apply_result(result_in_memory(result))
+                self.update_plots()
+                result = self.result
+                gc.collect()
+            save_project(filename, Project(self.input_texts(), self.main_window.solver_option_overrides, result))
+            print(f"Проект сохранен: {filename} ({os.path.getsize(filename)/2**20:.2f} МБ)")
+            QMessageBox.information(self.main_window, "Успех", "Проект успешно сохранен!")
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка сохранения проекта: {str(e)}")
+
+    def open_project(self):
+        """Открытие файла проекта: восстановление полей ввода и настроек инструментов.
+
+        Возвращает Project (результат выводится методом show_project нового
+        объекта расчетов) или None.
+        """
+        try:
+            filename, _ = QFileDialog.getOpenFileName(
+                self.main_window,
+                "Открытие проекта",
+                "",
+                "BioGas Project (*.bgproj)"
+            )
+            if not filename:
+                return None
+
+            project = load_project(filename)
+            self.stop_calculation()
+            for name, text in project.inputs.items():
+                widget = getattr(self.ui, name, None)
+                if isinstance(widget, QLineEdit):
+                    widget.setText(text)
+            self.main_window.solver_option_overrides = dict(project.overrides)
+            print(f"Проект открыт: {filename}")
+            return project
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Ошибка", f"Ошибка открытия проекта: {str(e)}")
+            return None
+
+    def show_project(self, project):
+        """Вывод сохраненного в проекте результата без повторного расчета.
+
+        ValueError - ошибка в настройках решателя, с которыми открыт проект.
+        """
+        if self.solver is None:
+            self.setup_parameters()
+        if project.result is None:
+            self.ui.stackedWidget.setCurrentIndex(0)
+            return
+        start = time.perf_counter()
+        self.apply_result(project.result)
+        self.show_results()
+        self.ui.stackedWidget.setCurrentIndex(1)
+        print(f"Результаты проекта выведены за {time.perf_counter() - start:.2f} с")
+
     def export_all_data(self):
         """Экспорт всех данных в Excel"""
-        if not hasattr(self, 'T_history') or not hasattr(self, 'energy'):
+        if not hasattr(self, 'result') or not hasattr(self, 'energy'):
             QMessageBox.warning(self.main_window, "Нет данных", "Сначала выполните расчеты")
             return
             
@@ -380,12 +1195,9 @@ class Calculations:
             # Создаем Excel writer
             with pd.ExcelWriter(filename) as writer:
                 # Экспорт температурных данных
-                save_indices = [0, self.Nt//4, self.Nt//2, 3*self.Nt//4, self.Nt-1]
-                time_points = [i * self.dt for i in save_indices]
-                
                 temp_data = {'x (м)': self.x}
-                for i, idx in enumerate(save_indices):
-                    temp_data[f"t = {time_points[i]:.1f} с"] = self.T_history[idx]
+                for idx, profile in self.result.profiles():
+                    temp_data[f"t = {idx * self.dt:.1f} с"] = profile
                 
                 temp_df = pd.DataFrame(temp_data)
                 temp_df.to_excel(writer, sheet_name='Temperature', index=False)
@@ -398,21 +1210,80 @@ class Calculations:
                     'КПД (%)': self.eta * 100
                 }
                 
+                for k, name in enumerate(self.layer_names):
+                    energy_data[f"Энергия слоя '{name}' (Дж)"] = self.layer_energy[:, k]
+
                 energy_df = pd.DataFrame(energy_data)
                 energy_df.to_excel(writer, sheet_name='Energy', index=False)
+
+                # Экспорт температур в точках контроля
+                probe_data = {'t (с)': np.arange(self.Nt) * self.dt}
+                for k, x_probe in enumerate(self.probe_x):
+                    probe_data[f"x = {x_probe:.3f} м"] = self.probe_values[:, k]
+                pd.DataFrame(probe_data).to_excel(writer, sheet_name='Probes', index=False)
                 
                 # Экспорт параметров модели
                 params_data = {
                     'Параметр': ['Длина реактора', 'Температура стенки', 'Начальная температура',
                                  'Шаг по времени', 'Общее время', 'Плотность', 'Влажность',
-                                 'Теплоемкость сухого вещества', 'Теплоемкость воды'],
+                                 'Теплоемкость сухого вещества', 'Теплоемкость воды',
+                                 'Материал (таблицы λ(T), Cp(T))',
+                                 'Левая стенка', 'Правая стенка',
+                                 'Биологический источник тепла', 'Тепло биологического источника',
+                                 'Точность хранения истории', 'Макс. погрешность температур'],
                     'Значение': [self.L, self.T_wall, self.T_init, self.dt, self.t_max,
-                                 self.rho, self.H, self.Cp_dry, self.Cp_water],
-                    'Единицы': ['м', '°C', '°C', 'с', 'с', 'кг/м³', '%', 'Дж/(кг·K)', 'Дж/(кг·K)']
+                                 self.rho, self.H, self.Cp_dry, self.Cp_water,
+                                 self.solver.material.name if self.solver.material is not None else '-',
+                                 *(boundary.describe() for boundary in self.solver.boundaries),
+                                 self.solver.heat_source.describe() if self.solver.heat_source is not None else '-',
+                                 self.result.Q_source,
+                                 self.result.history_storage.precision,
+                                 self.result.history_storage.max_abs_error()],
+                    'Единицы': ['м', '°C', '°C', 'с', 'с', 'кг/м³', '%', 'Дж/(кг·K)', 'Дж/(кг·K)',
+                                '', '', '', '', 'Дж/м', '', 'K']
                 }
                 
                 params_df = pd.DataFrame(params_data)
                 params_df.to_excel(writer, sheet_name='Parameters', index=False)
+
+                # Экспорт описания слоев реактора
+                if self.solver.layers is not None:
+                    layers_df = pd.DataFrame({
+                        'Слой': [layer.name for layer in self.solver.layers],
+                        'Толщина (м)': [layer.thickness for layer in self.solver.layers],
+                        'Плотность (кг/м³)': [layer.value("rho", self.rho) for layer in self.solver.layers],
+                        'Влажность (%)': [layer.value("H", self.H) for layer in self.solver.layers],
+                        'Теплоемкость сухого вещества (Дж/(кг·K))':
+                            [layer.value("Cp_dry", self.Cp_dry) for layer in self.solver.layers],
+                        'Теплопроводность сухого вещества (Вт/(м·K))':
+                            [layer.value("lambda_dry", self.lambda_dry) for layer in self.solver.layers],
+                        'Материал': [layer.material.name if layer.material is not None else '-'
+                                     for layer in self.solver.layers]
+                    })
+                    layers_df.to_excel(writer, sheet_name='Layers', index=False)
+
+                # Экспорт полос неопределенности Монте-Карло
+                if self.monte_carlo is not None:
+                    mc = self.monte_carlo
+                    mc_df = pd.DataFrame({
+                        't (с)': mc.t,
+                        't (ч)': mc.t / 3600,
+                        'Энергия, среднее (Дж)': mc.energy_mean,
+                        'Энергия, ст. откл. (Дж)': mc.energy_std,
+                        **{f'Энергия, P{q*100:.0f} (Дж)': mc.band(q) for q in mc.quantile_levels}
+                    })
+                    mc_df.to_excel(writer, sheet_name='MonteCarlo', index=False)
+                    pd.DataFrame(mc.samples).to_excel(writer, sheet_name='MonteCarlo samples', index=False)
+
+                # Экспорт времени достижения целевых температур
+                if self.events:
+                    events_df = pd.DataFrame({
+                        'Величина': [label for label, _, _ in self.events],
+                        'Цель (°C)': [target for _, target, _ in self.events],
+                        'Время (с)': [np.nan if t_event is None else t_event for _, _, t_event in self.events],
+                        'Время (ч)': [np.nan if t_event is None else t_event / 3600 for _, _, t_event in self.events]
+                    })
+                    events_df.to_excel(writer, sheet_name='Events', index=False)
             
             QMessageBox.information(self.main_window, "Успех", "Все данные успешно экспортированы в Excel!")
             
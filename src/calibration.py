@@ -0,0 +1,274 @@
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from material_properties import resolve_material
+from probes import interpolate, interpolation_weights
+from solver import HeatSolver
+
+# Подбираемые параметры по умолчанию
+DEFAULT_FIT_PARAMETERS = ("lambda_dry", "Cp_dry", "b")
+
+# Параметры, которые замещаются таблицами материала "lambda" и "Cp"
+TABLE_PARAMETERS = {"lambda": ("lambda_dry", "b"), "Cp": ("Cp_dry",)}
+
+# Масштаб параметров при оптимизации: "log" - логарифм (строго положительные),
+# число - линейный масштаб (параметр может менять знак)
+PARAMETER_SCALES = {
+    "lambda_dry": "log",
+    "Cp_dry": "log",
+    "rho": "log",
+    "H": 10.0,
+    "b": 1e-3,
+}
+
+
+class MeasuredTemperatures:
+    """Измеренное поле T(x, t): T[k, j] - температура в точке x[j] в момент t[k]"""
+
+    def __init__(self, x, t, T):
+        order = np.argsort(t)
+        self.x = np.asarray(x, dtype=float)
+        self.t = np.asarray(t, dtype=float)[order]
+        self.T = np.asarray(T, dtype=float)[order]
+        self.mask = np.isfinite(self.T)
+
+
+def load_measured_temperatures(filename):
+    """Загрузка измерений из CSV в формате экспорта температурных данных.
+
+    Первый столбец - координата x (м), остальные - моменты времени
+    с заголовками вида "t = 3600,0 с"; разделитель ";", десятичная запятая.
+    """
+    df = pd.read_csv(filename, sep=';', decimal=',', encoding='utf-8-sig')
+    if df.shape[1] < 2:
+        raise ValueError("В файле нет столбцов с температурами")
+
+    times = []
+    for column in df.columns[1:]:
+        match = re.search(r"[-+]?\d+(?:[.,]\d+)?", str(column))
+        if match is None:
+            raise ValueError(f"Не удалось определить время из заголовка '{column}'")
+        times.append(float(match.group().replace(',', '.')))
+
+    x = df.iloc[:, 0].to_numpy(dtype=float)
+    T = df.iloc[:, 1:].to_numpy(dtype=float).T
+    return MeasuredTemperatures(x, times, T)
+
+
+class TemperatureSampler:
+    """Запись температур в точках измерений во время расчета (пакетно)"""
+
+    def __init__(self, solver, x_obs, t_obs):
+        self.index, self.weight = interpolation_weights(solver.x, x_obs)
+
+        # Поле после шага n соответствует моменту (n + 1) * dt
+        steps = np.rint(np.asarray(t_obs) / solver.dt).astype(int) - 1
+        self.rows = {}
+        for row, n in enumerate(steps):
+            self.rows.setdefault(int(n), []).append(row)
+
+        self.values = np.full(solver.batch_shape + (len(t_obs), len(x_obs)), np.nan)
+        self.record(-1, solver.initial_field())
+
+    def record(self, n, T):
+        rows = self.rows.get(n)
+        if rows is None:
+            return
+        sample = interpolate(T, self.index, self.weight)
+        for row in rows:
+            self.values[..., row, :] = sample
+
+
+class CalibrationResult:
+    """Результат калибровки с диагностикой невязок"""
+
+    def __init__(self, params, initial_params, residuals, measured, simulated, std_errors, correlation,
+                 iterations, evaluations, elapsed, converged):
+        self.params = params
+        self.initial_params = initial_params
+        self.residuals = residuals
+        self.measured = measured
+        self.simulated = simulated
+        self.std_errors = std_errors
+        self.correlation = correlation
+        self.iterations = iterations
+        self.evaluations = evaluations
+        self.elapsed = elapsed
+        self.converged = converged
+
+        self.rmse = float(np.sqrt(np.mean(residuals**2)))
+        self.max_abs_residual = float(np.max(np.abs(residuals)))
+        self.bias = float(np.mean(residuals))
+
+        # Невязки по моментам времени и по точкам измерений
+        error = np.where(measured.mask, simulated - np.where(measured.mask, measured.T, 0.0), np.nan)
+        self.rmse_by_time = np.sqrt(np.nanmean(error**2, axis=1))
+        self.rmse_by_x = np.sqrt(np.nanmean(error**2, axis=0))
+
+    def summary(self):
+        """Текстовое описание результата"""
+        lines = []
+        for name, value in self.params.items():
+            lines.append(f"{name} = {value:.6g} ± {self.std_errors[name]:.2g} "
+                         f"(начальное {self.initial_params[name]:.6g})")
+        lines.append(f"СКО невязки: {self.rmse:.3f} K, максимум: {self.max_abs_residual:.3f} K, "
+                     f"смещение: {self.bias:+.3f} K")
+        lines.append(f"Итераций: {self.iterations}, расчетов модели: {self.evaluations}, "
+                     f"время: {self.elapsed:.1f} с")
+        names = list(self.params)
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                if abs(self.correlation[i, j]) > 0.95:
+                    lines.append(f"Предупреждение: {names[i]} и {names[j]} сильно коррелированы "
+                                 f"({self.correlation[i, j]:+.3f}), измерения определяют их совместно")
+        if not self.converged:
+            lines.append("Предупреждение: достигнуто максимальное число итераций")
+        return "\n".join(lines)
+
+
+class Calibration:
+    """Подбор параметров модели по измерениям методом Левенберга-Марквардта.
+
+    Якобиан считается конечными разностями: все возмущенные варианты и все
+    пробные шаги с разным демпфированием рассчитываются одним пакетным
+    проходом решателя. Невязка принятого шага переиспользуется как базовая
+    на следующей итерации, демпфирование переносится между итерациями.
+    """
+
+    def __init__(self, params, options, measured, fit_names=DEFAULT_FIT_PARAMETERS):
+        self.measured = measured
+        self.fit_names = tuple(fit_names)
+        self.options = dict(options or {})
+        # История, события и критерий стационарности при калибровке не нужны
+        self.options["steady_state_tol"] = None
+        self.options["steady_state_energy_rtol"] = None
+        self.options["events"] = []
+
+        # Параметры, замещенные таблицами материала, на расчет не влияют
+        if self.options.get("material"):
+            tables = resolve_material(self.options["material"]).tables
+            replaced = [name for prop in tables for name in TABLE_PARAMETERS[prop] if name in self.fit_names]
+            if replaced:
+                print(f"Параметры {', '.join(replaced)} заданы таблицей материала и не подбираются")
+                self.fit_names = tuple(name for name in self.fit_names if name not in replaced)
+            if not self.fit_names:
+                raise ValueError("Нет параметров для подбора: свойства заданы таблицей материала")
+
+        self.params = dict(params)
+        # Расчет ведется до последнего момента измерений
+        self.params["t_max"] = float(measured.t.max()) + 0.5 * self.params["dt"]
+        self.params.setdefault("b", self.options.get("conductivity_slope", 1e-3))
+        self.params.setdefault("T0", self.options.get("conductivity_T0", 45.0))
+
+        self.evaluations = 0
+
+    def to_internal(self, values):
+        """Перевод физических значений параметров в переменные оптимизации"""
+        u = np.empty(len(self.fit_names))
+        for k, name in enumerate(self.fit_names):
+            scale = PARAMETER_SCALES.get(name, 1.0)
+            u[k] = np.log(values[name]) if scale == "log" else values[name] / scale
+        return u
+
+    def to_physical(self, u):
+        """Перевод переменных оптимизации (..., k) в физические значения"""
+        values = {}
+        for k, name in enumerate(self.fit_names):
+            scale = PARAMETER_SCALES.get(name, 1.0)
+            values[name] = np.exp(u[..., k]) if scale == "log" else u[..., k] * scale
+        return values
+
+    def simulate(self, U):
+        """Пакетный расчет модели для строк U, возвращает температуры в точках измерений"""
+        params = dict(self.params)
+        params.update(self.to_physical(np.atleast_2d(U)))
+        solver = HeatSolver(params, self.options)
+        sampler = TemperatureSampler(solver, self.measured.x, self.measured.t)
+        solver.run(observers=[sampler], store_history=False)
+        self.evaluations += len(np.atleast_2d(U))
+        return sampler.values
+
+    def residuals(self, U):
+        """Невязки (модель - измерения) для каждой строки U"""
+        simulated = self.simulate(U)
+        residuals = simulated[:, self.measured.mask] - self.measured.T[self.measured.mask]
+        # Неустойчивые или расходящиеся варианты исключаются из рассмотрения
+        residuals[~np.isfinite(residuals).all(axis=1)] = np.inf
+        return residuals
+
+    def fit(self, initial=None, max_iter=30, rel_step=1e-4, ftol=1e-8, damping=1e-2):
+        """Подбор параметров; initial - начальное приближение (например, прошлая калибровка)"""
+        start_time = time.perf_counter()
+        start = {name: float(np.asarray(self.params[name])) for name in self.fit_names}
+        if initial:
+            start.update({name: initial[name] for name in self.fit_names if name in initial})
+
+        u = self.to_internal(start)
+        r = self.residuals(u)[0]
+        cost = 0.5 * float(r @ r)
+        k = len(u)
+        h = rel_step * np.maximum(np.abs(u), 1.0)
+        J = None
+        converged = False
+        iteration = 0
+
+        for iteration in range(1, max_iter + 1):
+            # Якобиан конечными разностями: k возмущенных вариантов за один проход
+            R = self.residuals(u + np.diag(h))
+            J = ((R - r) / h[:, np.newaxis]).T
+            if not np.all(np.isfinite(J)):
+                break
+
+            A = J.T @ J
+            g = J.T @ r
+            diag = np.maximum(np.diag(A), 1e-12)
+
+            # Пробные шаги с разным демпфированием: тоже один пакетный проход
+            mus = damping * np.array([0.1, 1.0, 10.0, 100.0])
+            steps = np.array([np.linalg.solve(A + mu * np.diag(diag), -g) for mu in mus])
+            R_trial = self.residuals(u + steps)
+            costs = 0.5 * np.einsum('ij,ij->i', R_trial, R_trial)
+            costs[~np.isfinite(costs)] = np.inf
+            best = int(np.argmin(costs))
+
+            if costs[best] < cost:
+                reduction = (cost - costs[best]) / max(cost, 1e-300)
+                u = u + steps[best]
+                r = R_trial[best]
+                cost = float(costs[best])
+                damping = max(mus[best] / 3, 1e-9)
+                if reduction < ftol or np.max(np.abs(steps[best]) / np.maximum(np.abs(u), 1.0)) < 1e-10:
+                    converged = True
+                    break
+            else:
+                damping = mus[-1] * 10
+                if damping > 1e10:
+                    converged = True
+                    break
+
+        fitted = {name: float(value) for name, value in self.to_physical(u).items()}
+
+        # Стандартные ошибки параметров по линеаризации в точке минимума
+        std_errors = {name: np.nan for name in self.fit_names}
+        correlation = np.full((k, k), np.nan)
+        dof = max(len(r) - k, 1)
+        if J is not None and np.all(np.isfinite(J)):
+            covariance = np.linalg.pinv(J.T @ J) * (r @ r) / dof
+            sigma = np.sqrt(np.maximum(np.diag(covariance), 1e-300))
+            correlation = covariance / np.outer(sigma, sigma)
+            for index, name in enumerate(self.fit_names):
+                sigma_u = np.sqrt(max(covariance[index, index], 0.0))
+                scale = PARAMETER_SCALES.get(name, 1.0)
+                std_errors[name] = fitted[name] * sigma_u if scale == "log" else sigma_u * scale
+
+        simulated = self.simulate(u)[0]
+        return CalibrationResult(fitted, start, r, self.measured, simulated, std_errors, correlation,
+                                 iteration, self.evaluations, time.perf_counter() - start_time, converged)
+
+
+def calibrate(params, options, measured, fit_names=DEFAULT_FIT_PARAMETERS, initial=None, **kwargs):
+    """Калибровка параметров модели по измерениям"""
+    return Calibration(params, options, measured, fit_names).fit(initial=initial, **kwargs)
@@ -0,0 +1,200 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from monte_carlo import monte_carlo_options
+from solver import HeatSolver
+
+# Величины, по которым оценивается сходимость (значения в конце расчета)
+CONVERGENCE_QUANTITIES = ("energy", "eta")
+
+
+def grid_step(length, count):
+    """Шаг, для которого решатель получит ровно count интервалов: int(length / step) == count"""
+    step = length / count
+    while int(length / step) < count:
+        step = np.nextafter(step, 0.0)
+    return step
+
+
+def refinement_levels(solver, levels=4, finer=1):
+    """Сетки исследования от самой мелкой к самой грубой.
+
+    Шаг по длине меняется вдвое между соседними сетками, шаг по времени -
+    вчетверо (dt / dx² постоянно, поэтому устойчивость явной схемы не
+    меняется, а ошибки по dx и dt убывают одинаково, как dx²). finer сеток
+    мельче текущей, остальные грубее; все сетки заканчиваются в один момент.
+    Возвращает список (число интервалов по длине, число шагов по времени).
+    """
+    cells = solver.Nx - 1
+    grids = []
+    for k in range(-finer, levels - finer):
+        n_cells = max(2, int(round(cells / 2.0**k)))
+        n_steps = max(1, int(round(solver.Nt * (n_cells / cells)**2)))
+        if not grids or n_cells < grids[-1][0]:
+            grids.append((n_cells, n_steps))
+    if len(grids) < 3:
+        raise ValueError("Сетка слишком грубая: для оценки порядка сходимости нужно не менее 3 различных сеток")
+    return grids
+
+
+def run_level(params, options):
+    """Расчет на одной сетке (в рабочем процессе): итоговые значения и время расчета"""
+    start = time.perf_counter()
+    result = HeatSolver(params, options).run(store_history=False)
+    return {"energy": float(result.energy[-1]), "eta": float(result.eta[-1]),
+            "elapsed": time.perf_counter() - start}
+
+
+def observed_order(f1, f2, f3, r21, r32, iterations=100):
+    """Наблюдаемый порядок сходимости по значениям на трех сетках (1 - самая мелкая).
+
+    r21, r32 - отношения шагов соседних сеток. При неравных отношениях
+    порядок находится итерациями (процедура Celik et al., 2008). Если
+    разности нулевые или решение не сходится, возвращается NaN.
+    """
+    e21, e32 = f2 - f1, f3 - f2
+    if e21 == 0 or e32 == 0 or not np.isfinite(e32 / e21):
+        return np.nan
+    s = np.sign(e32 / e21)
+    p = 0.0
+    for _ in range(iterations):
+        q = np.log((r21**p - s) / (r32**p - s)) if p > 0 else 0.0
+        p_next = abs(np.log(abs(e32 / e21)) + q) / np.log(r21)
+        if abs(p_next - p) < 1e-10:
+            return p_next
+        p = p_next
+    return np.nan
+
+
+def richardson(f1, f2, r21, p):
+    """Экстраполяция Ричардсона к нулевому шагу по двум самым мелким сеткам"""
+    if not np.isfinite(p) or p <= 0:
+        return f1
+    return (r21**p * f1 - f2) / (r21**p - 1)
+
+
+class ConvergenceStudy:
+    """Исследование сходимости по сетке для текущей конфигурации.
+
+    Конфигурация рассчитывается на levels последовательно измельчаемых
+    сетках (см. refinement_levels), расчеты выполняются параллельно в
+    процессах. По итоговым энергии и КПД вычисляются наблюдаемый порядок,
+    экстраполированные по Ричардсону значения и ошибка каждой сетки.
+    """
+
+    def __init__(self, params, options, levels=4, finer=1, tolerance=0.01):
+        if not tolerance > 0:
+            raise ValueError("Допуск должен быть положительным")
+        self.params = dict(params)
+        self.options = monte_carlo_options(options)
+        self.tolerance = tolerance
+        solver = HeatSolver(self.params, self.options)
+        self.base = (solver.Nx - 1, solver.Nt)
+        self.length = solver.L
+        self.t_end = t_end = solver.Nt * solver.dt
+
+        self.grids = refinement_levels(solver, levels, finer)
+        self.level_params = []
+        for n_cells, n_steps in self.grids:
+            level = dict(self.params, L=solver.L, dx=grid_step(solver.L, n_cells),
+                         dt=grid_step(t_end, n_steps), t_max=t_end)
+            self.level_params.append(level)
+        self.values = [None] * len(self.grids)
+
+    def submit(self, executor):
+        """Постановка расчетов всех сеток в executor, возвращает список Future (по сеткам)"""
+        return [executor.submit(run_level, params, self.options) for params in self.level_params]
+
+    def collect(self, index, values):
+        """Учет результата расчета на сетке index"""
+        self.values[index] = values
+
+    @property
+    def progress(self):
+        return sum(values is not None for values in self.values) / len(self.values)
+
+    def run(self, workers=None):
+        """Расчет всех сеток в пуле процессов"""
+        with ProcessPoolExecutor(workers or min(len(self.grids), os.cpu_count())) as executor:
+            for index, future in enumerate(self.submit(executor)):
+                self.collect(index, future.result())
+        return self.result()
+
+    def result(self):
+        return ConvergenceResult(self)
+
+
+class ConvergenceResult:
+    """Итоги исследования сходимости и рекомендуемая сетка"""
+
+    def __init__(self, study):
+        self.tolerance = study.tolerance
+        self.levels = []
+        for (n_cells, n_steps), params, values in zip(study.grids, study.level_params, study.values):
+            self.levels.append(dict(values, cells=n_cells, steps=n_steps, dx=params["dx"], dt=params["dt"],
+                                    current=(n_cells, n_steps) == study.base))
+        h = np.array([level["dx"] for level in self.levels])
+
+        # Порядок по каждой тройке соседних сеток; экстраполяция - по трем самым мелким
+        self.orders = {}
+        self.extrapolated = {}
+        self.errors = {}
+        for name in CONVERGENCE_QUANTITIES:
+            f = np.array([level[name] for level in self.levels])
+            self.orders[name] = [observed_order(f[i], f[i + 1], f[i + 2], h[i + 1] / h[i], h[i + 2] / h[i + 1])
+                                 for i in range(len(f) - 2)]
+            self.extrapolated[name] = richardson(f[0], f[1], h[1] / h[0], self.orders[name][0])
+            self.errors[name] = np.abs(f - self.extrapolated[name]) / abs(self.extrapolated[name])
+        # Общая ошибка сетки - наибольшая по величинам (КПД без подвода тепла не определен)
+        errors = np.array([self.errors[name] for name in CONVERGENCE_QUANTITIES])
+        self.error = np.max(np.where(np.isfinite(errors), errors, 0.0), axis=0)
+
+        # Самая грубая сетка, на которой она и все более мелкие укладываются в допуск
+        within = np.logical_and.accumulate(self.error <= self.tolerance)
+        self.recommended = int(np.flatnonzero(within)[-1]) if within[0] else None
+
+        # Если допуск не достигнут - оценка нужного шага по наблюдаемому порядку
+        self.required_dx = self.required_dt = None
+        p = self.orders["energy"][0]
+        if self.recommended is None and np.isfinite(p) and p > 0 and self.error[0] > 0:
+            # Шаги округляются вниз до целого числа интервалов по длине и по времени
+            factor = (self.tolerance / self.error[0])**(1 / p)
+            n_cells = int(np.ceil(self.levels[0]["cells"] / factor))
+            n_steps = int(np.ceil(self.levels[0]["steps"] / factor**2))
+            self.required_dx = grid_step(study.length, n_cells)
+            self.required_dt = grid_step(study.t_end, n_steps)
+
+    @property
+    def monotonic(self):
+        """Порядок определен на всех тройках сеток (сходимость монотонная)"""
+        return all(np.isfinite(p) for orders in self.orders.values() for p in orders)
+
+    def summary(self):
+        """Текстовое описание результата"""
+        lines = []
+        for k, level in enumerate(self.levels):
+            mark = " (текущая)" if level["current"] else ""
+            mark += " - рекомендуется" if k == self.recommended else ""
+            lines.append(f"dx = {level['dx']:.4g} м, dt = {level['dt']:.4g} с: энергия {level['energy']/1e6:.4f} МДж/м, "
+                         f"КПД {level['eta']*100:.3f} %, ошибка {self.error[k]*100:.3g} %, "
+                         f"расчет {level['elapsed']:.1f} с{mark}")
+        for name, label in (("energy", "энергии"), ("eta", "КПД")):
+            orders = ", ".join("-" if not np.isfinite(p) else f"{p:.2f}" for p in self.orders[name])
+            lines.append(f"Наблюдаемый порядок {label} по dx: {orders}")
+        lines.append(f"Экстраполяция Ричардсона: энергия {self.extrapolated['energy']/1e6:.4f} МДж/м, "
+                     f"КПД {self.extrapolated['eta']*100:.3f} %")
+        if not self.monotonic:
+            lines.append("Предупреждение: сходимость немонотонная, оценка ошибки приближенная")
+        if self.recommended is not None:
+            level = self.levels[self.recommended]
+            lines.append(f"Допуск {self.tolerance*100:g} % обеспечивает сетка dx = {level['dx']:.4g} м, "
+                         f"dt = {level['dt']:.4g} с")
+        elif self.required_dx is not None:
+            lines.append(f"Допуск {self.tolerance*100:g} % не достигнут; оценка нужных шагов: "
+                         f"dx ≈ {self.required_dx:.4g} м, dt ≈ {self.required_dt:.4g} с")
+        else:
+            lines.append(f"Допуск {self.tolerance*100:g} % не достигнут на исследованных сетках")
+        return "\n".join(lines)
@@ -0,0 +1,130 @@
+import numpy as np
+
+from probes import interpolate, interpolation_weights
+
+# Контролируемые величины: температура в точке, минимум, среднее и максимум по полю
+EVENT_QUANTITIES = ("probe", "min", "mean", "max")
+
+# Число делений пополам при уточнении момента пересечения для min/max
+BISECTION_STEPS = 30
+
+
+class TemperatureEvent:
+    """Пересечение контролируемой температурой набора целевых значений"""
+
+    def __init__(self, solver, quantity="probe", targets=(37.0,), x=None):
+        if quantity not in EVENT_QUANTITIES:
+            raise ValueError(f"Неизвестная величина события: {quantity}")
+        self.quantity = quantity
+        self.targets = np.asarray(targets, dtype=float)
+        self.x = solver.L / 2 if x is None else float(x)
+
+        # Линейная интерполяция между узлами сетки для точки контроля
+        if quantity == "probe":
+            self.index, self.weight = interpolation_weights(solver.x, self.x)
+
+        # Момент первого пересечения каждой цели, с (NaN - не достигнута)
+        self.times = np.full(solver.batch_shape + self.targets.shape, np.nan)
+
+    @property
+    def label(self):
+        if self.quantity == "probe":
+            return f"x={self.x:.2f} м"
+        return {"min": "минимум", "mean": "среднее", "max": "максимум"}[self.quantity]
+
+    def value(self, T):
+        """Значение контролируемой величины для поля T (..., Nx)"""
+        if self.quantity == "probe":
+            return interpolate(T, self.index, self.weight)
+        if self.quantity == "min":
+            return T.min(axis=-1)
+        if self.quantity == "mean":
+            return T.mean(axis=-1)
+        return T.max(axis=-1)
+
+    def crossing_fraction(self, T_prev, T_new, v_prev, v_new, target):
+        """Доля шага theta, на которой величина достигает target.
+
+        Шаг явной схемы линеен по времени: поле при частичном шаге равно
+        T_prev + theta * (T_new - T_prev). Для точки и среднего величина
+        линейна по theta, для минимума/максимума - кусочно-линейна, поэтому
+        используется деление пополам.
+        """
+        if self.quantity in ("probe", "mean"):
+            delta = v_new - v_prev
+            return np.clip(np.divide(target - v_prev, delta, out=np.ones_like(delta), where=delta != 0), 0.0, 1.0)
+
+        rising = v_new >= v_prev
+        lo = np.zeros_like(v_prev)
+        hi = np.ones_like(v_prev)
+        for _ in range(BISECTION_STEPS):
+            mid = (lo + hi) / 2
+            v_mid = self.value(T_prev + mid[..., np.newaxis] * (T_new - T_prev))
+            passed = np.where(rising, v_mid >= target, v_mid <= target)
+            hi = np.where(passed, mid, hi)
+            lo = np.where(passed, lo, mid)
+        return hi
+
+
+class EventDetector:
+    """Обнаружение событий "температура достигла цели" в ходе расчета"""
+
+    def __init__(self, solver, events):
+        self.dt = solver.dt
+        self.events = [TemperatureEvent(solver, **spec) for spec in events]
+        self.T_prev = solver.initial_field()
+        self.v_prev = [event.value(self.T_prev) for event in self.events]
+
+    @property
+    def finished(self):
+        """Все цели достигнуты во всех вариантах пакета"""
+        return all(not np.isnan(event.times).any() for event in self.events)
+
+    def record(self, n, T):
+        for k, event in enumerate(self.events):
+            v_prev = self.v_prev[k]
+            v_new = event.value(T)
+            pending = np.isnan(event.times)
+            if pending.any():
+                for j, target in enumerate(event.targets):
+                    crossed = pending[..., j] & ((v_prev - target) * (v_new - target) <= 0) & (v_new != v_prev)
+                    if not np.any(crossed):
+                        continue
+                    theta = event.crossing_fraction(self.T_prev, T, v_prev, v_new, target)
+                    event.times[..., j] = np.where(crossed, (n + theta) * self.dt, event.times[..., j])
+            self.v_prev[k] = v_new
+        self.T_prev = T
+
+    def fill_after_equilibrium(self, n, T_wall, tau, t_end):
+        """События на остатке расчета, заполненном аналитически после шага n.
+
+        На остатке поле затухает к постоянной по длине температуре стенки:
+        T_wall + (T - T_wall) * exp(-s / tau), s - время после шага n. Точка,
+        среднее, минимум и максимум поля затухают по тому же закону, поэтому
+        момент пересечения цели находится явно; моменты после t_end не учитываются.
+        """
+        t_start = (n + 1) * self.dt
+        for k, event in enumerate(self.events):
+            v = self.v_prev[k]
+            for j, target in enumerate(event.targets):
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    ratio = (target - T_wall) / (v - T_wall)
+                    t = t_start + tau * np.log(1 / ratio)
+                hit = np.isnan(event.times[..., j]) & (ratio > 0) & (ratio < 1) & (t <= t_end)
+                event.times[..., j] = np.where(hit, t, event.times[..., j])
+
+    def results(self):
+        """Список (описание, цель, время, с) для всех целей.
+
+        Для одного варианта время - число или None (цель не достигнута), для
+        пакета - массив с NaN для недостигнутых целей.
+        """
+        return [(event.label, float(target), event_time(event.times[..., j]))
+                for event in self.events for j, target in enumerate(event.targets)]
+
+
+def event_time(times):
+    """Время события: для одного варианта - float или None, для пакета - массив без изменений"""
+    if np.ndim(times) > 0:
+        return times
+    return None if np.isnan(times) else float(times)
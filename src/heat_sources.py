@@ -0,0 +1,151 @@
+import numpy as np
+
+from boundary_conditions import schedule_values
+
+# Модели активности микрофлоры
+SOURCE_MODELS = ("cardinal", "arrhenius")
+
+# Шаг таблицы мощности источника по температуре, K (значение берется в ближайшем узле)
+SOURCE_TABLE_STEP = 0.01
+
+# Универсальная газовая постоянная, Дж/(моль·K)
+R_GAS = 8.314
+
+# Кардинальные температуры (T_min, T_opt, T_max), °C, для типовых режимов сбраживания
+DIGESTION_PRESETS = {
+    "mesophilic": (10.0, 38.0, 45.0),
+    "thermophilic": (40.0, 55.0, 65.0),
+}
+
+
+def cardinal_activity(T, T_min, T_opt, T_max):
+    """Относительная активность по модели кардинальных температур (Rosso, CTMI).
+
+    Равна 1 при T_opt и 0 вне интервала (T_min, T_max).
+    """
+    if not T_min < T_opt < T_max:
+        raise ValueError("Кардинальные температуры должны удовлетворять T_min < T_opt < T_max")
+    T = np.asarray(T, dtype=float)
+    numerator = (T - T_max) * (T - T_min)**2
+    denominator = (T_opt - T_min) * ((T_opt - T_min) * (T - T_opt) - (T_opt - T_max) * (T_opt + T_min - 2*T))
+    inside = (T > T_min) & (T < T_max)
+    return np.where(inside, numerator / np.where(inside, denominator, 1.0), 0.0)
+
+
+def arrhenius_activity(T, T_ref, Ea, T_max=None):
+    """Относительная активность по закону Аррениуса (1 при T_ref, 0 выше T_max)"""
+    T = np.asarray(T, dtype=float)
+    activity = np.exp(Ea / R_GAS * (1 / (T_ref + 273.15) - 1 / (T + 273.15)))
+    if T_max is not None:
+        activity = np.where(T < T_max, activity, 0.0)
+    return activity
+
+
+class HeatSource:
+    """Объемный источник тепла биологического происхождения q(T, t), Вт/м³.
+
+    q(T, t) = q_max * loading(t) * activity(T)
+
+    activity - модель "cardinal" (кардинальные температуры, по умолчанию
+    мезофильный режим) или "arrhenius"; loading(t) - относительная нагрузка
+    по субстрату (график, как для граничных условий). Кривая q_max * activity
+    один раз табулируется на мелкой равномерной сетке температур, нагрузка
+    вычисляется заранее для всех шагов, поэтому пересчет мощности - это
+    вычисление номера узла таблицы и выборка, без поиска и без вычисления
+    самой кривой. По умолчанию мощность по температуре пересчитывается на
+    каждом шаге (update_interval = 1). Пересчет раз в update_interval > 1
+    шагов ускоряет шаг, но мощность запаздывает за полем до
+    (update_interval - 1) * dt: ошибка q не больше
+    (update_interval - 1) * dt * max|dq/dT| * max|dT/dt|, а обратная связь
+    температура - активность (особенно крутая у модели Аррениуса) сдвигается
+    на то же время. Нагрузка шага учитывается всегда.
+    """
+
+    def __init__(self, spec):
+        spec = dict(spec)
+        self.model = spec.pop("model", "cardinal")
+        if self.model not in SOURCE_MODELS:
+            raise ValueError(f"Неизвестная модель источника '{self.model}' (ожидается {', '.join(SOURCE_MODELS)})")
+        self.q_max = float(spec.pop("q_max"))
+        self.loading = spec.pop("loading", 1.0)
+        self.update_interval = int(spec.pop("update_interval", 1))
+        if self.update_interval < 1:
+            raise ValueError("Интервал пересчета источника должен быть не меньше 1 шага")
+
+        if self.model == "cardinal":
+            preset = spec.pop("preset", "mesophilic")
+            if preset not in DIGESTION_PRESETS:
+                raise ValueError(f"Неизвестный режим '{preset}' (ожидается {', '.join(DIGESTION_PRESETS)})")
+            T_min, T_opt, T_max = DIGESTION_PRESETS[preset]
+            self.cardinal = (float(spec.pop("T_min", T_min)), float(spec.pop("T_opt", T_opt)),
+                             float(spec.pop("T_max", T_max)))
+            self.T_range = (self.cardinal[0], self.cardinal[2])
+        else:
+            T_max = spec.pop("T_max", None)
+            self.arrhenius = (float(spec.pop("T_ref", 35.0)), float(spec.pop("Ea", 60000.0)),
+                              None if T_max is None else float(T_max))
+            self.T_range = (self.arrhenius[0], self.arrhenius[0] if T_max is None else float(T_max))
+        if spec:
+            raise ValueError(f"Неизвестные ключи источника тепла: {', '.join(sorted(spec))}")
+
+    def activity(self, T):
+        """Относительная активность микрофлоры при температуре T"""
+        if self.model == "cardinal":
+            return cardinal_activity(T, *self.cardinal)
+        return arrhenius_activity(T, *self.arrhenius)
+
+    def precompute(self, times, temperature_bounds, widths, step=SOURCE_TABLE_STEP):
+        """Таблица q_max * activity(T) и нагрузка для моментов times.
+
+        widths - доли длины, приходящиеся на узлы (для мощности на единицу площади).
+        """
+        # Сетка охватывает диапазон расчета с запасом и всю кривую активности;
+        # за ее пределами берутся крайние значения
+        T_lo = min(temperature_bounds[0] - 20.0, self.T_range[0])
+        T_hi = max(temperature_bounds[1] + 20.0, self.T_range[1])
+        n = int(np.ceil((T_hi - T_lo) / step)) + 1
+        self.table = self.q_max * self.activity(T_lo + step * np.arange(n))
+        # Номер ближайшего узла: int(T * inv_step + offset)
+        self.inv_step = 1.0 / step
+        self.offset = 0.5 - T_lo / step
+        loading = schedule_values(self.loading, times)
+        if np.any(loading < 0):
+            raise ValueError("Нагрузка по субстрату не может быть отрицательной")
+        # Список чисел: выборка на шаге дает обычное число, а не скаляр NumPy
+        self.loading_values = loading.tolist()
+        self.whole = self.part(widths)
+
+    def part(self, widths):
+        """Мощность на части узлов с долями длины widths (со своим кэшем, например для потока расчета)"""
+        return SourcePart(self, widths)
+
+    def rate(self, T, n):
+        """Мощность при единичной нагрузке на шаге n: в узлах поля T (Вт/м³) и суммарная (Вт/м)"""
+        return self.whole.rate(T, n)
+
+    def describe(self):
+        if self.model == "cardinal":
+            T_min, T_opt, T_max = self.cardinal
+            return f"кардинальные температуры {T_min:g}/{T_opt:g}/{T_max:g} °C, q_max={self.q_max:g} Вт/м³"
+        return f"Аррениус, q_ref={self.q_max:g} Вт/м³"
+
+
+class SourcePart:
+    """Мощность источника на части узлов сетки.
+
+    Хранит мощность, рассчитанную на последнем шаге пересчета (раз в
+    update_interval шагов), поэтому у каждой части (потока расчета) свой кэш.
+    """
+
+    def __init__(self, source, widths):
+        self.source = source
+        self.widths = widths
+        self.cached = None
+
+    def rate(self, T, n):
+        """Мощность при единичной нагрузке на шаге n: в узлах T (Вт/м³) и суммарная по части (Вт/м)"""
+        source = self.source
+        if n % source.update_interval == 0 or self.cached is None:
+            q = source.table.take((T * source.inv_step + source.offset).astype(np.intp), mode='clip')
+            self.cached = (q, q @ self.widths)
+        return self.cached
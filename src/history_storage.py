@@ -0,0 +1,247 @@
+import zipfile
+
+import numpy as np
+
+# Допустимые форматы хранения истории
+HISTORY_PRECISIONS = ("float64", "float32", "int16")
+
+# Методы сжатия сохраняемых результатов (стандартная библиотека zipfile)
+COMPRESSION_METHODS = {
+    None: zipfile.ZIP_STORED,
+    "zlib": zipfile.ZIP_DEFLATED,
+    "bz2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+INT16_LIMIT = 32767
+
+
+class HistoryStorage:
+    """Хранилище истории температурного поля с выбором точности.
+
+    Поле решателя всегда считается в float64, а в историю записывается:
+      float64 - без потерь;
+      float32 - погрешность не более |T| * 2**-24 (~6e-6 K при 100 °C);
+      int16   - квантование T = offset + scale * q, погрешность не более scale / 2
+                внутри диапазона T_range; значения вне диапазона обрезаются до его
+                границ, их число - clipped, погрешность учитывается в max_abs_error.
+    """
+
+    def __init__(self, n_rows, Nx, precision="float64", T_range=None, out=None):
+        if precision not in HISTORY_PRECISIONS:
+            raise ValueError(f"Неизвестная точность хранения истории: {precision}")
+        self.precision = precision
+        self.Nx = Nx
+        self.count = 0
+        self.scale = 1.0
+        self.offset = 0.0
+        # Наибольший выход записанных температур за диапазон T_range, K (известен, если запись шла здесь)
+        self.clip_error = 0.0
+        self.clip_tracked = True
+
+        if precision == "int16":
+            if T_range is None:
+                raise ValueError("Для хранения в int16 требуется диапазон температур")
+            T_lo, T_hi = float(min(T_range)), float(max(T_range))
+            if T_hi <= T_lo:
+                T_hi = T_lo + 1.0
+            self.offset = (T_hi + T_lo) / 2
+            self.scale = (T_hi - T_lo) / (2 * INT16_LIMIT)
+
+        # out - заранее выделенный массив (например, в разделяемой памяти)
+        self.data = np.empty((n_rows, Nx), dtype=np.dtype(precision)) if out is None else out
+
+    def encode(self, T):
+        """Перевод температур в формат хранения"""
+        if self.precision != "int16":
+            return T
+        q = np.rint((T - self.offset) / self.scale)
+        outside = np.abs(q) > INT16_LIMIT
+        if outside.any():
+            excess = np.abs(np.asarray(T) - self.offset)[outside] - INT16_LIMIT * self.scale
+            self.clip_error = max(self.clip_error, float(np.max(excess)))
+        return np.clip(q, -INT16_LIMIT, INT16_LIMIT)
+
+    def decode(self, values):
+        """Восстановление температур (float64) из формата хранения"""
+        if self.precision != "int16":
+            return values.astype(np.float64)
+        return self.offset + self.scale * values.astype(np.float64)
+
+    def append(self, T):
+        """Запись очередного временного слоя"""
+        self.data[self.count] = self.encode(T)
+        self.count += 1
+
+    def record(self, n, T):
+        """Запись слоя n в ходе расчета (интерфейс наблюдателя решателя)"""
+        self.append(T)
+
+    def extend(self, rows):
+        """Запись нескольких временных слоев сразу"""
+        rows = np.atleast_2d(rows)
+        self.data[self.count:self.count + len(rows)] = self.encode(rows)
+        self.count += len(rows)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.decode(self.data[:self.count][index])
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Индекс временного слоя вне диапазона")
+        return self.decode(self.data[index])
+
+    def __iter__(self):
+        for n in range(self.count):
+            yield self.decode(self.data[n])
+
+    def column(self, i):
+        """Временной ряд температуры в узле i"""
+        return self.decode(self.data[:self.count, i])
+
+    @property
+    def nbytes(self):
+        return self.data[:self.count].nbytes
+
+    @property
+    def clipped(self):
+        """Число хранимых значений на границе диапазона int16 (обрезанных при записи)"""
+        if self.precision != "int16":
+            return 0
+        return int(np.count_nonzero(np.abs(self.data[:self.count]) == INT16_LIMIT))
+
+    def max_abs_error(self, T_abs_max=None):
+        """Гарантированная максимальная погрешность хранимых температур, K.
+
+        Для int16 с обрезанными значениями - с учетом выхода за диапазон; если
+        история записана в другом процессе и выход неизвестен - inf.
+        """
+        if self.precision == "float64":
+            return 0.0
+        if self.precision == "float32":
+            if T_abs_max is None:
+                T_abs_max = float(np.abs(self.decode(self.data[:self.count])).max(initial=0.0))
+            return T_abs_max * 2.0**-24
+        if self.clipped == 0:
+            return self.scale / 2
+        return max(self.scale / 2, self.clip_error) if self.clip_tracked else np.inf
+
+    def truncate(self, n_rows):
+        """Отбрасывание слоев после n_rows (досрочная остановка расчета)"""
+        self.count = min(self.count, n_rows)
+
+    def save(self, filename, compression="zlib", chunk_rows=1024, extra_arrays=None):
+        """Сохранение истории в .npz, разбитой на сжатые блоки по chunk_rows слоев"""
+        if compression not in COMPRESSION_METHODS:
+            raise ValueError(f"Неизвестный метод сжатия: {compression}")
+        chunk_rows = max(1, int(chunk_rows))
+
+        arrays = {
+            "precision": np.array(self.precision),
+            "scale": np.array(self.scale),
+            "offset": np.array(self.offset),
+            "shape": np.array([self.count, self.Nx]),
+            "chunk_rows": np.array(chunk_rows),
+        }
+        if extra_arrays:
+            arrays.update({key: np.asarray(value) for key, value in extra_arrays.items()})
+
+        with zipfile.ZipFile(filename, 'w', compression=COMPRESSION_METHODS[compression]) as zf:
+            for key, value in arrays.items():
+                _write_npy(zf, key, value)
+            for k, start in enumerate(range(0, self.count, chunk_rows)):
+                _write_npy(zf, f"chunk_{k:06d}", self.data[start:start + chunk_rows])
+
+    @classmethod
+    def from_data(cls, data, scale=1.0, offset=0.0):
+        """Хранилище поверх готового массива слоев (без копирования)"""
+        storage = cls.__new__(cls)
+        storage.precision = data.dtype.name
+        storage.scale = float(scale)
+        storage.offset = float(offset)
+        storage.Nx = data.shape[1]
+        storage.count = data.shape[0]
+        storage.data = data
+        storage.clip_error = 0.0
+        storage.clip_tracked = False
+        return storage
+
+    @classmethod
+    def load(cls, filename):
+        """Загрузка истории и дополнительных массивов, сохраненных методом save"""
+        with np.load(filename) as npz:
+            n_rows, Nx = (int(v) for v in npz["shape"])
+            precision = str(npz["precision"])
+            storage = cls.from_data(np.empty((n_rows, Nx), dtype=np.dtype(precision)),
+                                    float(npz["scale"]), float(npz["offset"]))
+
+            chunk_rows = int(npz["chunk_rows"])
+            for k, start in enumerate(range(0, n_rows, chunk_rows)):
+                storage.data[start:start + chunk_rows] = npz[f"chunk_{k:06d}"]
+
+            service_keys = {"precision", "scale", "offset", "shape", "chunk_rows"}
+            extra = {key: npz[key] for key in npz.files
+                     if key not in service_keys and not key.startswith("chunk_")}
+        return storage, extra
+
+
+def snapshot_rows(Nt):
+    """Номера слоев для профилей на графике и в экспорте"""
+    return sorted({0, Nt // 4, Nt // 2, 3 * Nt // 4, Nt - 1})
+
+
+class SnapshotStorage:
+    """Температурные профили только в выбранных слоях (без полной истории)"""
+
+    def __init__(self, rows, Nx, precision="float64", T_range=None, out=None):
+        self.rows = sorted(set(rows))
+        self.storage = HistoryStorage(len(self.rows) + 1, Nx, precision, T_range, out)
+        self.stored_rows = []
+
+    @classmethod
+    def from_storage(cls, stored_rows, storage):
+        """Восстановление по сохраненным слоям и хранилищу профилей"""
+        snapshots = cls.__new__(cls)
+        snapshots.rows = [int(n) for n in stored_rows]
+        snapshots.stored_rows = list(snapshots.rows)
+        snapshots.storage = storage
+        return snapshots
+
+    def record(self, n, T):
+        if n in self.rows:
+            self.add(n, T)
+
+    def add(self, n, T):
+        """Сохранение профиля слоя n (в т.ч. последнего при досрочной остановке)"""
+        if n not in self.stored_rows:
+            self.storage.append(T)
+            self.stored_rows.append(n)
+
+    def profiles(self, Nt):
+        """Список (номер слоя, профиль) для слоев с номером меньше Nt"""
+        return [(n, self.storage[k]) for k, n in enumerate(self.stored_rows) if n < Nt]
+
+    @property
+    def precision(self):
+        return self.storage.precision
+
+    @property
+    def nbytes(self):
+        return self.storage.nbytes
+
+    @property
+    def clipped(self):
+        return self.storage.clipped
+
+    def max_abs_error(self):
+        return self.storage.max_abs_error()
+
+
+def _write_npy(zf, name, array):
+    """Запись массива в архив в формате .npy"""
+    with zf.open(name + ".npy", 'w', force_zip64=True) as f:
+        np.lib.format.write_array(f, np.asarray(array), allow_pickle=False)
@@ -0,0 +1,88 @@
+import json
+import urllib.error
+import urllib.request
+
+from boundary_conditions import load_schedule_csv
+from material_properties import SUBSTRATE_LIBRARY, resolve_material
+from result_io import dumps_json, result_from_bytes
+
+
+class JobServerError(Exception):
+    """Ошибка обращения к серверу заданий"""
+
+
+def inline_schedule(spec):
+    """График с загруженными точками вместо пути к CSV-файлу (ключ "file")"""
+    if isinstance(spec, dict) and "file" in spec:
+        return dict(load_schedule_csv(spec["file"]), **{k: v for k, v in spec.items() if k != "file"})
+    return spec
+
+
+def inline_material(spec):
+    """Таблицы материала вместо пути к CSV-файлу или имени из локального каталога материалов"""
+    if isinstance(spec, str) and spec not in SUBSTRATE_LIBRARY:
+        return resolve_material(spec).to_spec()
+    return spec
+
+
+def inline_files(options):
+    """Настройки для сервера заданий: данные локальных файлов передаются вместо путей.
+
+    Сервер работает на своей машине и не видит файлов клиента, поэтому
+    таблицы материалов и точки графиков загружаются здесь.
+    """
+    options = dict(options)
+    if options.get("material"):
+        options["material"] = inline_material(options["material"])
+    if options.get("layers"):
+        options["layers"] = [dict(layer, material=inline_material(layer["material"])) if layer.get("material")
+                             else layer for layer in options["layers"]]
+    for side in ("boundary_left", "boundary_right"):
+        if isinstance(options.get(side), dict) and "schedule" in options[side]:
+            options[side] = dict(options[side], schedule=inline_schedule(options[side]["schedule"]))
+    if isinstance(options.get("heat_source"), dict) and "loading" in options["heat_source"]:
+        options["heat_source"] = dict(options["heat_source"], loading=inline_schedule(options["heat_source"]["loading"]))
+    return options
+
+
+class JobClient:
+    """Клиент локального сервера заданий (job_server.py)"""
+
+    def __init__(self, url, timeout=10.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method, path, payload=None):
+        """HTTP-запрос к серверу, возвращает тело ответа"""
+        data = dumps_json(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method)
+        if data is not None:
+            request.add_header("Content-Type", "application/json; charset=utf-8")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode('utf-8'))["error"]
+            except (ValueError, KeyError):
+                message = e.reason
+            raise JobServerError(f"Сервер заданий: {message} ({e.code})") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise JobServerError(f"Сервер заданий недоступен: {e}") from e
+
+    def submit(self, params, options):
+        """Постановка задания в очередь, возвращает его идентификатор"""
+        reply = self.request("POST", "/jobs", {"params": params, "options": inline_files(options)})
+        return json.loads(reply.decode('utf-8'))["id"]
+
+    def status(self, job_id):
+        """Состояние задания: status, progress, error"""
+        return json.loads(self.request("GET", f"/jobs/{job_id}").decode('utf-8'))
+
+    def result(self, job_id):
+        """Результат завершенного задания (SimulationResult)"""
+        return result_from_bytes(self.request("GET", f"/jobs/{job_id}/result"))
+
+    def cancel(self, job_id):
+        """Отмена задания"""
+        self.request("DELETE", f"/jobs/{job_id}")
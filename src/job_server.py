@@ -0,0 +1,331 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from material_properties import SUBSTRATE_LIBRARY
+from result_io import dumps_json, result_to_bytes
+from shared_results import SharedResultBuffer, run_shared
+from solver import DEFAULT_PARAMETERS, HeatSolver, SimulationCancelled
+from solver_options import DEFAULT_SOLVER_OPTIONS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Состояния заданий
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# Максимальный размер тела запроса, байт
+MAX_REQUEST_BODY = 1 << 20
+
+HTTP_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+                500: "Internal Server Error", 503: "Service Unavailable"}
+
+# Дополнительные параметры модели, допустимые помимо полей ввода
+EXTRA_PARAMETERS = ("b", "T0")
+
+
+def check_file_options(options):
+    """Отказ от настроек с путями к файлам: сервер не видит файлов клиента.
+
+    Таблицы материалов и точки графиков передаются в самих настройках
+    (JobClient делает это автоматически, см. job_client.inline_files).
+    """
+    materials = [options.get("material")] + [layer.get("material") for layer in options.get("layers") or ()
+                                             if isinstance(layer, dict)]
+    for material in materials:
+        if isinstance(material, str) and material not in SUBSTRATE_LIBRARY:
+            raise ValueError(f"Материал '{material}' не из встроенной библиотеки: передайте таблицы свойств "
+                             f"(Material.to_spec), а не путь к файлу")
+    schedules = [(side, (options.get(side) or {}).get("schedule")) for side in ("boundary_left", "boundary_right")]
+    schedules.append(("heat_source", (options.get("heat_source") or {}).get("loading")))
+    for name, schedule in schedules:
+        if isinstance(schedule, dict) and "file" in schedule:
+            raise ValueError(f"Настройка {name}: передайте точки графика, а не путь к файлу {schedule['file']}")
+
+
+class Job:
+    """Задание на расчет"""
+
+    def __init__(self, params, options):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.options = options
+        self.status = JOB_QUEUED
+        self.error = None
+        # Сегмент разделяемой памяти с результатом и данные, возвращенные рабочим процессом
+        self.buffer = None
+        self.outcome = None
+        # Размер результата (сохраняется и после освобождения памяти)
+        self.result_bytes = 0
+        # Число выполняемых выгрузок результата: пока они идут, память не освобождается
+        self.exports = 0
+        self.release_pending = False
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "progress": 1.0 if self.status == JOB_DONE else self.buffer.progress if self.buffer is not None else 0.0,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "result_bytes": self.result_bytes,
+        }
+
+    def release(self):
+        """Освобождение памяти результата (после завершения выгрузок, если они идут)"""
+        if self.exports:
+            self.release_pending = True
+            return
+        if self.buffer is not None:
+            self.buffer.release()
+            self.buffer = None
+        self.outcome = None
+
+
+class JobServer:
+    """Локальный сервер заданий: очередь, пул рабочих процессов, HTTP API.
+
+    POST   /jobs             - постановка задания {"params": {...}, "options": {...}}
+    GET    /jobs             - список заданий
+    GET    /jobs/<id>        - состояние и ход выполнения
+    GET    /jobs/<id>/result - результат (.npz, application/octet-stream)
+    DELETE /jobs/<id>        - отмена задания или удаление результата
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, max_queue=100,
+                 max_results=20, result_ttl=3600.0):
+        self.host = host
+        self.port = port
+        self.workers = workers or max(1, multiprocessing.cpu_count() - 1)
+        self.max_queue = max_queue
+        self.max_results = max_results
+        self.result_ttl = result_ttl
+        self.jobs = {}
+
+    async def serve(self):
+        """Запуск сервера до остановки процесса"""
+        with ProcessPoolExecutor(self.workers) as executor:
+            self.executor = executor
+            self.queue = asyncio.Queue()
+
+            tasks = [asyncio.create_task(self.dispatch()) for _ in range(self.workers)]
+            tasks.append(asyncio.create_task(self.cleanup_loop()))
+            server = await asyncio.start_server(self.handle_client, self.host, self.port)
+            print(f"Сервер заданий запущен на http://{self.host}:{self.port} "
+                  f"(рабочих процессов: {self.workers})")
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def dispatch(self):
+        """Передача заданий из очереди в пул рабочих процессов"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id = await self.queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != JOB_QUEUED:
+                continue
+
+            job.status = JOB_RUNNING
+            job.started = time.time()
+            try:
+                # Результаты пишутся рабочим процессом прямо в разделяемую память сервера
+                job.buffer = SharedResultBuffer(HeatSolver(job.params, job.options))
+                job.outcome = await loop.run_in_executor(
+                    self.executor, run_shared, job.params, job.options, job.buffer.descriptor)
+                job.result_bytes = job.buffer.nbytes
+                job.status = JOB_DONE
+            except SimulationCancelled:
+                job.status = JOB_CANCELLED
+            except Exception as e:
+                job.status = JOB_FAILED
+                job.error = str(e)
+            if job.status != JOB_DONE:
+                job.release()
+            job.finished = time.time()
+            self.enforce_retention()
+
+    async def cleanup_loop(self):
+        """Периодическое удаление устаревших результатов"""
+        while True:
+            await asyncio.sleep(max(1.0, min(60.0, self.result_ttl / 10)))
+            self.enforce_retention()
+
+    def enforce_retention(self):
+        """Ограничение числа и срока хранения завершенных заданий"""
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if job.status in FINISHED_STATES),
+                          key=lambda job: job.finished)
+        excess = len(finished) - self.max_results
+        for k, job in enumerate(finished):
+            if k < excess or now - job.finished > self.result_ttl:
+                self.jobs.pop(job.id).release()
+
+    def submit(self, request):
+        """Проверка и постановка задания в очередь"""
+        params = request.get("params")
+        options = request.get("options", {})
+        if not isinstance(params, dict) or not isinstance(options, dict):
+            raise ValueError("Ожидаются объекты params и options")
+
+        unknown = set(params) - set(DEFAULT_PARAMETERS) - set(EXTRA_PARAMETERS)
+        unknown |= set(options) - set(DEFAULT_SOLVER_OPTIONS)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры: {', '.join(sorted(unknown))}")
+        for name, value in params.items():
+            if not isinstance(value, (int, float)):
+                raise ValueError(f"Параметр {name} должен быть числом")
+        check_file_options(options)
+
+        pending = sum(job.status == JOB_QUEUED for job in self.jobs.values())
+        if pending >= self.max_queue:
+            raise OverflowError("Очередь заданий заполнена")
+
+        # Задание не должно пересылаться дальше
+        options = dict(options, job_server_url=None)
+        job = Job(params, options)
+        self.jobs[job.id] = job
+        self.queue.put_nowait(job.id)
+        return job
+
+    def cancel(self, job):
+        """Отмена задания; для завершенных - удаление результата"""
+        if job.status == JOB_QUEUED:
+            job.status = JOB_CANCELLED
+            job.finished = time.time()
+        elif job.status == JOB_RUNNING:
+            if job.buffer is not None:
+                job.buffer.cancel()
+        else:
+            self.jobs.pop(job.id).release()
+
+    async def export_result(self, job):
+        """Результат задания в байтах .npz; упаковка идет в потоке, не блокируя обработку других запросов"""
+        loop = asyncio.get_running_loop()
+        job.exports += 1
+        try:
+            return await loop.run_in_executor(None, lambda: result_to_bytes(job.buffer.result(*job.outcome)))
+        finally:
+            job.exports -= 1
+            if job.release_pending:
+                job.release()
+
+    async def route(self, method, path, body):
+        """Обработка запроса, возвращает (код ответа, JSON-объект или байты результата)"""
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        if not parts or parts[0] != "jobs" or len(parts) > 3:
+            return 404, {"error": "Неизвестный адрес"}
+
+        if len(parts) == 1:
+            if method == "GET":
+                return 200, [job.to_dict() for job in self.jobs.values()]
+            if method == "POST":
+                try:
+                    job = self.submit(json.loads(body.decode('utf-8') or "{}"))
+                except OverflowError as e:
+                    return 503, {"error": str(e)}
+                except (ValueError, AttributeError) as e:
+                    return 400, {"error": str(e)}
+                return 202, job.to_dict()
+            return 405, {"error": "Метод не поддерживается"}
+
+        job = self.jobs.get(parts[1])
+        if job is None:
+            return 404, {"error": "Задание не найдено"}
+
+        if len(parts) == 3:
+            if parts[2] != "result" or method != "GET":
+                return 404, {"error": "Неизвестный адрес"}
+            if job.status != JOB_DONE:
+                return 409, {"error": f"Задание в состоянии {job.status}"}
+            return 200, await self.export_result(job)
+
+        if method == "GET":
+            return 200, job.to_dict()
+        if method == "DELETE":
+            self.cancel(job)
+            return 200, job.to_dict()
+        return 405, {"error": "Метод не поддерживается"}
+
+    async def handle_client(self, reader, writer):
+        """Разбор HTTP/1.1 запроса и отправка ответа (соединение закрывается)"""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            if len(request_line) != 3:
+                status, payload = 400, {"error": "Некорректный запрос"}
+            else:
+                length = int(headers.get("content-length", 0))
+                if length > MAX_REQUEST_BODY:
+                    status, payload = 413, {"error": "Слишком большой запрос"}
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self.route(request_line[0].upper(), request_line[1], body)
+                    except Exception as e:
+                        print(f"Ошибка обработки запроса {request_line[0]} {request_line[1]}: {e!r}")
+                        status, payload = 500, {"error": f"Внутренняя ошибка сервера: {e}"}
+
+            if isinstance(payload, bytes):
+                content_type, data = "application/octet-stream", payload
+            else:
+                content_type, data = "application/json; charset=utf-8", dumps_json(payload).encode('utf-8')
+
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + data
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный сервер заданий BioGas NormLab")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="число рабочих процессов")
+    parser.add_argument("--max-queue", type=int, default=100, help="максимум заданий в очереди")
+    parser.add_argument("--max-results", type=int, default=20, help="сколько завершенных заданий хранить")
+    parser.add_argument("--result-ttl", type=float, default=3600.0, help="срок хранения результата, с")
+    args = parser.parse_args()
+
+    server = JobServer(args.host, args.port, args.workers, args.max_queue, args.max_results, args.result_ttl)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("Сервер заданий остановлен")
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
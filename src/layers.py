@@ -0,0 +1,221 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from material_properties import CP_WATER, LAMBDA_WATER, UniformLookup, resolve_material
+
+# Свойства слоя, которые можно задать явно (иначе берутся из параметров модели)
+LAYER_PROPERTIES = ("rho", "H", "Cp_dry", "lambda_dry")
+
+
+class Layer:
+    """Слой реактора толщиной thickness (м).
+
+    material - субстрат с табличными λ(T), Cp(T) сухого вещества (имя из
+    библиотеки или путь к CSV). Свойства, не заданные ни таблицей, ни явно,
+    берутся из параметров модели (полей ввода).
+    """
+
+    def __init__(self, thickness, name=None, material=None, rho=None, H=None, Cp_dry=None, lambda_dry=None):
+        if not thickness > 0:
+            raise ValueError("Толщина слоя должна быть положительной")
+        self.thickness = float(thickness)
+        self.material = resolve_material(material) if material else None
+        self.name = name or (self.material.name if self.material is not None else None)
+        self.rho = rho
+        self.H = H
+        self.Cp_dry = Cp_dry
+        self.lambda_dry = lambda_dry
+
+    def value(self, prop, default):
+        """Явно заданное свойство слоя или значение по умолчанию"""
+        value = getattr(self, prop)
+        return default if value is None else value
+
+
+def parse_layers(specs):
+    """Слои из настройки "layers": список словарей с ключами аргументов Layer"""
+    layers = []
+    for k, spec in enumerate(specs):
+        if isinstance(spec, Layer):
+            layer = spec
+        else:
+            try:
+                layer = Layer(**spec)
+            except TypeError as e:
+                raise ValueError(f"Слой {k + 1}: неверное описание ({e})") from e
+        if layer.name is None:
+            layer.name = f"Слой {k + 1}"
+        layers.append(layer)
+    if not layers:
+        raise ValueError("Список слоев пуст")
+    return layers
+
+
+def load_layers_csv(filename):
+    """Загрузка описания слоев из CSV (разделитель ";", десятичная запятая).
+
+    Столбцы: thickness (м, обязательный), name, material, rho, H, Cp_dry,
+    lambda_dry; пустые ячейки - значение из параметров модели. Возвращает
+    список словарей для настройки "layers".
+    """
+    df = pd.read_csv(filename, sep=';', decimal=',', encoding='utf-8-sig')
+    df.columns = [str(column).strip() for column in df.columns]
+    if "thickness" not in df.columns:
+        raise ValueError("В файле нет столбца thickness")
+    unknown = set(df.columns) - {"thickness", "name", "material"} - set(LAYER_PROPERTIES)
+    if unknown:
+        raise ValueError(f"Неизвестные столбцы: {', '.join(sorted(unknown))}")
+
+    specs = []
+    for _, row in df.iterrows():
+        spec = {"thickness": float(row["thickness"])}
+        for key in ("name", "material"):
+            if key in df.columns and isinstance(row[key], str) and row[key].strip():
+                spec[key] = row[key].strip()
+        for key in LAYER_PROPERTIES:
+            if key in df.columns and pd.notna(row[key]):
+                spec[key] = float(row[key])
+        specs.append(spec)
+    parse_layers(specs)  # Проверка описания
+    return specs
+
+
+class PropertyField:
+    """Свойства смеси в узлах сетки для слоистой среды или табличного материала.
+
+    В узле i:
+        λ_i(T)   = a_i * G[r_i](T) + d_i * T + c_i
+        ρCp_i(T) = p_i * G[s_i](T) + q_i
+    G - табличные функции сухого вещества на общей равномерной сетке (строка 0
+    нулевая - для слоев без таблиц). Линейный закон lambda0 * (1 + b * (T - T0))
+    и постоянная теплоемкость входят в коэффициенты d, c и q, поэтому свойства
+    всех слоев вычисляются одним выражением без циклов по слоям.
+    """
+
+    def __init__(self, solver, layers):
+        self.layers = layers
+        self.edges = np.concatenate(([0.0], np.cumsum([layer.thickness for layer in layers])))
+        # Номер слоя для каждого узла сетки
+        self.node_layer = np.clip(np.searchsorted(self.edges, solver.x, side='right') - 1, 0, len(layers) - 1)
+        # Суммирование по узлам слоя (слой без узлов дает нулевой столбец)
+        self.layer_matrix = np.zeros((solver.Nx, len(layers)))
+        self.layer_matrix[np.arange(solver.Nx), self.node_layer] = solver.cell_widths
+        for k, layer in enumerate(layers):
+            if not np.any(self.node_layer == k):
+                print(f"Предупреждение: слой '{layer.name}' тоньше шага сетки и не содержит узлов")
+
+        # Нулевая таблица охватывает диапазон температур расчета
+        tables = [(list(solver.temperature_bounds), [0.0, 0.0])]
+
+        coefficients = {name: [] for name in ("a", "d", "c", "p", "q")}
+        lambda_rows = []
+        cp_rows = []
+        for layer in layers:
+            rho = layer.value("rho", solver.rho)
+            H = layer.value("H", solver.H) / 100.0
+            material_tables = layer.material.tables if layer.material is not None else {}
+
+            if "lambda" in material_tables:
+                lambda_rows.append(len(tables))
+                tables.append(material_tables["lambda"])
+                a, d, c = 1 - H, 0.0, LAMBDA_WATER * H
+            else:
+                lambda_rows.append(0)
+                lambda0 = layer.value("lambda_dry", solver.lambda_dry) * (1 - H) + LAMBDA_WATER * H
+                a, d, c = 0.0, lambda0 * solver.b, lambda0 * (1 - solver.b * solver.T0)
+
+            if "Cp" in material_tables:
+                cp_rows.append(len(tables))
+                tables.append(material_tables["Cp"])
+                p, q = rho * (1 - H), rho * H * CP_WATER
+            else:
+                cp_rows.append(0)
+                p, q = 0.0, rho * (layer.value("Cp_dry", solver.Cp_dry) * (1 - H) + CP_WATER * H)
+
+            for name, value in zip("adcpq", (a, d, c, p, q)):
+                coefficients[name].append(np.broadcast_to(np.asarray(value, dtype=float), solver.batch_shape))
+
+        # Коэффициенты по узлам: (..., Nx)
+        for name, values in coefficients.items():
+            setattr(self, name, np.stack(values, axis=-1)[..., self.node_layer])
+        self.lambda_rows = np.asarray(lambda_rows)[self.node_layer]
+        self.cp_rows = np.asarray(cp_rows)[self.node_layer]
+
+        self.lookup = UniformLookup(tables, solver.options["property_lookup_step"]) if len(tables) > 1 else None
+        self.lambda_tabulated = bool(np.any(self.lambda_rows))
+        self.lambda_linear = bool(np.any(self.d))
+        self.cp_tabulated = bool(np.any(self.cp_rows))
+
+        # Интеграл табличной Cp от начальной температуры (для энергии поля)
+        self.T_init = np.broadcast_to(solver.column(solver.T_init), solver.batch_shape + (solver.Nx,))
+        self.enthalpy_init = self.lookup.integral(self.T_init, self.cp_rows) if self.cp_tabulated else 0.0
+
+    def chunk(self, lo, hi):
+        """Свойства узлов lo..hi-1 (для расчета области по частям).
+
+        Таблицы общие, но у каждой части своя копия UniformLookup: кэш
+        положения последнего поля (UniformLookup.locate) не делится между потоками.
+        """
+        part = copy.copy(self)
+        if self.lookup is not None:
+            part.lookup = copy.copy(self.lookup)
+            part.lookup.last = (None, None)
+        for name in ("a", "d", "c", "p", "q", "lambda_rows", "cp_rows", "T_init"):
+            setattr(part, name, getattr(self, name)[..., lo:hi])
+        if self.cp_tabulated:
+            part.enthalpy_init = self.enthalpy_init[..., lo:hi]
+        return part
+
+    def conductivity(self, T):
+        """Теплопроводность смеси в узлах при поле T (..., Nx)"""
+        lambdas = self.c
+        if self.lambda_linear:
+            lambdas = lambdas + self.d * T
+        if self.lambda_tabulated:
+            lambdas = lambdas + self.a * self.lookup.value(T, self.lambda_rows)
+        return lambdas
+
+    def volumetric_heat_capacity(self, T):
+        """Объемная теплоемкость rho * Cp смеси в узлах при поле T"""
+        if not self.cp_tabulated:
+            return self.q
+        return self.p * self.lookup.value(T, self.cp_rows) + self.q
+
+    def energy_density(self, T):
+        """Приращение энтальпии на единицу объема относительно T_init (Дж/м³)"""
+        energy = self.q * (T - self.T_init)
+        if self.cp_tabulated:
+            energy = energy + self.p * (self.lookup.integral(T, self.cp_rows) - self.enthalpy_init)
+        return energy
+
+    def layer_energy(self, T):
+        """Удельная энергия по слоям (..., n_layers), Дж/м"""
+        return self.energy_density(T) @ self.layer_matrix
+
+    def effective_diffusivity(self, T):
+        """Эффективная температуропроводность среды (последовательные слои), м²/с"""
+        T = np.broadcast_to(T, self.T_init.shape)
+        conductivity = self.T_init.shape[-1] / np.sum(1.0 / np.broadcast_to(self.conductivity(T), T.shape), axis=-1)
+        return conductivity / np.mean(np.broadcast_to(self.volumetric_heat_capacity(T), T.shape), axis=-1)
+
+
+class LayerEnergyRecorder:
+    """Запись удельной энергии по слоям на каждом шаге расчета"""
+
+    def __init__(self, solver, out=None):
+        self.fields = solver.fields
+        self.names = [layer.name for layer in solver.layers]
+        self.initial = self.fields.layer_energy(solver.initial_field())
+        shape = solver.batch_shape + (solver.Nt, len(self.names))
+        self.values = np.empty(shape) if out is None else out
+        self.count = 0
+
+    def record(self, n, T):
+        self.values[..., n, :] = self.fields.layer_energy(T) - self.initial
+        self.count = n + 1
+
+    def series(self):
+        """Ряды (..., Nt, n_layers) записанных шагов"""
+        return self.values[..., :self.count, :]
@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 
 from PyQt5.QtWidgets import QApplication
@@ -12,5 +13,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Рабочие процессы расчета в собранном приложении
+    multiprocessing.freeze_support()
     main()    
 
@@ -1,8 +1,10 @@
-from PyQt5.QtWidgets import QMainWindow, QLineEdit
+from PyQt5.QtWidgets import QMainWindow, QLineEdit, QMenu, QMessageBox
 
 from main_window_ui import Ui_MainWindow
 from notifications import Notifications
 from calculations import Calculations
+from job_client import JobServerError
+from run_workspace import RunWorkspace
 
 class MainWindowLogic(QMainWindow):
 
@@ -12,8 +14,19 @@ class MainWindowLogic(QMainWindow):
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
 
+        # Настройки решателя, подобранные инструментами (например, калибровкой)
+        self.solver_option_overrides = {}
+        self.last_calibration = None
+
         self.notification = Notifications(self)
         self.calculations = Calculations(self)
+        if self.calculations.setup_error is not None:
+            QMessageBox.warning(self, "Ошибка настроек решателя",
+                                f"{self.calculations.setup_error}\n\nИсправьте настройки перед расчетом.")
+        # Прошлые расчеты для сравнения на графиках (сохраняются между запусками)
+        self.run_workspace = RunWorkspace(**self.calculations.options["run_workspace"])
+        # Журнал измерений для наложения на графики (MeasuredLog)
+        self.measured_log = None
 
         self.ui.push_button_window_results.clicked.connect(self.clickedButtonWindowResults)
         self.ui.push_button_window_calculation.clicked.connect(self.clickedButtonWindowCalculations)
@@ -22,8 +35,88 @@ class MainWindowLogic(QMainWindow):
         self.ui.push_button_import_temperature_distribution_csv.clicked.connect(self.clickedPushButtonImportTemperatureDistributionCsv)
         self.ui.push_button_import_energy_data_csv.clicked.connect(self.clickedPushButtonImportEnergyDataCsv)
         self.ui.push_button_import_all_xlsx.clicked.connect(self.clickedPushButtonImportAllXlsx)
+        self.ui.push_button_import_results_npz.clicked.connect(self.clickedPushButtonImportResultsNpz)
+
+        self.setup_tools_menu()
+
+
+    def setup_tools_menu(self):
+        """Меню дополнительных инструментов на странице результатов"""
+        self.tools_menu = QMenu(self)
+        self.tools_menu.addAction("Калибровка по измерениям (.csv)...", self.clickedActionCalibration)
+        self.tools_menu.addAction("Материал субстрата...", self.clickedActionMaterial)
+        self.tools_menu.addAction("Слои реактора (.csv)...", self.clickedActionLayers)
+        self.tools_menu.addAction("График температуры стенки (.csv)...", self.clickedActionWallSchedule)
+        self.tools_menu.addAction("Биологический источник тепла...", self.clickedActionHeatSource)
+        self.tools_menu.addAction("Монте-Карло (неопределенность свойств)...", self.clickedActionMonteCarlo)
+        self.tools_menu.addAction("Проверка сходимости по сетке...", self.clickedActionConvergence)
+        self.tools_menu.addAction("Сравнение расчетов...", self.clickedActionCompareRuns)
+        self.tools_menu.addAction("Отчет по расчетам (PNG/PDF)...", self.clickedActionReport)
+        self.tools_menu.addAction("Журнал измерений SCADA (.csv)...", self.clickedActionMeasuredLog)
+        self.tools_menu.addSeparator()
+        self.tools_menu.addAction("Сохранить проект...", self.clickedActionSaveProject)
+        self.tools_menu.addAction("Открыть проект...", self.clickedActionOpenProject)
+        self.ui.tool_button_tools.setMenu(self.tools_menu)
+
+
+    def clickedActionCalibration(self):
+        self.calculations.calibrate_from_measurements()
 
  
+    def clickedActionMaterial(self):
+        self.calculations.choose_material()
+
+
+    def clickedActionLayers(self):
+        self.calculations.choose_layers()
+
+
+    def clickedActionWallSchedule(self):
+        self.calculations.choose_wall_schedule()
+
+
+    def clickedActionHeatSource(self):
+        self.calculations.choose_heat_source()
+
+
+    def clickedActionMonteCarlo(self):
+        self.calculations.start_monte_carlo()
+
+
+    def clickedActionConvergence(self):
+        self.calculations.start_convergence_study()
+
+
+    def clickedActionCompareRuns(self):
+        self.calculations.choose_compared_runs()
+
+
+    def clickedActionReport(self):
+        self.calculations.start_report()
+
+
+    def clickedActionMeasuredLog(self):
+        self.calculations.choose_measured_log()
+
+
+    def clickedActionSaveProject(self):
+        self.calculations.save_project()
+
+
+    def clickedActionOpenProject(self):
+        project = self.calculations.open_project()
+        if project is None:
+            return
+        # Параметры проекта уже в полях ввода: новый объект расчетов строится по ним
+        previous = self.calculations
+        self.calculations = Calculations(self)
+        self.calculations.take_background_tasks(previous)
+        try:
+            self.calculations.show_project(project)
+        except ValueError as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка настроек решателя проекта: {e}")
+
+
     def clickedPushButtonImportTemperatureDistributionCsv(self):
         self.calculations.export_temperature_data()
 
@@ -34,6 +127,10 @@ class MainWindowLogic(QMainWindow):
     
     def clickedPushButtonImportAllXlsx(self):
         self.calculations.export_all_data()
+
+
+    def clickedPushButtonImportResultsNpz(self):
+        self.calculations.export_history_data()
         
 
     def clickedButtonWindowResults(self):
@@ -57,10 +154,24 @@ class MainWindowLogic(QMainWindow):
 
                     value = line_edit_widget.text()
                     value = float(value)
-
-            self.calculations = Calculations(self)
-            self.calculations.start_calculations()
-            self.notification.start_notification("img/success_modeling.png")
         except ValueError:
             print("error convert to float")
+            self.notification.start_notification("img/error.png")
+            return
+
+        try:
+            # Незавершенный расчет и память результатов предыдущего запуска больше не нужны;
+            # серии расчетов, отчет и разбор журнала продолжаются в новом объекте расчетов
+            previous = self.calculations
+            previous.stop_calculation()
+            self.calculations = Calculations(self)
+            self.calculations.take_background_tasks(previous)
+            if self.calculations.start_calculations():
+                self.notification.start_notification("img/success_modeling.png")
+        except ValueError as e:
+            # Ошибка в настройках решателя или параметрах расчета
+            QMessageBox.critical(self, "Ошибка", f"Ошибка настроек расчета: {e}")
+            self.notification.start_notification("img/error.png")
+        except JobServerError as e:
+            print(e)
             self.notification.start_notification("img/error.png")
\ No newline at end of file
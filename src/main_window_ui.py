@@ -398,6 +398,34 @@ class Ui_MainWindow(object):
 "    }")
         self.push_button_import_all_xlsx.setObjectName("push_button_import_all_xlsx")
         self.horizontalLayout_2.addWidget(self.push_button_import_all_xlsx)
+        self.push_button_import_results_npz = QtWidgets.QPushButton(self.horizontalLayoutWidget)
+        self.push_button_import_results_npz.setEnabled(True)
+        self.push_button_import_results_npz.setMinimumSize(QtCore.QSize(250, 80))
+        font = QtGui.QFont()
+        font.setFamily("Agency FB")
+        font.setPointSize(15)
+        font.setBold(False)
+        font.setWeight(50)
+        self.push_button_import_results_npz.setFont(font)
+        self.push_button_import_results_npz.setStyleSheet("\n"
+"QPushButton {\n"
+"    background-color: #0055ff;\n"
+"    width: 238px;\n"
+"    height: 67px;\n"
+"    border-radius: 10px;\n"
+"    color: #ffffff;\n"
+"}\n"
+"    QPushButton:hover {\n"
+"        background-color: #0049de;\n"
+"        transform: scale(1.05);\n"
+"    }\n"
+"    \n"
+"    QPushButton:pressed {\n"
+"        background-color: #0044cc;\n"
+"        transform: scale(0.95);\n"
+"    }")
+        self.push_button_import_results_npz.setObjectName("push_button_import_results_npz")
+        self.horizontalLayout_2.addWidget(self.push_button_import_results_npz)
         self.gridLayoutWidget = QtWidgets.QWidget(self.results)
         self.gridLayoutWidget.setGeometry(QtCore.QRect(20, 120, 571, 211))
         self.gridLayoutWidget.setObjectName("gridLayoutWidget")
@@ -430,6 +458,53 @@ class Ui_MainWindow(object):
         self.label_accumulated_thermal_energy.setText("")
         self.label_accumulated_thermal_energy.setObjectName("label_accumulated_thermal_energy")
         self.gridLayout.addWidget(self.label_accumulated_thermal_energy, 0, 1, 1, 1)
+        self.label_5 = QtWidgets.QLabel(self.gridLayoutWidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.label_5.setFont(font)
+        self.label_5.setObjectName("label_5")
+        self.gridLayout.addWidget(self.label_5, 2, 0, 1, 1)
+        self.label_equilibrium_time = QtWidgets.QLabel(self.gridLayoutWidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.label_equilibrium_time.setFont(font)
+        self.label_equilibrium_time.setText("")
+        self.label_equilibrium_time.setObjectName("label_equilibrium_time")
+        self.gridLayout.addWidget(self.label_equilibrium_time, 2, 1, 1, 1)
+        self.label_6 = QtWidgets.QLabel(self.gridLayoutWidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.label_6.setFont(font)
+        self.label_6.setObjectName("label_6")
+        self.gridLayout.addWidget(self.label_6, 3, 0, 1, 1)
+        self.label_time_to_target = QtWidgets.QLabel(self.gridLayoutWidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.label_time_to_target.setFont(font)
+        self.label_time_to_target.setText("")
+        self.label_time_to_target.setObjectName("label_time_to_target")
+        self.gridLayout.addWidget(self.label_time_to_target, 3, 1, 1, 1)
+        self.tool_button_tools = QtWidgets.QToolButton(self.results)
+        self.tool_button_tools.setGeometry(QtCore.QRect(20, 340, 250, 50))
+        font = QtGui.QFont()
+        font.setFamily("Agency FB")
+        font.setPointSize(15)
+        self.tool_button_tools.setFont(font)
+        self.tool_button_tools.setStyleSheet("\n"
+"QToolButton {\n"
+"    background-color: #0055ff;\n"
+"    border-radius: 10px;\n"
+"    color: #ffffff;\n"
+"}\n"
+"    QToolButton:hover {\n"
+"        background-color: #0049de;\n"
+"    }\n"
+"    \n"
+"    QToolButton:pressed {\n"
+"        background-color: #0044cc;\n"
+"    }")
+        self.tool_button_tools.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        self.tool_button_tools.setObjectName("tool_button_tools")
         self.graph_temperature_profiles = QtWidgets.QWidget(self.results)
         self.graph_temperature_profiles.setGeometry(QtCore.QRect(610, 400, 581, 400))
         self.graph_temperature_profiles.setStyleSheet("border: 1px solid #000000;\n"
@@ -480,7 +555,14 @@ class Ui_MainWindow(object):
         self.push_button_import_energy_data_csv.setText(_translate("MainWindow", "Загрузить данные\n"
 "по энергии в файл .csv"))
         self.push_button_import_all_xlsx.setText(_translate("MainWindow", "Загрузить все в файл .xlsx"))
+        self.push_button_import_results_npz.setText(_translate("MainWindow", "Сохранить результаты\n"
+"в файл .npz"))
+        self.tool_button_tools.setText(_translate("MainWindow", "Инструменты"))
         self.label_3.setText(_translate("MainWindow", "Расчет аккумулированной\n"
 "тепловой энергии в системе."))
         self.label_4.setText(_translate("MainWindow", "Расчет приближенного КПД системы\n"
 "по отношению к базовому нагреву."))
+        self.label_5.setText(_translate("MainWindow", "Время выхода на\n"
+"тепловое равновесие."))
+        self.label_6.setText(_translate("MainWindow", "Время достижения\n"
+"целевой температуры."))
@@ -0,0 +1,213 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Каталог пользовательских таблиц материалов (CSV), дополняющих встроенную библиотеку
+MATERIALS_DIRECTORY = "materials"
+
+# Физические константы воды
+CP_WATER = 4186.0
+LAMBDA_WATER = 0.6
+
+# Свойства, которые можно задать таблицей: теплопроводность и теплоемкость сухого вещества
+MATERIAL_PROPERTIES = ("lambda", "Cp")
+
+
+class UniformLookup:
+    """Табличные функции f_k(T) на общей равномерной сетке.
+
+    Таблицы с произвольными узлами один раз переносятся на равномерную сетку
+    с шагом step, после чего значение в любой точке находится без поиска:
+    номер ячейки - целая часть (T - T_min) / step, внутри ячейки - линейная
+    интерполяция. За пределами таблиц значения продолжаются константой.
+    Положение поля на сетке вычисляется один раз и используется всеми
+    свойствами и энтальпией. Номер функции k может быть массивом (например,
+    своим для каждого узла сетки).
+    """
+
+    def __init__(self, tables, step=0.1):
+        T_all = np.concatenate([np.asarray(T, dtype=float) for T, _ in tables])
+        self.T_min = float(T_all.min())
+        self.T_max = max(float(T_all.max()), self.T_min + step)
+
+        n = max(2, int(np.ceil((self.T_max - self.T_min) / step)) + 1)
+        grid = np.linspace(self.T_min, self.T_max, n)
+        self.n = n
+        self.step = (self.T_max - self.T_min) / (n - 1)
+        self.inv_step = 1.0 / self.step
+
+        self.values = np.empty((len(tables), n))
+        for k, (T, values) in enumerate(tables):
+            order = np.argsort(T)
+            self.values[k] = np.interp(grid, np.asarray(T, dtype=float)[order], np.asarray(values, dtype=float)[order])
+        self.slopes = np.diff(self.values, axis=-1)
+        # Интегралы от T_min до узлов сетки (для энтальпии при Cp(T))
+        self.integrals = np.zeros((len(tables), n))
+        self.integrals[:, 1:] = np.cumsum((self.values[:, :-1] + self.values[:, 1:]) / 2 * self.step, axis=-1)
+        self.last = (None, None)
+
+    def locate(self, T):
+        """Номер ячейки и доля положения внутри нее (для последнего поля - без пересчета).
+
+        Для NaN и бесконечных температур (например, при неустойчивом шаге)
+        доля - NaN, поэтому и свойства в этих точках получаются NaN.
+        """
+        # Кэш читается одним обращением: поле и его положение всегда из одной пары
+        last_T, located = self.last
+        if last_T is T:
+            return located
+        u = (T - self.T_min) * self.inv_step
+        finite = np.isfinite(u)
+        all_finite = finite.all()
+        if not all_finite:
+            u = np.where(finite, u, 0.0)
+        u = np.clip(u, 0, self.n - 1)
+        index = np.minimum(u.astype(np.intp), self.n - 2)
+        frac = u - index
+        if not all_finite:
+            frac = np.where(finite, frac, np.nan)
+        self.last = (T, (index, frac))
+        return index, frac
+
+    def value(self, T, k=0):
+        index, frac = self.locate(T)
+        return self.values[k, index] + self.slopes[k, index] * frac
+
+    def integral(self, T, k=0):
+        """Интеграл f_k от T_min до T"""
+        index, frac = self.locate(T)
+        inside = self.integrals[k, index] + (self.values[k, index] + 0.5 * self.slopes[k, index] * frac) * frac * self.step
+        outside = (np.minimum(T - self.T_min, 0) * self.values[k, 0]
+                   + np.maximum(T - self.T_max, 0) * self.values[k, -1])
+        return inside + outside
+
+
+class Material:
+    """Субстрат с табличными свойствами сухого вещества.
+
+    tables - словарь "lambda" / "Cp" -> (температуры, °C; значения). Свойство
+    без таблицы рассчитывается по параметрам модели, как раньше.
+    """
+
+    def __init__(self, name, tables, description=""):
+        unknown = set(tables) - set(MATERIAL_PROPERTIES)
+        if unknown or not tables:
+            raise ValueError(f"Материал '{name}': ожидаются таблицы {', '.join(MATERIAL_PROPERTIES)}")
+        self.name = name
+        self.tables = {key: (np.asarray(T, dtype=float), np.asarray(values, dtype=float))
+                       for key, (T, values) in tables.items()}
+        self.description = description
+
+    def lookup(self, step=0.1):
+        """Быстрые табличные функции всех свойств на общей сетке.
+
+        Возвращает таблицу и номера ее столбцов по свойствам ("lambda", "Cp").
+        """
+        props = [prop for prop in MATERIAL_PROPERTIES if prop in self.tables]
+        lookup = UniformLookup([self.tables[prop] for prop in props], step)
+        return lookup, {prop: k for k, prop in enumerate(props)}
+
+    def to_spec(self):
+        """Описание материала с таблицами (для передачи без файла, см. resolve_material)"""
+        return {"name": self.name, "description": self.description,
+                "tables": {key: [T.tolist(), values.tolist()] for key, (T, values) in self.tables.items()}}
+
+    def temperature_range(self):
+        T = np.concatenate([T for T, _ in self.tables.values()])
+        return float(T.min()), float(T.max())
+
+
+def load_material_csv(filename, name=None):
+    """Загрузка таблицы свойств из CSV.
+
+    Первый столбец - температура, °C; столбцы с заголовками, содержащими
+    "lambda" (или "λ") и "Cp", - теплопроводность, Вт/(м·K), и удельная
+    теплоемкость, Дж/(кг·K), сухого вещества. Разделитель ";", десятичная запятая.
+    Пропуски допускаются: каждая таблица строится по своим заполненным строкам.
+    """
+    df = pd.read_csv(filename, sep=';', decimal=',', encoding='utf-8-sig')
+    T = df.iloc[:, 0].to_numpy(dtype=float)
+
+    tables = {}
+    for column in df.columns[1:]:
+        header = str(column).lower()
+        key = "lambda" if ("lambda" in header or "λ" in header) else "Cp" if "cp" in header else None
+        if key is None:
+            continue
+        values = df[column].to_numpy(dtype=float)
+        filled = np.isfinite(T) & np.isfinite(values)
+        if not filled.any():
+            continue
+        if np.any(values[filled] <= 0):
+            raise ValueError(f"Столбец '{column}': свойства должны быть положительными")
+        tables[key] = (T[filled], values[filled])
+
+    if not tables:
+        raise ValueError("В файле нет столбцов lambda или Cp")
+    if name is None:
+        name = os.path.splitext(os.path.basename(filename))[0]
+    return Material(name, tables, description=filename)
+
+
+# Встроенная библиотека субстратов: ориентировочные свойства сухого вещества
+# при 10-70 °C. Для точных расчетов используйте лабораторные таблицы (CSV).
+SUBSTRATE_LIBRARY = {
+    material.name: material for material in (
+        Material("Навоз КРС", {
+            "lambda": ([10, 40, 70], [0.15, 0.16, 0.17]),
+            "Cp": ([10, 40, 70], [1600, 1700, 1800]),
+        }, "Навоз крупного рогатого скота"),
+        Material("Свиной навоз", {
+            "lambda": ([10, 40, 70], [0.16, 0.17, 0.18]),
+            "Cp": ([10, 40, 70], [1700, 1800, 1900]),
+        }),
+        Material("Птичий помет", {
+            "lambda": ([10, 40, 70], [0.12, 0.13, 0.14]),
+            "Cp": ([10, 40, 70], [1400, 1500, 1600]),
+        }),
+        Material("Кукурузный силос", {
+            "lambda": ([10, 40, 70], [0.10, 0.11, 0.12]),
+            "Cp": ([10, 40, 70], [1500, 1620, 1750]),
+        }),
+        Material("Осадок сточных вод", {
+            "lambda": ([10, 40, 70], [0.20, 0.215, 0.23]),
+            "Cp": ([10, 40, 70], [1800, 1900, 2000]),
+        }),
+        Material("Пищевые отходы", {
+            "lambda": ([10, 40, 70], [0.18, 0.195, 0.21]),
+            "Cp": ([10, 40, 70], [2000, 2150, 2300]),
+        }),
+    )
+}
+
+
+def load_substrate_library(directory=MATERIALS_DIRECTORY):
+    """Встроенные субстраты и таблицы из каталога directory (имя - имя файла)"""
+    library = dict(SUBSTRATE_LIBRARY)
+    if not os.path.isdir(directory):
+        return library
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(".csv"):
+            continue
+        try:
+            material = load_material_csv(os.path.join(directory, filename))
+        except (OSError, ValueError) as e:
+            print(f"Таблица материала {filename} пропущена: {e}")
+            continue
+        library[material.name] = material
+    return library
+
+
+def resolve_material(spec):
+    """Материал по имени из библиотеки, по пути к CSV-файлу или по описанию с таблицами (Material.to_spec)"""
+    if isinstance(spec, Material):
+        return spec
+    if isinstance(spec, dict):
+        return Material(spec["name"], spec["tables"], spec.get("description", ""))
+    library = load_substrate_library()
+    if spec in library:
+        return library[spec]
+    if os.path.isfile(spec):
+        return load_material_csv(spec)
+    raise ValueError(f"Материал '{spec}' не найден в библиотеке")
@@ -0,0 +1,224 @@
+import os
+import re
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from project_file import load_arrays, save_arrays
+
+# Сигнатура и версия файла кэша журнала
+MEASURED_LOG_MAGIC = b"BGLOG001"
+MEASURED_LOG_VERSION = 2
+
+# Обозначения отсутствующих значений в выгрузках SCADA
+MEASURED_NA_VALUES = ("-", "--", "---", "н/д")
+
+
+class MeasuredLog:
+    """Журнал измерений: T[k, j] - температура датчика j в момент t[k].
+
+    t - время от первого момента журнала (среднего момента первого интервала
+    усреднения), с; start - этот момент (строка ISO, если в журнале даты) или
+    None; x - координаты датчиков, м (NaN, если координата не указана в
+    заголовке), rows - число записей в исходном журнале. offset - момент
+    журнала, соответствующий началу расчета, с.
+    """
+
+    def __init__(self, t, T, names, x, start=None, rows=None):
+        self.t = t
+        self.T = T
+        self.names = list(names)
+        self.x = np.asarray(x, dtype=float)
+        self.start = start
+        self.rows = rows
+        self.offset = 0.0
+
+    @property
+    def duration(self):
+        return float(self.t[-1] - self.t[0])
+
+    @property
+    def located(self):
+        """Датчики с известной координатой (для графика профилей)"""
+        return np.isfinite(self.x)
+
+    def resample(self, times):
+        """Значения датчиков в моменты расчета times (с): линейная интерполяция, вне журнала - NaN"""
+        t_log = np.asarray(times, dtype=float) + self.offset
+        index = np.clip(np.searchsorted(self.t, t_log), 1, len(self.t) - 1)
+        t_left, t_right = self.t[index - 1], self.t[index]
+        weight = ((t_log - t_left) / (t_right - t_left))[:, np.newaxis]
+        values = self.T[index - 1] * (1 - weight) + self.T[index] * weight
+        values[(t_log < self.t[0]) | (t_log > self.t[-1])] = np.nan
+        return values
+
+
+class TimeBins:
+    """Накопление средних по интервалам времени при чтении журнала частями.
+
+    Интервалов не больше max_bins: если журнал не помещается, соседние
+    интервалы попарно объединяются (ширина удваивается). Поэтому память не
+    зависит от длины журнала, а журнал с шагом не меньше width хранится без
+    прореживания.
+    """
+
+    def __init__(self, width, max_bins, columns):
+        self.width = float(width)
+        self.max_bins = max_bins
+        self.t0 = None
+        self.rows = np.zeros(0)
+        self.t_sum = np.zeros(0)
+        self.sums = np.zeros((0, columns))
+        self.counts = np.zeros((0, columns))
+
+    def coarsen(self):
+        if len(self.rows) % 2:
+            self.resize(len(self.rows) + 1)
+        self.rows = self.rows.reshape(-1, 2).sum(axis=1)
+        self.t_sum = self.t_sum.reshape(-1, 2).sum(axis=1)
+        self.sums = self.sums.reshape(-1, 2, self.sums.shape[1]).sum(axis=1)
+        self.counts = self.counts.reshape(-1, 2, self.counts.shape[1]).sum(axis=1)
+        self.width *= 2
+
+    def resize(self, size, front=0):
+        """Увеличение числа интервалов до size (front новых интервалов - в начале)"""
+        back = size - len(self.rows) - front
+        self.rows = np.pad(self.rows, (front, back))
+        self.t_sum = np.pad(self.t_sum, (front, back))
+        self.sums = np.pad(self.sums, ((front, back), (0, 0)))
+        self.counts = np.pad(self.counts, ((front, back), (0, 0)))
+
+    def add(self, t, values):
+        """Учет записей: t - моменты, с; values (записи, датчики)"""
+        if len(t) == 0:
+            return
+        if self.t0 is None:
+            self.t0 = float(np.min(t))
+        # Записи раньше первой (журнал не упорядочен по времени) - новые интервалы в начале
+        if np.min(t) < self.t0:
+            front = int(np.ceil((self.t0 - np.min(t)) / self.width))
+            self.resize(len(self.rows) + front, front)
+            self.t0 -= front * self.width
+        index = np.floor((t - self.t0) / self.width).astype(np.int64)
+        while max(int(index.max()) + 1, len(self.rows)) > self.max_bins:
+            self.coarsen()
+            index //= 2
+        size = max(int(index.max()) + 1, len(self.rows))
+        if size > len(self.rows):
+            self.resize(size)
+
+        self.rows += np.bincount(index, minlength=size)
+        self.t_sum += np.bincount(index, weights=t, minlength=size)
+        finite = np.isfinite(values)
+        for j in range(values.shape[1]):
+            self.sums[:, j] += np.bincount(index, weights=np.where(finite[:, j], values[:, j], 0.0), minlength=size)
+            self.counts[:, j] += np.bincount(index, weights=finite[:, j], minlength=size)
+
+    def result(self):
+        """Средние моменты и значения непустых интервалов"""
+        filled = self.rows > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = self.t_sum[filled] / self.rows[filled]
+            values = np.where(self.counts[filled] > 0, self.sums[filled] / self.counts[filled], np.nan)
+        return t, values
+
+
+def sensor_position(name):
+    """Координата датчика из заголовка вида "T3 x=0,50 м" (None, если не указана)"""
+    match = re.search(r"x\s*=\s*([-+]?\d+(?:[.,]\d+)?)", str(name))
+    return float(match.group(1).replace(',', '.')) if match else None
+
+
+def read_measured_log(filename, chunk_rows=200000, bin_seconds=60.0, max_points=100000):
+    """Разбор журнала SCADA (разделитель ";", десятичная запятая) по частям из chunk_rows строк.
+
+    Первый столбец - дата и время записи или время от начала, с; остальные -
+    температуры датчиков, °C. Записи усредняются по интервалам bin_seconds;
+    если интервалов больше max_points, интервалы укрупняются (см. TimeBins).
+    """
+    first = pd.read_csv(filename, sep=';', encoding='utf-8-sig', nrows=1, dtype=str)
+    if first.shape[1] < 2 or len(first) == 0:
+        raise ValueError("Ожидаются столбец времени и столбцы температур датчиков")
+    time_column, sensors = first.columns[0], list(first.columns[1:])
+    try:
+        float(str(first.iloc[0, 0]).replace(',', '.'))
+        numeric_time = True
+    except ValueError:
+        numeric_time = False
+
+    dtype = {name: np.float32 for name in sensors}
+    dtype[time_column] = np.float64 if numeric_time else str
+    bins = TimeBins(bin_seconds, max_points, len(sensors))
+    rows = 0
+    reader = pd.read_csv(filename, sep=';', decimal=',', encoding='utf-8-sig', dtype=dtype, chunksize=chunk_rows,
+                         na_values=list(MEASURED_NA_VALUES))
+    with reader:
+        for chunk in reader:
+            if numeric_time:
+                t = chunk[time_column].to_numpy(dtype=float)
+            else:
+                stamps = pd.to_datetime(chunk[time_column], dayfirst=True, errors='coerce')
+                t = np.where(stamps.isna(), np.nan,
+                             stamps.to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9)
+            valid = np.isfinite(t)
+            bins.add(t[valid], chunk[sensors].to_numpy(dtype=np.float32)[valid])
+            rows += len(chunk)
+
+    t, T = bins.result()
+    if len(t) < 2:
+        raise ValueError("В журнале меньше двух записей с корректным временем")
+    # Отсчет - от первого момента журнала (а не от первой записи), чтобы начало расчета не попадало
+    # в первую половину интервала усреднения, где интерполяция не определена
+    start = None if numeric_time else pd.Timestamp(t[0], unit='s').isoformat()
+    x = [sensor_position(name) for name in sensors]
+    return MeasuredLog(t - t[0], T.astype(np.float32), sensors,
+                       [np.nan if position is None else position for position in x], start, rows)
+
+
+def cache_filename(filename, cache_dir=None):
+    """Файл кэша журнала: рядом с журналом или в cache_dir"""
+    if cache_dir is None:
+        return filename + ".bglog"
+    checksum = zlib.crc32(os.path.abspath(filename).encode('utf-8'))
+    return os.path.join(cache_dir, f"{os.path.basename(filename)}.{checksum:08x}.bglog")
+
+
+def load_measured_log(filename, chunk_rows=200000, bin_seconds=60.0, max_points=100000, cache_dir=None,
+                      cached_only=False):
+    """Журнал измерений с кэшем в двоичном файле (формат файлов проектов).
+
+    Кэш действителен, пока не изменились журнал (размер и время изменения)
+    и параметры усреднения. cached_only - только чтение кэша (None, если
+    кэша нет), без разбора журнала.
+    """
+    stat = os.stat(filename)
+    key = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "bin_seconds": bin_seconds, "max_points": max_points}
+    cache = cache_filename(filename, cache_dir)
+    try:
+        header, arrays = load_arrays(cache, MEASURED_LOG_MAGIC, "кэша журнала")
+        if header["version"] == MEASURED_LOG_VERSION and header["key"] == key:
+            return MeasuredLog(arrays["t"], arrays["T"], header["names"], arrays["x"], header["start"],
+                               header["rows"])
+    except (OSError, ValueError, KeyError):
+        pass
+    # Устаревший кэш отображен в память; отображение освобождается до перезаписи файла (Windows)
+    arrays = None
+    if cached_only:
+        return None
+
+    start = time.perf_counter()
+    log = read_measured_log(filename, chunk_rows, bin_seconds, max_points)
+    print(f"Журнал {filename}: {log.rows} записей, {len(log.names)} датчиков разобраны "
+          f"за {time.perf_counter() - start:.1f} с")
+    try:
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        save_arrays(cache, MEASURED_LOG_MAGIC,
+                    {"version": MEASURED_LOG_VERSION, "key": key, "names": log.names, "start": log.start,
+                     "rows": log.rows},
+                    {"t": log.t, "T": log.T, "x": log.x})
+    except OSError as e:
+        print(f"Не удалось сохранить кэш журнала: {e}")
+    return log
@@ -0,0 +1,307 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from solver import BATCH_PARAMETERS, DEFAULT_PARAMETERS, HeatSolver
+
+# Допустимые диапазоны параметров (выборки за их пределами прижимаются к границам)
+PARAMETER_BOUNDS = {
+    "H": (0.0, 100.0),
+    "rho": (1e-6, np.inf),
+    "Cp_dry": (1e-6, np.inf),
+    "lambda_dry": (1e-6, np.inf),
+}
+
+# Распределения по умолчанию: влажность - абсолютное отклонение, %; остальное - относительное
+DEFAULT_DISTRIBUTIONS = {
+    "H": {"dist": "normal", "std": 5.0},
+    "lambda_dry": {"dist": "normal", "rel_std": 0.15},
+    "Cp_dry": {"dist": "normal", "rel_std": 0.10},
+    "rho": {"dist": "normal", "rel_std": 0.05},
+}
+
+# Квантили для полос неопределенности
+QUANTILES = (0.1, 0.5, 0.9)
+
+
+def sample_parameter(rng, spec, base, size):
+    """Выборка параметра из распределения spec (base - значение из полей ввода).
+
+    "normal"     - mean (по умолчанию base), std или rel_std (доля от mean);
+    "uniform"    - low и high или rel_width (полуширина в долях base);
+    "lognormal"  - median (по умолчанию base), sigma логарифма;
+    "triangular" - low, mode (по умолчанию base), high.
+    """
+    dist = spec.get("dist", "normal")
+    if dist == "normal":
+        mean = spec.get("mean", base)
+        return rng.normal(mean, spec.get("std", abs(mean) * spec.get("rel_std", 0.1)), size)
+    if dist == "uniform":
+        width = abs(base) * spec.get("rel_width", 0.1)
+        return rng.uniform(spec.get("low", base - width), spec.get("high", base + width), size)
+    if dist == "lognormal":
+        return spec.get("median", base) * np.exp(rng.normal(0.0, spec["sigma"], size))
+    if dist == "triangular":
+        return rng.triangular(spec["low"], spec.get("mode", base), spec["high"], size)
+    raise ValueError(f"Неизвестное распределение '{dist}'")
+
+
+def sample_parameters(params, distributions, rng, size):
+    """Выборки всех неопределенных параметров: имя -> массив длины size"""
+    samples = {}
+    for name, spec in distributions.items():
+        if name not in BATCH_PARAMETERS:
+            raise ValueError(f"Параметр {name} не может быть случайным")
+        base = params.get(name, DEFAULT_PARAMETERS.get(name))
+        low, high = PARAMETER_BOUNDS.get(name, (-np.inf, np.inf))
+        samples[name] = np.clip(sample_parameter(rng, spec, base, size), low, high)
+    return samples
+
+
+class RunningMoments:
+    """Среднее и дисперсия по реализациям, накапливаемые пакетами (Welford/Chan).
+
+    Пакеты и частичные суммы объединяются без хранения реализаций.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        """Добавление пакета реализаций values (B, ...)"""
+        other = RunningMoments()
+        other.count = len(values)
+        other.mean = values.mean(axis=0)
+        other.m2 = ((values - other.mean)**2).sum(axis=0)
+        self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.m2 = self.m2 + other.m2 + delta**2 * (self.count * other.count / count)
+        self.count = count
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / max(self.count - 1, 1))
+
+
+class QuantileSketch:
+    """Объединяемый эскиз квантилей (компакторы KLL) для массивов величин.
+
+    Уровень h хранит не более k значений с весом 2**h. Переполненный
+    уровень сортируется, и каждое второе значение (со случайным сдвигом)
+    переходит на следующий уровень. Каждый элемент массива величин получает
+    одинаковое число значений, поэтому уровни хранятся как массивы
+    (m, ...) и сжимаются для всех элементов сразу. Память - O(k log(N/k))
+    на элемент, ошибка ранга - порядка 1/k.
+    """
+
+    def __init__(self, k=256, seed=None):
+        self.k = k
+        self.levels = []
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Добавление пакета реализаций values (B, ...)"""
+        self.add(0, np.asarray(values, dtype=float))
+
+    def merge(self, other):
+        for h, level in enumerate(other.levels):
+            self.add(h, level)
+
+    def add(self, h, values):
+        while True:
+            if h == len(self.levels):
+                self.levels.append(values)
+            else:
+                self.levels[h] = np.concatenate((self.levels[h], values))
+            level = self.levels[h]
+            if len(level) <= self.k:
+                return
+            level = np.sort(level, axis=0)
+            paired = len(level) // 2 * 2
+            self.levels[h] = level[paired:]
+            values = level[self.rng.integers(2):paired:2]
+            h += 1
+
+    def quantiles(self, qs):
+        """Квантили qs: массив (len(qs), ...)"""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0**h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, axis=0)
+        items = np.take_along_axis(items, order, axis=0)
+        cumulative = np.cumsum(weights[order], axis=0)
+        # Значение, на котором накопленный вес достигает доли q (с поправкой на середину веса)
+        targets = np.asarray(qs, dtype=float).reshape((-1,) + (1,) * items.ndim) * cumulative[-1]
+        index = np.argmax(cumulative[np.newaxis] - 0.5 * weights[order][np.newaxis] >= targets, axis=1)
+        return np.take_along_axis(items, np.minimum(index, len(items) - 1), axis=0)
+
+
+class MonteCarloAccumulator:
+    """Накопленные статистики расчетов Монте-Карло.
+
+    Энергия и температуры в точках контроля - среднее, дисперсия и эскизы
+    квантилей на сетке моментов t; времена достижения целевых температур и
+    выборки параметров (по одному числу на реализацию) хранятся целиком.
+    """
+
+    def __init__(self, t, probe_x, event_labels, sketch_size=256, seed=None):
+        self.t = t
+        self.probe_x = probe_x
+        self.event_labels = event_labels
+        self.energy = RunningMoments()
+        self.energy_sketch = QuantileSketch(sketch_size, seed)
+        self.probes = RunningMoments()
+        self.probe_sketch = QuantileSketch(sketch_size, seed)
+        self.event_times = []
+        self.samples = {}
+
+    @property
+    def count(self):
+        return self.energy.count
+
+    def update(self, energy, probe_values, event_times, samples):
+        self.energy.update(energy)
+        self.energy_sketch.update(energy)
+        self.probes.update(probe_values)
+        self.probe_sketch.update(probe_values)
+        self.event_times.append(event_times)
+        for name, values in samples.items():
+            self.samples.setdefault(name, []).append(values)
+
+    def merge(self, other):
+        self.energy.merge(other.energy)
+        self.energy_sketch.merge(other.energy_sketch)
+        self.probes.merge(other.probes)
+        self.probe_sketch.merge(other.probe_sketch)
+        self.event_times.extend(other.event_times)
+        for name, values in other.samples.items():
+            self.samples.setdefault(name, []).extend(values)
+
+    def result(self, quantiles=QUANTILES):
+        return MonteCarloResult(self, quantiles)
+
+
+class MonteCarloResult:
+    """Итоги расчетов Монте-Карло: средние, разброс и квантили"""
+
+    def __init__(self, accumulator, quantiles=QUANTILES):
+        self.count = accumulator.count
+        self.t = accumulator.t
+        self.quantile_levels = tuple(quantiles)
+        self.energy_mean = accumulator.energy.mean
+        self.energy_std = accumulator.energy.std
+        self.energy_quantiles = accumulator.energy_sketch.quantiles(quantiles)
+        self.probe_x = accumulator.probe_x
+        self.probe_mean = accumulator.probes.mean
+        self.probe_std = accumulator.probes.std
+        self.probe_quantiles = accumulator.probe_sketch.quantiles(quantiles)
+
+        self.event_labels = accumulator.event_labels
+        self.event_times = np.concatenate(accumulator.event_times)
+        # Недостигнутая цель считается достигнутой позже любого срока
+        self.event_reached = np.mean(~np.isnan(self.event_times), axis=0)
+        self.event_quantiles = np.quantile(np.where(np.isnan(self.event_times), np.inf, self.event_times),
+                                           quantiles, axis=0, method='inverted_cdf')
+        self.samples = {name: np.concatenate(values) for name, values in accumulator.samples.items()}
+
+    def band(self, q):
+        """Ряд энергии для квантиля q из числа рассчитанных"""
+        return self.energy_quantiles[self.quantile_levels.index(q)]
+
+
+def monte_carlo_options(options):
+    """Настройки решателя для серии расчетов: без досрочной остановки и истории поля"""
+    options = dict(options)
+    options.update(steady_state_tol=None, steady_state_energy_rtol=None, stop_at_events=False,
+                   job_server_url=None, run_in_worker_process=False)
+    return options
+
+
+def time_points(Nt, max_points):
+    """Номера шагов, в которых накапливается статистика (включая последний)"""
+    return np.unique(np.linspace(0, Nt - 1, min(Nt, max_points)).round().astype(np.intp))
+
+
+def run_batch(params, options, distributions, seed, size, steps, sketch_size):
+    """Пакетный расчет size реализаций (в рабочем процессе), возвращает их статистики"""
+    rng = np.random.default_rng(seed)
+    samples = sample_parameters(params, distributions, rng, size)
+    solver = HeatSolver(dict(params, **samples), options)
+    result = solver.run(store_history=False)
+
+    event_times = np.stack([times for _, _, times in result.events], axis=-1) if result.events \
+        else np.empty((size, 0))
+    # Моменты - как у рядов энергии на графиках и в экспорте (номер шага * dt)
+    accumulator = MonteCarloAccumulator(steps * solver.dt, result.probe_x,
+                                        [f"{target:.1f} °C ({label})" for label, target, _ in result.events],
+                                        sketch_size, seed)
+    accumulator.update(result.energy[:, steps], result.probe_values[:, steps, :], event_times, samples)
+    return accumulator
+
+
+class MonteCarlo:
+    """Серия расчетов с выборками неопределенных параметров.
+
+    Реализации рассчитываются пакетами по batch_size вариантов за один
+    проход решателя, пакеты распределяются по процессам. Статистики каждого
+    пакета объединяются по мере готовности; история поля и ряды отдельных
+    реализаций не сохраняются. Выборки воспроизводимы при заданном seed
+    независимо от числа процессов и порядка завершения пакетов.
+    """
+
+    def __init__(self, params, options, samples=1000, batch_size=50, distributions=None, seed=None,
+                 time_points_max=500, sketch_size=256):
+        self.params = dict(params)
+        self.options = monte_carlo_options(options)
+        self.distributions = dict(DEFAULT_DISTRIBUTIONS if distributions is None else distributions)
+        if samples < 2:
+            raise ValueError("Для оценки разброса нужно не менее 2 реализаций")
+        sizes = [batch_size] * (samples // batch_size)
+        if samples % batch_size:
+            sizes.append(samples % batch_size)
+        self.batches = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+        # Сетка моментов для статистик (проверка параметров и распределений - до отправки в процессы)
+        sample_parameters(self.params, self.distributions, np.random.default_rng(0), 2)
+        solver = HeatSolver(self.params, self.options)
+        self.steps = time_points(solver.Nt, time_points_max)
+        self.sketch_size = sketch_size
+        self.accumulator = None
+        self.done = 0
+
+    def submit(self, executor):
+        """Постановка всех пакетов в executor, возвращает список Future"""
+        return [executor.submit(run_batch, self.params, self.options, self.distributions, seed, size,
+                                self.steps, self.sketch_size)
+                for seed, size in self.batches]
+
+    def accumulate(self, batch):
+        """Учет статистик завершенного пакета"""
+        if self.accumulator is None:
+            self.accumulator = batch
+        else:
+            self.accumulator.merge(batch)
+        self.done += 1
+
+    @property
+    def progress(self):
+        return self.done / len(self.batches)
+
+    def run(self, workers=None, progress=None):
+        """Расчет всех пакетов в пуле процессов; progress(доля) - после каждого пакета"""
+        with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+            for future in as_completed(self.submit(executor)):
+                self.accumulate(future.result())
+                if progress is not None:
+                    progress(self.progress)
+        return self.result()
+
+    def result(self):
+        return self.accumulator.result()
@@ -0,0 +1,240 @@
+import argparse
+import threading
+import time
+
+import numpy as np
+
+
+class StencilChunk:
+    """Часть области - узлы lo..hi-1 - для расчета шага в отдельном потоке.
+
+    Поток читает старое поле на своих узлах и на соседних (по одному
+    "теневому" узлу с каждой стороны), пишет новое поле только в свои узлы
+    и считает частичные суммы энергии и мощности источника. Выражения те
+    же, что в HeatSolver.step, поэтому поле совпадает с последовательным
+    расчетом до бита; суммы отличаются только порядком сложения.
+    """
+
+    def __init__(self, solver, lo, hi):
+        self.solver = solver
+        self.lo, self.hi = lo, hi
+        # Узлы с соседями ("теневые" узлы на стыках частей)
+        self.a, self.b = max(lo - 1, 0), min(hi + 1, solver.Nx)
+        # Внутренние узлы части (узлы стенок обновляются по граничным условиям)
+        self.i0, self.i1 = max(lo, 1), min(hi, solver.Nx - 1)
+        self.first = lo == 0
+        self.last = hi == solver.Nx
+
+        self.fields = solver.fields.chunk(self.a, self.b) if solver.fields is not None else None
+        self.own_fields = solver.fields.chunk(lo, hi) if solver.fields is not None else None
+        self.cell_widths = solver.cell_widths[lo:hi]
+        self.source = solver.heat_source.part(solver.source_widths[lo:hi]) if solver.heat_source is not None else None
+        self.source_power = 0.0
+
+        # Результаты шага для сведения в основном потоке
+        self.energy = 0.0
+        self.dT_max = 0.0
+        self.lambda_first = self.lambda_last = None
+
+    def own(self, values):
+        """Значения свойства в своих узлах (постоянные по узлам свойства не режутся)"""
+        if values.shape[-1] == 1:
+            return values
+        return values[..., self.lo - self.a:self.hi - self.a]
+
+    def step(self, T, T_new, n):
+        solver = self.solver
+        lo, hi, a, b, i0, i1 = self.lo, self.hi, self.a, self.b, self.i0, self.i1
+        T_ext = T[..., a:b]
+        if self.fields is None:
+            lambdas = solver.conductivity(T_ext)
+            rho_cp = solver.volumetric_heat_capacity(T_ext)
+        else:
+            lambdas = self.fields.conductivity(T_ext)
+            rho_cp = self.fields.volumetric_heat_capacity(T_ext)
+        T_new[..., lo:hi] = T[..., lo:hi]
+
+        if solver.layers is None:
+            alpha = lambdas / rho_cp
+            T_new[..., i0:i1] = T[..., i0:i1] + alpha[..., i0 - a:i1 - a] * solver.dt / solver.dx**2 * (
+                T[..., i0 + 1:i1 + 1] - 2*T[..., i0:i1] + T[..., i0 - 1:i1 - 1])
+        else:
+            # Грани между узлами части и теневыми узлами: грань j - между узлами j и j + 1
+            lambdas = 2 * lambdas[..., 1:] * lambdas[..., :-1] / (lambdas[..., 1:] + lambdas[..., :-1])
+            flux = lambdas * (T_ext[..., 1:] - T_ext[..., :-1])
+            T_new[..., i0:i1] = T[..., i0:i1] + solver.dt / solver.dx**2 * (
+                flux[..., i0 - a:i1 - a] - flux[..., i0 - 1 - a:i1 - 1 - a]) / rho_cp[..., i0 - a:i1 - a]
+
+        # Биологический источник тепла (мощность своих узлов и ее сумма по части)
+        if self.source is not None:
+            q_source, self.source_power = self.source.rate(T[..., lo:hi], n)
+            T_new[..., lo:hi] += q_source * (solver.dt * solver.heat_source.loading_values[n] / self.own(rho_cp))
+
+        # Узлы стенок (у крайних частей): теплопроводность - в узле или на крайней грани
+        left, right = solver.boundaries
+        if self.first:
+            self.lambda_first = lambdas[..., 0]
+            T_new[..., 0] = solver.wall_temperature(left, n, T_new[..., 0], T[..., 0], T[..., 1],
+                                                    lambdas[..., 0], rho_cp[..., 0])
+        if self.last:
+            self.lambda_last = lambdas[..., -1]
+            T_new[..., -1] = solver.wall_temperature(right, n, T_new[..., -1], T[..., -1], T[..., -2],
+                                                     lambdas[..., -1], rho_cp[..., -1])
+
+        # Частичные суммы энергии поля и максимум изменения температуры
+        T_own = T_new[..., lo:hi]
+        if self.own_fields is None:
+            self.energy = np.sum(solver.column(solver.rho_Cp) * (T_own - solver.column(solver.T_init))
+                                 * self.cell_widths, axis=-1)
+        else:
+            self.energy = np.sum(self.own_fields.energy_density(T_own) * self.cell_widths, axis=-1)
+        if solver.options["steady_state_tol"] is not None:
+            self.dT_max = np.max(np.abs(T_own - T[..., lo:hi]))
+
+
+class ParallelStencil:
+    """Шаги явной схемы, распределенные по потокам.
+
+    Область делится на threads непрерывных частей; каждая рассчитывается
+    своим потоком (вычисления NumPy отпускают GIL). Основной поток
+    рассчитывает первую часть сам. За шаг потоки дважды встречаются у
+    барьера: перед шагом (поле предыдущего шага готово) и после него
+    (новое поле и частичные суммы готовы). Новое поле пишется попеременно
+    в два заранее выделенных массива, поэтому поле предыдущего шага
+    остается доступным до конца следующего шага.
+    """
+
+    def __init__(self, solver, threads):
+        self.solver = solver
+        # В каждой части - не меньше двух узлов
+        threads = max(1, min(threads, solver.Nx // 2))
+        bounds = np.linspace(0, solver.Nx, threads + 1).round().astype(int)
+        self.chunks = [StencilChunk(solver, lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        shape = solver.batch_shape + (solver.Nx,)
+        self.buffers = (np.empty(shape), np.empty(shape))
+
+        self.start = threading.Barrier(threads)
+        self.done = threading.Barrier(threads)
+        self.T = self.T_new = None
+        self.n = 0
+        self.error = None
+        self.closed = False
+        self.workers = [threading.Thread(target=self.work, args=(chunk,), daemon=True) for chunk in self.chunks[1:]]
+        for worker in self.workers:
+            worker.start()
+
+    @property
+    def threads(self):
+        return len(self.chunks)
+
+    def work(self, chunk):
+        try:
+            while True:
+                self.start.wait()
+                if self.closed:
+                    return
+                chunk.step(self.T, self.T_new, self.n)
+                self.done.wait()
+        except threading.BrokenBarrierError:
+            return
+        except Exception as e:
+            self.fail(e)
+
+    def fail(self, error):
+        """Остановка всех потоков при ошибке в одном из них"""
+        if self.error is None:
+            self.error = error
+        self.start.abort()
+        self.done.abort()
+
+    def step(self, T, n):
+        """Шаг n; возвращает поле, теплопроводности на стенках, мощность источника и энергию поля"""
+        self.T = T
+        self.T_new = self.buffers[1] if T is self.buffers[0] else self.buffers[0]
+        self.n = n
+        try:
+            self.start.wait()
+            self.chunks[0].step(self.T, self.T_new, n)
+            self.done.wait()
+        except threading.BrokenBarrierError:
+            raise self.error
+        except Exception as e:
+            self.fail(e)
+            raise
+
+        # Суммы частей в постоянном порядке (результат не зависит от порядка завершения потоков)
+        energy = sum(chunk.energy for chunk in self.chunks)
+        lambdas = np.stack((self.chunks[0].lambda_first, self.chunks[-1].lambda_last), axis=-1)
+        source_power = 0.0
+        if self.solver.heat_source is not None:
+            source_power = self.solver.heat_source.loading_values[n] * sum(chunk.source_power for chunk in self.chunks)
+        return self.T_new, lambdas, source_power, energy
+
+    @property
+    def dT_max(self):
+        """Максимальное изменение температуры за последний шаг"""
+        return max(chunk.dT_max for chunk in self.chunks)
+
+    def close(self):
+        """Завершение потоков"""
+        if not self.start.broken:
+            self.closed = True
+            try:
+                self.start.wait()
+            except threading.BrokenBarrierError:
+                pass
+        for worker in self.workers:
+            worker.join()
+
+
+def benchmark(Nx, steps, thread_counts, repeats=3):
+    """Сильная масштабируемость: время шага при разном числе потоков для одной сетки.
+
+    Возвращает список (потоки, время шага в с, ускорение относительно
+    последовательного расчета, макс. отличие поля от последовательного).
+    """
+    from solver import HeatSolver
+    from solver_options import DEFAULT_SOLVER_OPTIONS
+
+    params = {"T_wall": 40.0, "L": 1.0, "T_init": 20.0, "rho": 1000.0, "H": 50.0, "Cp_dry": 2500.0,
+              "lambda_dry": 0.3, "dx": 1.0 / (Nx - 1)}
+    solver = HeatSolver(dict(params, dt=1e-12, t_max=1e-12), DEFAULT_SOLVER_OPTIONS)
+    # Шаг на пределе устойчивости, чтобы поле менялось по всей области
+    params["dt"] = 0.4 * solver.dx**2 / float(np.max(solver.lambda0 / solver.rho_Cp))
+    params["t_max"] = params["dt"] * (steps + 0.5)
+
+    rows = []
+    reference = None
+    serial_time = None
+    for threads in thread_counts:
+        options = dict(DEFAULT_SOLVER_OPTIONS, threads=threads, probes=[0.5])
+        best = np.inf
+        for _ in range(repeats):
+            solver = HeatSolver(dict(params), options)
+            start = time.perf_counter()
+            result = solver.run(store_history=False)
+            best = min(best, (time.perf_counter() - start) / solver.Nt)
+        if reference is None:
+            reference = result.T_final
+            serial_time = best
+        rows.append((threads, best, serial_time / best, float(np.max(np.abs(result.T_final - reference)))))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Масштабируемость многопоточного расчета шага")
+    parser.add_argument("--nx", type=int, default=1_000_000, help="число узлов сетки")
+    parser.add_argument("--steps", type=int, default=100, help="число шагов")
+    parser.add_argument("--threads", default="1,2,4,8", help="числа потоков через запятую")
+    parser.add_argument("--repeats", type=int, default=3, help="повторов для каждого числа потоков")
+    args = parser.parse_args()
+
+    thread_counts = [int(value) for value in args.threads.split(",")]
+    print(f"Nx = {args.nx}, шагов: {args.steps}")
+    for threads, step_time, speedup, difference in benchmark(args.nx, args.steps, thread_counts, args.repeats):
+        print(f"потоков {threads:3d}: {step_time*1e3:8.2f} мс/шаг, ускорение {speedup:5.2f}, "
+              f"эффективность {speedup/threads*100:5.1f} %, отличие поля {difference:.1e} K")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def interpolation_weights(x_grid, x_points):
+    """Индексы левых узлов и веса линейной интерполяции поля в точки x_points"""
+    x_points = np.asarray(x_points, dtype=float)
+    if np.any(x_points < x_grid[0]) or np.any(x_points > x_grid[-1]):
+        raise ValueError("Точка контроля вне реактора")
+    index = np.clip(np.searchsorted(x_grid, x_points, side='right') - 1, 0, len(x_grid) - 2)
+    weight = (x_points - x_grid[index]) / (x_grid[index + 1] - x_grid[index])
+    return index, weight
+
+
+def interpolate(T, index, weight):
+    """Значения поля T (..., Nx) в точках, заданных индексами и весами"""
+    return T[..., index] * (1 - weight) + T[..., index + 1] * weight
+
+
+class ProbeRecorder:
+    """Запись температуры в заданных точках на каждом шаге расчета.
+
+    Значения пишутся в заранее выделенный массив (..., Nt, n_probes), поэтому
+    память не зависит от числа узлов сетки.
+    """
+
+    def __init__(self, solver, positions, out=None):
+        self.x = np.asarray(positions, dtype=float)
+        self.index, self.weight = interpolation_weights(solver.x, self.x)
+        self.initial = interpolate(solver.initial_field(), self.index, self.weight)
+        self.values = np.empty(solver.batch_shape + (solver.Nt, len(self.x))) if out is None else out
+        self.count = 0
+
+    def record(self, n, T):
+        self.values[..., n, :] = interpolate(T, self.index, self.weight)
+        self.count = n + 1
+
+    def fill(self, start, T_rows):
+        """Запись значений для слоев начиная со start по готовым полям T_rows (..., k, Nx)"""
+        values = interpolate(T_rows, self.index, self.weight)
+        self.values[..., start:start + values.shape[-2], :] = values
+        self.count = start + values.shape[-2]
+
+    def series(self):
+        """Временные ряды (..., Nt, n_probes) записанных шагов"""
+        return self.values[..., :self.count, :]
+
+    @property
+    def nbytes(self):
+        return self.series().nbytes
+
+
+def default_probe_positions(x_grid):
+    """Точки по умолчанию: начало, середина и конец реактора (узлы сетки)"""
+    return [x_grid[0], x_grid[len(x_grid) // 2], x_grid[-1]]
@@ -0,0 +1,119 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from result_io import dumps_json, pack_result, unpack_result
+
+# Сигнатура и версия формата файла проекта
+PROJECT_MAGIC = b"BGPROJ01"
+PROJECT_VERSION = 1
+
+# Выравнивание массивов в файле, байт
+PROJECT_ALIGNMENT = 64
+
+
+class Project:
+    """Содержимое файла проекта.
+
+    inputs - тексты полей ввода (имя поля -> текст), overrides - настройки
+    решателя, выбранные инструментами, result - результат расчета (или None).
+    """
+
+    def __init__(self, inputs, overrides, result=None):
+        self.inputs = inputs
+        self.overrides = overrides
+        self.result = result
+
+
+def _aligned(offset):
+    return -(-offset // PROJECT_ALIGNMENT) * PROJECT_ALIGNMENT
+
+
+def save_arrays(filename, magic, header, arrays):
+    """Запись заголовка JSON и массивов без сжатия.
+
+    Файл: сигнатура, длина заголовка (uint64), заголовок, затем данные
+    массивов с выравниванием; в заголовок добавляются тип, форма и смещение
+    каждого массива. Запись идет во временный файл, который затем заменяет прежний.
+    В Windows файл, отображенный в память (load_arrays), заменить нельзя:
+    перед записью в него отображения должны быть освобождены (см. maps_file).
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    # Смещения массивов отсчитываются от начала данных, заголовок дополняется пробелами до границы выравнивания
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+    header_bytes = dumps_json(dict(header, arrays=layout)).encode('utf-8')
+    data_start = _aligned(len(magic) + 8 + len(header_bytes))
+    header_bytes += b" " * (data_start - len(magic) - 8 - len(header_bytes))
+
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'wb') as f:
+        f.write(magic)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            array.tofile(f)
+        f.truncate(data_start + offset)
+    os.replace(temp_filename, filename)
+
+
+def load_arrays(filename, magic, kind="проекта"):
+    """Чтение файла, записанного save_arrays: (заголовок, массивы).
+
+    Массивы отображаются в память без чтения файла целиком.
+    """
+    with open(filename, 'rb') as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError(f"Файл не является файлом {kind}")
+        header_size, = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size).decode('utf-8'))
+    data_start = len(magic) + 8 + header_size
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        if dtype.itemsize * int(np.prod(shape)) == 0:
+            # Пустые массивы не отображаются (mmap нулевой длины недопустим)
+            arrays[name] = np.empty(shape, dtype)
+        else:
+            arrays[name] = np.memmap(filename, dtype=dtype, mode='r', offset=data_start + spec["offset"],
+                                     shape=shape)
+    return header, arrays
+
+
+def maps_file(result, filename):
+    """Отображены ли массивы результата в память из файла filename (например, из открытого проекта)"""
+    path = os.path.normcase(os.path.abspath(filename))
+    return any(isinstance(array, np.memmap) and array.filename is not None
+               and os.path.normcase(array.filename) == path
+               for array in pack_result(result).values())
+
+
+def result_in_memory(result):
+    """Копия результата с массивами в памяти (без отображения файла)"""
+    return unpack_result({name: np.array(array) for name, array in pack_result(result).items()})
+
+
+def save_project(filename, project):
+    """Запись проекта: параметры в заголовке, массивы результата без сжатия"""
+    arrays = pack_result(project.result) if project.result is not None else {}
+    header = {"version": PROJECT_VERSION, "inputs": project.inputs, "overrides": project.overrides}
+    save_arrays(filename, PROJECT_MAGIC, header, arrays)
+
+
+def load_project(filename):
+    """Открытие проекта; массивы результата отображаются в память без чтения файла целиком"""
+    header, arrays = load_arrays(filename, PROJECT_MAGIC)
+    if header["version"] > PROJECT_VERSION:
+        raise ValueError(f"Файл проекта более новой версии ({header['version']})")
+
+    result = unpack_result(arrays) if arrays else None
+    return Project(header["inputs"], header["overrides"], result)
@@ -0,0 +1,204 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from project_file import load_project
+from result_plots import draw_accumulated_energy, draw_temperature_profiles, draw_temperature_slices
+from run_workspace import RunRecord
+
+# Графики отчета (как на странице результатов) и размер рисунка, дюймы
+REPORT_CHARTS = ("profiles", "energy", "slices")
+REPORT_FIGSIZE = (8, 5)
+REPORT_DPI = 100
+
+# Столбцы таблицы параметров: ключ, заголовок, множитель
+REPORT_PARAMETERS = (
+    ("T_wall", "T стенки, °C", 1.0),
+    ("T_init", "T нач., °C", 1.0),
+    ("L", "L, м", 1.0),
+    ("H", "H, %", 1.0),
+    ("rho", "ρ, кг/м³", 1.0),
+    ("Cp_dry", "Cp сух., Дж/(кг·K)", 1.0),
+    ("lambda_dry", "λ сух., Вт/(м·K)", 1.0),
+    ("dx", "dx, м", 1.0),
+    ("dt", "dt, с", 1.0),
+    ("t_max", "t, ч", 1 / 3600),
+)
+
+# Строк таблицы параметров на странице PDF
+REPORT_TABLE_ROWS = 25
+
+# Рисунки, созданные в этом процессе (создаются при первом использовании и переиспользуются)
+_templates = None
+
+
+def figure_templates():
+    """Рисунки и оси для графиков отчета: имя -> (рисунок, оси)"""
+    global _templates
+    if _templates is None:
+        _templates = {}
+        for name in REPORT_CHARTS:
+            figure = Figure(figsize=REPORT_FIGSIZE, dpi=REPORT_DPI)
+            FigureCanvasAgg(figure)
+            _templates[name] = (figure, figure.add_subplot(111))
+        # Страница PDF: три графика одного расчета (A4)
+        page = Figure(figsize=(8.27, 11.69))
+        FigureCanvasAgg(page)
+        _templates["page"] = (page, page.subplots(3, 1))
+    return _templates
+
+
+def load_case(case):
+    """Расчет для отчета: запись рабочей области (выгруженная загружается из файла) или путь к файлу проекта"""
+    if isinstance(case, RunRecord):
+        if not case.loaded:
+            case.load()
+        return case
+    project = load_project(case)
+    if project.result is None:
+        raise ValueError(f"В проекте {case} нет результата расчета")
+    record = RunRecord.from_result(project.result)
+    record.label = os.path.splitext(os.path.basename(case))[0]
+    return record
+
+
+def draw_case(axes, record):
+    """Три графика расчета на осях axes (профили, энергия, срезы)"""
+    arrays = record.arrays
+    # Диапазон по температурам в точках контроля (по профилям он расширяется при рисовании)
+    bounds = (float(np.min(arrays["probe_values"])), float(np.max(arrays["probe_values"])))
+    t_hours = arrays["t"] / 3600
+    for ax in axes:
+        ax.clear()
+    draw_temperature_profiles(axes[0], arrays["x"], list(zip(arrays["profile_times"], arrays["profiles"])), bounds)
+    draw_accumulated_energy(axes[1], t_hours, arrays["energy"])
+    draw_temperature_slices(axes[2], t_hours, record.summary["probe_x"], arrays["probe_values"],
+                            record.summary["default_probes"])
+
+
+def render_cases(cases, directory, first_index=1, image_format="png"):
+    """Графики расчетов в файлы (в рабочем процессе); возвращает список файлов"""
+    templates = figure_templates()
+    figures = [templates[name][0] for name in REPORT_CHARTS]
+    axes = [templates[name][1] for name in REPORT_CHARTS]
+    files = []
+    for k, case in enumerate(cases):
+        record = load_case(case)
+        draw_case(axes, record)
+        for name, figure in zip(REPORT_CHARTS, figures):
+            figure.suptitle(record.label, fontsize=9)
+            filename = os.path.join(directory, f"{first_index + k:04d}_{name}.{image_format}")
+            figure.savefig(filename)
+            files.append(filename)
+    return files
+
+
+def parameter_table(records):
+    """Строки таблицы параметров и итогов расчетов"""
+    header = ["№"] + [title for _, title, _ in REPORT_PARAMETERS] + ["Энергия, МДж/м", "КПД, %"]
+    rows = []
+    for k, record in enumerate(records):
+        values = [f"{float(np.mean(record.params[key])) * scale:.4g}" for key, _, scale in REPORT_PARAMETERS]
+        rows.append([str(k + 1)] + values + [f"{record.summary['energy']/1e6:.3f}",
+                                             f"{record.summary['eta']*100:.2f}"])
+    return header, rows
+
+
+def render_pdf(cases, filename):
+    """Многостраничный PDF (в рабочем процессе): таблица параметров и страница на каждый расчет"""
+    records = [load_case(case) for case in cases]
+    header, rows = parameter_table(records)
+    page, axes = figure_templates()["page"]
+    with PdfPages(filename) as pdf:
+        for start in range(0, len(rows), REPORT_TABLE_ROWS):
+            table_page = Figure(figsize=(11.69, 8.27))
+            FigureCanvasAgg(table_page)
+            ax = table_page.add_subplot(111)
+            ax.axis('off')
+            ax.set_title("Параметры и результаты расчетов")
+            table = ax.table(cellText=rows[start:start + REPORT_TABLE_ROWS], colLabels=header, loc='upper center')
+            table.auto_set_font_size(False)
+            table.set_fontsize(7)
+            table.auto_set_column_width(range(len(header)))
+            pdf.savefig(table_page)
+
+        for k, record in enumerate(records):
+            draw_case(axes, record)
+            page.suptitle(f"{k + 1}. {record.label}", fontsize=10)
+            page.tight_layout(rect=(0, 0, 1, 0.97))
+            pdf.savefig(page)
+    return [filename]
+
+
+class ReportGenerator:
+    """Отчет по множеству расчетов: графики в файлы и сводный PDF.
+
+    Расчеты (записи рабочей области или пути к файлам проектов) делятся на
+    пакеты по chunk_size, пакеты рисуются в пуле процессов. Каждый процесс
+    один раз создает рисунки (backend Agg, без pyplot) и перерисовывает на
+    них все свои расчеты. PDF пишется отдельной задачей того же пула.
+    """
+
+    def __init__(self, cases, directory, pdf_filename=None, image_format="png", chunk_size=8):
+        if not cases:
+            raise ValueError("Нет расчетов для отчета")
+        self.cases = list(cases)
+        self.directory = directory
+        self.pdf_filename = pdf_filename
+        self.image_format = image_format
+        self.chunk_size = chunk_size
+        self.files = []
+        self.tasks = 0
+        self.done = 0
+
+    def submit(self, executor):
+        """Постановка задач в executor, возвращает список Future"""
+        os.makedirs(self.directory, exist_ok=True)
+        futures = [executor.submit(render_cases, self.cases[start:start + self.chunk_size], self.directory,
+                                   start + 1, self.image_format)
+                   for start in range(0, len(self.cases), self.chunk_size)]
+        if self.pdf_filename:
+            # PDF пишется дольше отдельных графиков, поэтому ставится в очередь первым
+            futures.insert(0, executor.submit(render_pdf, self.cases, self.pdf_filename))
+        self.tasks = len(futures)
+        return futures
+
+    def collect(self, files):
+        """Учет завершенной задачи"""
+        self.files.extend(files)
+        self.done += 1
+
+    @property
+    def progress(self):
+        return self.done / self.tasks if self.tasks else 0.0
+
+    def run(self, workers=None):
+        """Отчет в пуле процессов; возвращает список созданных файлов"""
+        with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+            for future in self.submit(executor):
+                self.collect(future.result())
+        return sorted(self.files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Отчет по файлам проектов: графики и сводный PDF")
+    parser.add_argument("directory", help="каталог для графиков")
+    parser.add_argument("projects", nargs="+", help="файлы проектов (.bgproj)")
+    parser.add_argument("--pdf", default=None, help="файл сводного PDF")
+    parser.add_argument("--format", default="png", help="формат графиков (png, pdf, svg)")
+    parser.add_argument("--workers", type=int, default=None, help="число рабочих процессов")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    files = ReportGenerator(args.projects, args.directory, args.pdf, args.format).run(args.workers)
+    print(f"Отчет: {len(args.projects)} расчетов, {len(files)} файлов за {time.perf_counter() - start:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import io
+import json
+
+import numpy as np
+
+from events import event_time
+from history_storage import HistoryStorage, SnapshotStorage
+from solver import SimulationResult
+
+
+def _json_default(value):
+    """Преобразование массивов NumPy для JSON"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def dumps_json(data):
+    return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+
+def pack_result(result):
+    """Словарь массивов, полностью описывающий результат расчета"""
+    meta = {
+        "params": result.params,
+        "options": result.options,
+        "Q_heating": result.Q_heating,
+        "Q_source": result.Q_source,
+        "t_equilibrium": result.t_equilibrium,
+        "truncated": result.truncated,
+        "events": [(label, target) for label, target, _ in result.events],
+        "history": None,
+        "layer_names": list(result.layer_names),
+    }
+    arrays = {
+        "x": result.x,
+        "energy": result.energy,
+        "eta": result.eta,
+        "T_final": result.T_final,
+        "probe_x": result.probe_x,
+        "probe_values": result.probe_values,
+        "event_times": np.array([np.nan if times is None else times for _, _, times in result.events], dtype=float),
+    }
+
+    if result.layer_energy is not None:
+        arrays["layer_energy"] = result.layer_energy
+
+    storage = result.history_storage
+    if storage is not None:
+        history = storage if result.T_history is not None else storage.storage
+        meta["history"] = {
+            "mode": "full" if result.T_history is not None else "snapshots",
+            "scale": history.scale,
+            "offset": history.offset,
+            # Выход обрезанных значений int16 за диапазон, K (None - неизвестен)
+            "clip_error": history.clip_error if history.clip_tracked else None,
+        }
+        arrays["history"] = history.data[:history.count]
+        if result.T_history is None:
+            arrays["snapshot_rows"] = np.array(storage.stored_rows, dtype=np.int64)
+
+    arrays["meta"] = np.frombuffer(dumps_json(meta).encode('utf-8'), dtype=np.uint8)
+    return arrays
+
+
+def unpack_result(arrays):
+    """Восстановление результата из словаря массивов (массивы не копируются)"""
+    meta = json.loads(bytes(np.asarray(arrays["meta"])).decode('utf-8'))
+    params = meta["params"]
+
+    T_history = None
+    snapshots = None
+    history = meta["history"]
+    if history is not None:
+        storage = HistoryStorage.from_data(arrays["history"], history["scale"], history["offset"])
+        if history.get("clip_error") is not None:
+            storage.clip_error = history["clip_error"]
+            storage.clip_tracked = True
+        if history["mode"] == "full":
+            T_history = storage
+        else:
+            snapshots = SnapshotStorage.from_storage(arrays["snapshot_rows"], storage)
+
+    event_times = arrays["event_times"]
+    events = [(label, target, event_time(event_times[k])) for k, (label, target) in enumerate(meta["events"])]
+
+    result = SimulationResult(params, meta["options"], arrays["x"], arrays["energy"], arrays["eta"],
+                              T_history, arrays["T_final"], meta["Q_heating"],
+                              meta["t_equilibrium"], meta["truncated"], events)
+    result.snapshots = snapshots
+    result.Q_source = meta.get("Q_source", 0.0)
+    result.probe_x = arrays["probe_x"]
+    result.probe_values = arrays["probe_values"]
+    if "layer_energy" in arrays:
+        result.layer_names = meta["layer_names"]
+        result.layer_energy = arrays["layer_energy"]
+    return result
+
+
+def result_to_bytes(result):
+    """Результат в двоичном виде (.npz) для передачи по сети"""
+    buffer = io.BytesIO()
+    np.savez(buffer, **pack_result(result))
+    return buffer.getvalue()
+
+
+def result_from_bytes(data):
+    """Восстановление результата из двоичного вида"""
+    with np.load(io.BytesIO(data)) as npz:
+        arrays = {key: npz[key] for key in npz.files}
+    return unpack_result(arrays)
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Подписи точек контроля по умолчанию (начало, середина и конец реактора)
+DEFAULT_PROBE_NAMES = (' (начало)', ' (середина)', ' (конец)')
+
+
+def draw_temperature_profiles(ax, x, profiles, temperature_bounds, compared=(), measured=None):
+    """Температурные профили в разные моменты времени.
+
+    profiles - список (время, с; профиль), compared - записи рабочей
+    области, последние профили которых накладываются на график, measured -
+    журнал измерений (MeasuredLog): показания датчиков с известной
+    координатой в те же моменты отмечаются точками цвета профиля.
+    """
+    T_lo, T_hi = temperature_bounds
+    colors = []
+    for t, profile in profiles:
+        line, = ax.plot(x, profile, label=f"{t/3600:.1f} ч")
+        colors.append(line.get_color())
+        # Тепловой поток на стенке может вывести температуры за заданный диапазон
+        T_lo, T_hi = min(T_lo, float(np.min(profile))), max(T_hi, float(np.max(profile)))
+
+    if measured is not None and measured.located.any() and profiles:
+        values = measured.resample([t for t, _ in profiles])[:, measured.located]
+        label = 'Измерения'
+        for color, row in zip(colors, values):
+            if np.isfinite(row).any():
+                ax.plot(measured.x[measured.located], row, 'o', color=color, label=label)
+                label = '_nolegend_'
+                T_lo, T_hi = min(T_lo, float(np.nanmin(row))), max(T_hi, float(np.nanmax(row)))
+
+    # Последние профили сравниваемых расчетов
+    for record in compared:
+        if len(record.arrays["profiles"]) == 0:
+            continue
+        profile = record.arrays["profiles"][-1]
+        ax.plot(record.arrays["x"], profile, '--',
+                label=f"№{record.id}: {record.arrays['profile_times'][-1]/3600:.1f} ч")
+        T_lo, T_hi = min(T_lo, float(np.min(profile))), max(T_hi, float(np.max(profile)))
+
+    ax.set_xlabel('Длина реактора, м')
+    ax.set_ylabel('Температура, °C')
+    ax.set_title('Температурные профили во времени')
+    ax.legend()
+    ax.grid(True)
+
+    # Определение границ по Y
+    ax.set_ylim(T_lo - 5, T_hi + 10)
+
+
+def draw_accumulated_energy(ax, time_hours, energy, monte_carlo=None, compared=()):
+    """Накопленная тепловая энергия; monte_carlo - полосы неопределенности (MonteCarloResult)"""
+    if energy is not None:
+        ax.plot(time_hours, energy / 1e6, label='Расчет')
+
+    for record in compared:
+        ax.plot(record.arrays["t"] / 3600, record.arrays["energy"] / 1e6, '--', label=record.label)
+
+    # Полосы неопределенности по результатам Монте-Карло
+    if monte_carlo is not None:
+        mc = monte_carlo
+        ax.fill_between(mc.t / 3600, mc.band(0.1) / 1e6, mc.band(0.9) / 1e6, alpha=0.3,
+                        label=f'P10-P90 ({mc.count} реализаций)')
+        ax.plot(mc.t / 3600, mc.band(0.5) / 1e6, '--', label='P50')
+    if monte_carlo is not None or compared:
+        ax.legend()
+
+    ax.set_xlabel('Время, ч')
+    ax.set_ylabel('Аккумулированная энергия, МДж')
+    ax.set_title('Накопленная тепловая энергия')
+    ax.grid(True)
+
+
+def draw_temperature_slices(ax, time_hours, probe_x, probe_values, default_probes=True, compared=(),
+                            measured=None):
+    """Температура в точках контроля; default_probes - точки по умолчанию (с подписями).
+
+    measured - журнал измерений (MeasuredLog), показания которого
+    приводятся к моментам расчета и накладываются на график.
+    """
+    names = DEFAULT_PROBE_NAMES if default_probes else [''] * len(probe_x)
+    for k, x_probe in enumerate(probe_x):
+        ax.plot(time_hours, probe_values[:, k], label=f'x={x_probe:.2f} м{names[k]}')
+
+    for record in compared:
+        for k, x_probe in enumerate(record.summary["probe_x"]):
+            ax.plot(record.arrays["t"] / 3600, record.arrays["probe_values"][:, k], '--',
+                    label=f'№{record.id}: x={x_probe:.2f} м')
+
+    if measured is not None:
+        values = measured.resample(np.asarray(time_hours) * 3600)
+        for j, name in enumerate(measured.names):
+            ax.plot(time_hours, values[:, j], ':', label=f'{name} (изм.)')
+
+    ax.set_xlabel('Время, ч')
+    ax.set_ylabel('Температура, °C')
+    ax.set_title('Температура в фиксированных срезах')
+    ax.legend()
+    ax.grid(True)
@@ -0,0 +1,183 @@
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from monte_carlo import time_points
+
+# Ряды и профили расчетов в рабочей области хранятся с одинарной точностью
+RECORD_DTYPE = np.float32
+
+
+class RunRecord:
+    """Сжатое представление расчета для сравнения на графиках.
+
+    Хранятся параметры, итоговые величины, прореженные ряды энергии, КПД и
+    температур в точках контроля (не более series_points моментов) и
+    сохраненные профили температуры. Поле целиком и его история не хранятся.
+    """
+
+    ARRAYS = ("t", "energy", "eta", "probe_values", "x", "profile_times", "profiles")
+
+    def __init__(self, params, summary, arrays):
+        self.id = None
+        self.label = None
+        self.created = time.time()
+        self.params = params
+        self.summary = summary
+        self.arrays = arrays
+        # Файл, в который выгружены массивы (None - массивы в памяти)
+        self.spill_path = None
+
+    @classmethod
+    def from_result(cls, result, series_points=2000):
+        steps = time_points(result.Nt, series_points)
+        profiles = result.profiles()
+        arrays = {
+            # Моменты - как у рядов на графиках (номер шага * dt)
+            "t": steps * result.dt,
+            "energy": result.energy[steps].astype(RECORD_DTYPE),
+            "eta": result.eta[steps].astype(RECORD_DTYPE),
+            "probe_values": result.probe_values[steps].astype(RECORD_DTYPE),
+            "x": result.x.astype(RECORD_DTYPE),
+            "profile_times": np.array([n * result.dt for n, _ in profiles]),
+            "profiles": np.array([profile for _, profile in profiles], dtype=RECORD_DTYPE).reshape(
+                len(profiles), len(result.x)),
+        }
+        summary = {
+            "energy": float(result.energy[-1]),
+            "eta": float(result.eta[-1]),
+            "Q_heating": float(result.Q_heating),
+            "t_equilibrium": result.t_equilibrium,
+            "probe_x": [float(x) for x in result.probe_x],
+            "default_probes": result.options.get("probes") is None,
+            "events": [(label, float(target), t_event) for label, target, t_event in result.events],
+        }
+        return cls(dict(result.params), summary, arrays)
+
+    @property
+    def loaded(self):
+        return self.arrays is not None
+
+    @property
+    def nbytes(self):
+        """Память массивов записи (0, если они выгружены на диск)"""
+        return sum(array.nbytes for array in self.arrays.values()) if self.loaded else 0
+
+    def spill(self, path):
+        """Выгрузка массивов в файл .npz и освобождение памяти (записанный ранее файл не переписывается)"""
+        if self.spill_path is None:
+            np.savez(path, **self.arrays)
+            self.spill_path = path
+        self.arrays = None
+
+    def load(self):
+        """Загрузка выгруженных массивов"""
+        with np.load(self.spill_path) as npz:
+            self.arrays = {name: npz[name] for name in self.ARRAYS}
+
+
+class RunWorkspace:
+    """Рабочая область: последние расчеты для сравнения.
+
+    Хранится не более max_runs записей. Если массивы записей занимают
+    больше memory_limit_mb, давно не использовавшиеся записи выгружаются в
+    spill_dir (если задан) или удаляются. Обращение к записи (get) делает ее
+    последней использованной и при необходимости загружает ее с диска.
+    Выгруженные файлы пишутся во временный каталог внутри spill_dir, который
+    удаляется методом clear и при завершении программы.
+    """
+
+    def __init__(self, max_runs=20, memory_limit_mb=200.0, spill_dir=None, series_points=2000):
+        if max_runs < 1:
+            raise ValueError("Рабочая область должна хранить хотя бы один расчет")
+        self.max_runs = max_runs
+        self.memory_limit = memory_limit_mb * 2**20
+        self.spill_dir = spill_dir
+        # Временный каталог выгруженных записей (создается при первой выгрузке)
+        self.spill_directory = None
+        self.series_points = series_points
+        self.records = OrderedDict()
+        # Номера расчетов, выбранных для наложения на графики
+        self.selected = set()
+        self.next_id = 1
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, run_id):
+        return run_id in self.records
+
+    @property
+    def nbytes(self):
+        return sum(record.nbytes for record in self.records.values())
+
+    def add_result(self, result):
+        """Добавление результата расчета, возвращает номер записи"""
+        record = RunRecord.from_result(result, self.series_points)
+        record.id = self.next_id
+        self.next_id += 1
+        p = record.params
+        record.label = (f"№{record.id} ({time.strftime('%H:%M', time.localtime(record.created))}): "
+                        f"T_wall {p['T_wall']:g} °C, H {p['H']:g} %, dx {p['dx']:g} м, dt {p['dt']:g} с")
+        self.records[record.id] = record
+        while len(self.records) > self.max_runs:
+            self.remove(next(iter(self.records)))
+        self.enforce_memory_limit()
+        return record.id
+
+    def get(self, run_id):
+        """Запись расчета с массивами в памяти"""
+        return self.get_many([run_id])[0]
+
+    def get_many(self, run_ids):
+        """Записи расчетов с массивами в памяти (все одновременно).
+
+        Записи загружаются вместе и не выгружаются при соблюдении ограничения
+        памяти: оно выполняется за счет остальных записей, даже если самих
+        выбранных записей больше memory_limit_mb.
+        """
+        records = []
+        for run_id in run_ids:
+            self.records.move_to_end(run_id)
+            records.append(self.records[run_id])
+        missing = [record for record in records if not record.loaded]
+        for record in missing:
+            record.load()
+        if missing:
+            self.enforce_memory_limit(keep=set(run_ids))
+        return records
+
+    def remove(self, run_id):
+        record = self.records.pop(run_id)
+        self.selected.discard(run_id)
+        if record.spill_path is not None and os.path.exists(record.spill_path):
+            os.remove(record.spill_path)
+
+    def enforce_memory_limit(self, keep=()):
+        """Выгрузка или удаление давно не использовавшихся записей.
+
+        Последняя запись и записи keep остаются в памяти.
+        """
+        for run_id in list(self.records)[:-1]:
+            if self.nbytes <= self.memory_limit:
+                return
+            record = self.records[run_id]
+            if not record.loaded or run_id in keep:
+                continue
+            if self.spill_dir:
+                if self.spill_directory is None:
+                    os.makedirs(self.spill_dir, exist_ok=True)
+                    self.spill_directory = tempfile.TemporaryDirectory(prefix="runs_", dir=self.spill_dir)
+                record.spill(os.path.join(self.spill_directory.name, f"run_{run_id}.npz"))
+            else:
+                self.remove(run_id)
+
+    def clear(self):
+        for run_id in list(self.records):
+            self.remove(run_id)
+        if self.spill_directory is not None:
+            self.spill_directory.cleanup()
+            self.spill_directory = None
@@ -0,0 +1,128 @@
+import atexit
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from result_io import pack_result, unpack_result
+from solver import HeatSolver, ProgressReporter
+
+# Массивы результата, которые остаются в разделяемой памяти
+SHARED_ARRAYS = ("energy", "eta", "history", "probe_values", "layer_energy")
+
+# Выравнивание массивов внутри сегмента, байт
+ALIGNMENT = 64
+
+# Сегменты, принадлежащие этому процессу (удаляются при выходе, если не освобождены раньше)
+_owned_buffers = {}
+
+
+def _map_views(segment, layout):
+    """Массивы NumPy поверх сегмента по разметке имя -> (форма, тип, смещение).
+
+    NumPy не удерживает экспорт буфера, поэтому SharedMemory.close при живых
+    массивах не завершится ошибкой, а оставит их висячими. Все массивы (и их
+    срезы) ссылаются на один корневой массив поверх segment.buf; сегмент
+    закрывается, только когда удален последний из них.
+    """
+    root = np.ndarray((segment.size,), dtype=np.uint8, buffer=segment.buf)
+    # При выходе сегмент не закрывается: отображение освобождается вместе с процессом
+    weakref.finalize(root, segment.close).atexit = False
+    return {name: np.ndarray(shape, dtype=dtype, buffer=root, offset=offset)
+            for name, (shape, dtype, offset) in layout.items()}
+
+
+class SharedResultBuffer:
+    """Сегмент разделяемой памяти под крупные массивы результата одного расчета.
+
+    Сегмент создается и освобождается процессом-владельцем (интерфейсом или
+    сервером заданий). Рабочий процесс подключается к нему по имени и пишет
+    результаты на месте, поэтому история, энергия и точки контроля не
+    сериализуются и не копируются при передаче. Служебный массив control
+    содержит флаг отмены и долю выполненных шагов.
+    """
+
+    def __init__(self, solver, store_history=None):
+        layout = dict(solver.output_layout(store_history), control=((2,), "float64"))
+        self.layout = {}
+        size = 0
+        for name, (shape, dtype) in layout.items():
+            dtype = np.dtype(dtype)
+            size = -(-size // ALIGNMENT) * ALIGNMENT
+            self.layout[name] = (tuple(shape), dtype.str, size)
+            size += int(np.prod(shape)) * dtype.itemsize
+
+        self.nbytes = size
+        self.segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        _owned_buffers[self.segment.name] = self
+        self.views = _map_views(self.segment, self.layout)
+        self.views["control"][:] = 0.0
+
+    @property
+    def descriptor(self):
+        """Описание сегмента для передачи в рабочий процесс"""
+        return {"name": self.segment.name, "layout": self.layout}
+
+    @property
+    def progress(self):
+        return float(self.views["control"][1]) if self.segment is not None else 0.0
+
+    def cancel(self):
+        """Запрос отмены расчета, выполняемого в рабочем процессе"""
+        if self.segment is not None:
+            self.views["control"][0] = 1.0
+
+    def result(self, arrays, shapes):
+        """Результат расчета поверх массивов сегмента (без копирования).
+
+        arrays и shapes - значения, возвращенные run_shared().
+        """
+        arrays = dict(arrays)
+        for name, shape in shapes.items():
+            arrays[name] = self.views[name][tuple(slice(0, n) for n in shape)]
+        result = unpack_result(arrays)
+        # Сегмент не освобождается, пока на него ссылается результат
+        result.shared_buffer = self
+        return result
+
+    def release(self):
+        """Освобождение сегмента при отмене, замене или удалении результата.
+
+        Имя сегмента удаляется сразу, новые подключения к нему невозможны;
+        память остается доступной массивам, которые еще на нее ссылаются,
+        и освобождается вместе с последним из них (см. _map_views).
+        """
+        if self.segment is None:
+            return
+        segment, self.segment, self.views = self.segment, None, None
+        _owned_buffers.pop(segment.name, None)
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@atexit.register
+def release_all():
+    """Освобождение всех сегментов процесса при выходе"""
+    for buffer in list(_owned_buffers.values()):
+        buffer.release()
+
+
+def run_shared(params, options, descriptor, store_history=None):
+    """Расчет в рабочем процессе с записью результатов в сегмент descriptor.
+
+    Возвращает небольшие массивы результата (параметры, сетку, события) и
+    фактические формы массивов, оставшихся в разделяемой памяти.
+    """
+    views = _map_views(shared_memory.SharedMemory(name=descriptor["name"]), descriptor["layout"])
+    control = views.pop("control")
+    solver = HeatSolver(params, options)
+    reporter = ProgressReporter(
+        solver.Nt,
+        report=lambda fraction: control.__setitem__(1, fraction),
+        cancelled=lambda: control[0] != 0
+    )
+    arrays = pack_result(solver.run([reporter], store_history, buffers=views))
+    shapes = {name: arrays.pop(name).shape for name in SHARED_ARRAYS if name in arrays}
+    return arrays, shapes
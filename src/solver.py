@@ -0,0 +1,569 @@
+import numpy as np
+
+from events import EventDetector
+from history_storage import HistoryStorage, SnapshotStorage, snapshot_rows
+from boundary_conditions import BoundaryCondition
+from heat_sources import HeatSource
+from layers import Layer, LayerEnergyRecorder, PropertyField, parse_layers
+from material_properties import CP_WATER, LAMBDA_WATER, resolve_material
+from parallel_stencil import ParallelStencil
+from probes import ProbeRecorder, default_probe_positions
+from solver_options import DEFAULT_SOLVER_OPTIONS
+
+# Значения параметров модели по умолчанию (как у пустых полей ввода)
+DEFAULT_PARAMETERS = {
+    "T_wall": 20.0,
+    "L": 1.0,
+    "T_init": 20.0,
+    "dt": 1.0,
+    "t_max": 10.0,
+    "rho": 1000.0,
+    "H": 0.5,
+    "dx": 0.01,
+    "Cp_dry": 2500.0,
+    "lambda_dry": 0.1,
+}
+
+# Параметры, которые можно задавать массивом для пакетного расчета
+BATCH_PARAMETERS = ("T_wall", "T_init", "rho", "H", "Cp_dry", "lambda_dry", "b", "T0")
+
+
+class SimulationCancelled(Exception):
+    """Расчет прерван по запросу пользователя"""
+
+
+class ProgressReporter:
+    """Наблюдатель, сообщающий о ходе расчета и проверяющий запрос отмены.
+
+    report(fraction) вызывается примерно каждые 1/updates расчета;
+    если cancelled() возвращает True, расчет прерывается SimulationCancelled.
+    """
+
+    def __init__(self, Nt, report=None, cancelled=None, updates=100):
+        self.every = max(1, Nt // updates)
+        self.Nt = Nt
+        self.report = report
+        self.cancelled = cancelled
+
+    def record(self, n, T):
+        if (n + 1) % self.every and n + 1 != self.Nt:
+            return
+        if self.cancelled is not None and self.cancelled():
+            raise SimulationCancelled()
+        if self.report is not None:
+            self.report((n + 1) / self.Nt)
+
+
+class SimulationResult:
+    """Результаты расчета, не зависящие от интерфейса"""
+
+    def __init__(self, params, options, x, energy, eta, T_history, T_final, Q_heating,
+                 t_equilibrium=None, truncated=False, events=()):
+        self.params = params
+        self.options = options
+        self.x = x
+        self.dt = params["dt"]
+        self.energy = energy
+        self.eta = eta
+        self.T_history = T_history
+        self.T_final = T_final
+        self.Q_heating = Q_heating
+        self.t_equilibrium = t_equilibrium
+        self.truncated = truncated
+        # Тепло биологического источника, Дж/м (учитывается в КПД вместе с Q_heating)
+        self.Q_source = 0.0
+        # Достижение целевых температур: список (описание, цель, время в с); время - None, если цель
+        # не достигнута (для пакета - массив с NaN)
+        self.events = list(events)
+        # Профили в выбранных слоях (если полная история не хранится)
+        self.snapshots = None
+        # Температуры в точках контроля: координаты (м) и ряды (..., Nt, n_probes)
+        self.probe_x = np.empty(0)
+        self.probe_values = np.empty(self.energy.shape + (0,))
+        # Удельная энергия по слоям реактора (..., Nt, n_layers), если заданы слои
+        self.layer_names = ()
+        self.layer_energy = None
+
+    @property
+    def Nt(self):
+        return self.energy.shape[-1]
+
+    def profiles(self):
+        """Температурные профили для графика и экспорта: список (номер слоя, T)"""
+        if self.T_history is not None:
+            return [(n, self.T_history[n]) for n in snapshot_rows(self.Nt)]
+        if self.snapshots is not None:
+            return self.snapshots.profiles(self.Nt)
+        return []
+
+    @property
+    def history_storage(self):
+        """Хранилище профилей (полная история или отдельные слои)"""
+        return self.T_history if self.T_history is not None else self.snapshots
+
+
+class HeatSolver:
+    """Явная схема одномерной теплопроводности без привязки к интерфейсу.
+
+    Параметры из BATCH_PARAMETERS могут быть массивами длины B: тогда за один
+    проход рассчитывается пакет из B вариантов, поле имеет форму (B, Nx).
+    """
+
+    def __init__(self, params, options=None):
+        self.params = dict(DEFAULT_PARAMETERS)
+        self.params.update(params)
+        self.options = dict(DEFAULT_SOLVER_OPTIONS)
+        if options:
+            self.options.update(options)
+        self.setup_parameters()
+
+    def setup_parameters(self):
+        """Расчет производных параметров модели"""
+        p = self.params
+        self.L = p["L"]
+        self.dt = p["dt"]
+        self.t_max = p["t_max"]
+        self.dx = p["dx"]
+
+        # Температурная зависимость теплопроводности lambda0 * (1 + b * (T - T0))
+        p.setdefault("b", self.options["conductivity_slope"])
+        p.setdefault("T0", self.options["conductivity_T0"])
+
+        batch = [np.asarray(p[name], dtype=float) for name in BATCH_PARAMETERS]
+        self.batch_shape = np.broadcast_shapes(*(value.shape for value in batch))
+        if len(self.batch_shape) > 1:
+            raise ValueError("Пакетные параметры должны быть скалярами или одномерными массивами")
+        (self.T_wall, self.T_init, self.rho, self.H, self.Cp_dry,
+         self.lambda_dry, self.b, self.T0) = (np.broadcast_to(value, self.batch_shape) for value in batch)
+
+        # Слоистый реактор: длина - сумма толщин слоев
+        self.layers = None
+        if self.options["layers"]:
+            self.layers = parse_layers(self.options["layers"])
+            L_layers = float(sum(layer.thickness for layer in self.layers))
+            if abs(L_layers - self.L) > 1e-9 * max(L_layers, 1.0):
+                print(f"Длина реактора принята равной сумме толщин слоев: {L_layers:.4f} м")
+                self.L = p["L"] = L_layers
+
+        self.Nx = int(self.L / self.dx) + 1 if self.dx > 0 else 101
+        self.Nt = int(self.t_max / self.dt) if self.dt > 0 else 100
+        self.x = np.linspace(0, self.L, self.Nx)
+
+        # Граничные условия на левой и правой стенках: графики вычисляются заранее для всех шагов
+        self.boundaries = (BoundaryCondition(self.options["boundary_left"]),
+                           BoundaryCondition(self.options["boundary_right"]))
+        times = np.arange(1, self.Nt + 1) * self.dt
+        for boundary in self.boundaries:
+            boundary.precompute(times, self.T_wall, self.batch_shape)
+        # Аналитическое заполнение после равновесия возможно только при постоянной T_wall на обеих стенках
+        self.uniform_walls = all(boundary.default for boundary in self.boundaries)
+        # Ширины ячеек для энергии поля: у стенки без заданной температуры - полуячейка
+        self.cell_widths = np.full(self.Nx, self.dx)
+        for boundary, node in zip(self.boundaries, (0, -1)):
+            if not boundary.fixed:
+                self.cell_widths[node] = self.dx / 2
+        # Узлы с заданной температурой не получают тепла от источника
+        self.source_widths = self.cell_widths.copy()
+        for boundary, node in zip(self.boundaries, (0, -1)):
+            if boundary.fixed:
+                self.source_widths[node] = 0.0
+
+        # Диапазон температур расчета: начальная температура и температуры на стенках
+        ranges = [boundary.temperature_range() for boundary in self.boundaries]
+        ranges = [r for r in ranges if r is not None]
+        self.temperature_bounds = (min([float(np.min(self.T_init))] + [lo for lo, _ in ranges]),
+                                   max([float(np.max(self.T_init))] + [hi for _, hi in ranges]))
+
+        # Биологический источник тепла q(T, t): таблица по температуре и нагрузка для всех шагов
+        self.heat_source = None
+        if self.options["heat_source"]:
+            self.heat_source = HeatSource(self.options["heat_source"])
+            self.heat_source.precompute(times, self.temperature_bounds, self.source_widths)
+
+        # Теплоемкость и базовая теплопроводность с учетом влажности
+        self.H_fraction = self.H / 100.0
+        self.Cp = self.calculate_cp(self.H_fraction)
+        self.lambda0 = self.lambda_dry * (1 - self.H_fraction) + LAMBDA_WATER * self.H_fraction
+        self.rho_Cp = self.rho * self.Cp
+
+        # Свойства по узлам сетки для слоев или табличного материала (λ(T), Cp(T) из библиотеки или CSV)
+        self.material = resolve_material(self.options["material"]) if self.options["material"] else None
+        self.fields = None
+        if self.layers is not None:
+            self.fields = PropertyField(self, self.layers)
+        elif self.material is not None:
+            self.fields = PropertyField(self, [Layer(self.L, material=self.material)])
+
+        if self.fields is not None:
+            T_lo, T_hi = self.temperature_bounds
+            for layer in self.fields.layers:
+                if layer.material is None:
+                    continue
+                table_lo, table_hi = layer.material.temperature_range()
+                if T_lo < table_lo or T_hi > table_hi:
+                    print(f"Предупреждение: температуры выходят за диапазон таблицы материала "
+                          f"'{layer.material.name}' ({table_lo:g}-{table_hi:g} °C), свойства продолжены константой")
+
+            # Справочные значения, средние по длине, при начальной температуре
+            T = self.fields.T_init
+            self.lambda0 = np.mean(np.broadcast_to(self.fields.conductivity(T), T.shape), axis=-1)
+            self.rho_Cp = np.mean(np.broadcast_to(self.fields.volumetric_heat_capacity(T), T.shape), axis=-1)
+            self.Cp = self.rho_Cp / self.rho
+
+        # Диапазон температур для квантования истории
+        if self.options["history_range"] is not None:
+            self.history_range = tuple(self.options["history_range"])
+        else:
+            self.history_range = (self.temperature_bounds[0] - 10.0, self.temperature_bounds[1] + 10.0)
+
+        self.check_stability()
+
+    def calculate_cp(self, H_fraction):
+        """Расчет удельной теплоемкости с учетом влажности"""
+        return self.Cp_dry * (1 - H_fraction) + CP_WATER * H_fraction
+
+    def conductivity(self, T):
+        """Теплопроводность смеси при температуре T (с учетом влажности)"""
+        if self.fields is not None:
+            return self.fields.conductivity(T)
+        return self.column(self.lambda0) * (1 + self.column(self.b) * (T - self.column(self.T0)))
+
+    def volumetric_heat_capacity(self, T):
+        """Объемная теплоемкость rho * Cp смеси при температуре T"""
+        if self.fields is not None:
+            return self.fields.volumetric_heat_capacity(T)
+        return self.column(self.rho_Cp)
+
+    def wall_diffusivity(self):
+        """Температуропроводность при температуре стенки (для затухания после равновесия)"""
+        T_wall = self.column(self.T_wall)
+        if self.fields is not None:
+            return self.column(self.fields.effective_diffusivity(T_wall))
+        return self.conductivity(T_wall) / self.volumetric_heat_capacity(T_wall)
+
+    def check_stability(self):
+        """Проверка устойчивости явной схемы"""
+        if self.fields is None:
+            alpha = np.max(self.lambda0 / self.rho_Cp)
+            rho_cp = np.min(self.rho_Cp)
+        else:
+            # Поле остается между начальной температурой и температурами на стенках
+            T = np.linspace(*self.temperature_bounds, 16)
+            T = T.reshape((16,) + (1,) * (len(self.batch_shape) + 1))
+            alpha = np.max(self.conductivity(T) / self.volumetric_heat_capacity(T))
+            rho_cp = np.min(self.volumetric_heat_capacity(T))
+        # Узел стенки с теплообменом (полуячейка) добавляет к числу Куранта h * dt / (dx * rho * Cp)
+        rate = alpha / self.dx**2 + max(boundary.h for boundary in self.boundaries) / (self.dx * rho_cp)
+        sigma = rate * self.dt
+        if sigma > 0.5:
+            print(f"Предупреждение: Схема может быть неустойчивой! Число Куранта = {sigma:.2f} > 0.5")
+            print(f"Рекомендуется уменьшить шаг по времени до {0.5/rate:.2f} с")
+
+    def column(self, value):
+        """Параметр пакета в форме, совместимой с полем (..., Nx)"""
+        return np.asarray(value)[..., np.newaxis]
+
+    def initial_field(self):
+        """Начальное температурное поле"""
+        T = np.empty(self.batch_shape + (self.Nx,))
+        T[...] = self.column(self.T_init)
+        left, right = self.boundaries
+        if left.fixed:
+            T[..., 0] = left.initial
+        if right.fixed:
+            T[..., -1] = right.initial
+        return T
+
+    def field_energy(self, T):
+        """Удельная энергия поля относительно T_init (Дж/м)"""
+        if self.fields is not None:
+            # При Cp(T) энергия - приращение энтальпии
+            return np.sum(self.fields.energy_density(T) * self.cell_widths, axis=-1)
+        return np.sum(self.column(self.rho_Cp) * (T - self.column(self.T_init)) * self.cell_widths, axis=-1)
+
+    def step(self, T, n):
+        """Шаг n явной схемы.
+
+        Возвращает новое поле, теплопроводности, по которым считаются
+        тепловые потоки через стенки (первая и последняя в массиве), и
+        мощность биологического источника тепла (Вт/м).
+        """
+        lambdas = self.conductivity(T)
+        rho_cp = self.volumetric_heat_capacity(T)
+        T_new = T.copy()
+
+        if self.layers is None:
+            alpha = lambdas / rho_cp
+            T_new[..., 1:-1] = T[..., 1:-1] + alpha[..., 1:-1] * self.dt / self.dx**2 * (
+                T[..., 2:] - 2*T[..., 1:-1] + T[..., :-2])
+        else:
+            # Консервативная форма: на гранях ячеек - среднее гармоническое теплопроводностей,
+            # что дает непрерывный тепловой поток через границы слоев
+            lambdas = 2 * lambdas[..., 1:] * lambdas[..., :-1] / (lambdas[..., 1:] + lambdas[..., :-1])
+            flux = lambdas * (T[..., 1:] - T[..., :-1])
+            T_new[..., 1:-1] = T[..., 1:-1] + self.dt / self.dx**2 * (
+                flux[..., 1:] - flux[..., :-1]) / rho_cp[..., 1:-1]
+
+        # Биологический источник тепла (в узлах с заданной температурой перезаписывается ниже)
+        source_power = 0.0
+        if self.heat_source is not None:
+            q_source, power = self.heat_source.rate(T, n)
+            loading = self.heat_source.loading_values[n]
+            T_new += q_source * (self.dt * loading / rho_cp)
+            source_power = loading * power
+
+        # Граничные условия: заданная температура или баланс тепла в полуячейке у стенки
+        left, right = self.boundaries
+        T_new[..., 0] = self.wall_temperature(left, n, T_new[..., 0], T[..., 0], T[..., 1],
+                                              lambdas[..., 0], rho_cp[..., 0])
+        T_new[..., -1] = self.wall_temperature(right, n, T_new[..., -1], T[..., -1], T[..., -2],
+                                               lambdas[..., -1], rho_cp[..., -1])
+        return T_new, lambdas, source_power
+
+    def wall_temperature(self, boundary, n, T_new_node, T_node, T_next, lambda_wall, rho_cp_wall):
+        """Новая температура узла стенки: заданная или из баланса тепла в полуячейке.
+
+        T_new_node - значение после учета источника, T_node и T_next - старые
+        температуры узла стенки и соседнего узла.
+        """
+        if boundary.fixed:
+            return boundary.values[n]
+        return T_new_node + 2 * self.dt / self.dx * (
+            self.wall_heat_input(boundary, n, T_node)
+            + lambda_wall * (T_next - T_node) / self.dx) / rho_cp_wall
+
+    def wall_heat_input(self, boundary, n, T_wall_node):
+        """Тепловой поток внутрь материала на стенке с условием flux или convection (Вт/м²)"""
+        if boundary.kind == "flux":
+            return boundary.values[n]
+        return boundary.h * (boundary.values[n] - T_wall_node)
+
+    def wall_heat_flows(self, n, T_old, T, lambdas):
+        """Тепловые потоки через левую и правую стенки внутрь материала на шаге n"""
+        left, right = self.boundaries
+        if left.fixed:
+            q_left = -lambdas[..., 0] * (T[..., 1] - T[..., 0]) / self.dx
+        else:
+            q_left = self.wall_heat_input(left, n, T_old[..., 0])
+        if right.fixed:
+            q_right = lambdas[..., -1] * (T[..., -1] - T[..., -2]) / self.dx
+        else:
+            q_right = self.wall_heat_input(right, n, T_old[..., -1])
+        return q_left, q_right
+
+    def output_layout(self, store_history=None):
+        """Формы и типы выходных массивов расчета: имя -> (форма, тип).
+
+        По этой разметке run() выделяет память под результаты; ее же
+        использует вызывающий код, чтобы разместить результаты заранее
+        (например, в разделяемой памяти для рабочего процесса).
+        """
+        if store_history is None:
+            store_history = self.batch_shape == ()
+        positions = self.options["probes"]
+        n_probes = len(default_probe_positions(self.x) if positions is None else positions)
+
+        layout = {
+            "energy": (self.batch_shape + (self.Nt,), "float64"),
+            "eta": (self.batch_shape + (self.Nt,), "float64"),
+            "probe_values": (self.batch_shape + (self.Nt, n_probes), "float64"),
+        }
+        if store_history:
+            # Для профилей - выбранные слои и последний слой при досрочной остановке
+            n_rows = self.Nt if self.options["history_mode"] == "full" else len(snapshot_rows(self.Nt)) + 1
+            layout["history"] = ((n_rows, self.Nx), self.options["history_precision"])
+        if self.layers is not None:
+            layout["layer_energy"] = (self.batch_shape + (self.Nt, len(self.layers)), "float64")
+        return layout
+
+    def run(self, observers=(), store_history=None, buffers=None):
+        """Основной расчетный цикл.
+
+        observers - объекты с методом record(n, T), вызываемым после каждого шага
+        (поле T соответствует моменту (n + 1) * dt).
+        buffers - заранее выделенные массивы по разметке output_layout().
+        """
+        if buffers is None:
+            buffers = {name: np.empty(shape, dtype=dtype)
+                       for name, (shape, dtype) in self.output_layout(store_history).items()}
+
+        energy = buffers["energy"]  # Удельная энергия (Дж/м)
+        eta = buffers["eta"]
+        energy.fill(0.0)
+        eta.fill(0.0)
+
+        # Полная история поля или только профили для графика и экспорта
+        T_history = None
+        snapshots = None
+        if "history" in buffers:
+            if self.options["history_mode"] == "full":
+                T_history = HistoryStorage(self.Nt, self.Nx, self.options["history_precision"], self.history_range,
+                                           buffers["history"])
+            else:
+                snapshots = SnapshotStorage(snapshot_rows(self.Nt), self.Nx, self.options["history_precision"],
+                                            self.history_range, buffers["history"])
+
+        # Точки контроля температуры (начало, середина, конец или заданные пользователем)
+        positions = self.options["probes"]
+        probes = ProbeRecorder(self, default_probe_positions(self.x) if positions is None else positions,
+                               buffers["probe_values"])
+
+        # Энергия по слоям реактора
+        layers = LayerEnergyRecorder(self, buffers["layer_energy"]) if self.layers is not None else None
+
+        T = self.initial_field()
+        Q_heating = np.zeros(self.batch_shape)  # Суммарное удельное подведенное тепло (Дж/м)
+        Q_source = np.zeros(self.batch_shape)  # Удельное тепло биологического источника (Дж/м)
+        energy_initial = self.field_energy(T)
+
+        t_equilibrium = None
+        truncated = False
+        steady_steps = 0
+
+        # Обнаружение достижения целевых температур
+        detector = None
+        if self.options["events"]:
+            detector = EventDetector(self, self.options["events"])
+
+        recorders = [r for r in (T_history, snapshots, probes, layers, detector) if r is not None] + list(observers)
+
+        # Многопоточный шаг для больших сеток: область делится на части по потокам
+        parallel = ParallelStencil(self, self.options["threads"]) if self.options["threads"] > 1 else None
+
+        try:
+            for n in range(self.Nt):
+                T_old = T
+                if parallel is None:
+                    T, lambdas, source_power = self.step(T, n)
+                    field_energy = self.field_energy(T)
+                else:
+                    T, lambdas, source_power, field_energy = parallel.step(T, n)
+
+                # Тепловые потоки на границах (Вт/м) и подведенное тепло (Дж/м)
+                q_left, q_right = self.wall_heat_flows(n, T_old, T, lambdas)
+                Q_heating = Q_heating + (q_left + q_right) * self.dt
+                Q_source = Q_source + source_power * self.dt
+
+                # Удельная аккумулированная энергия (Дж/м) и КПД системы
+                energy[..., n] = field_energy - energy_initial
+                eta[..., n] = self.efficiency(energy[..., n], Q_heating + Q_source)
+
+                for recorder in recorders:
+                    recorder.record(n, T)
+
+                # Остановка после достижения всех целевых температур
+                if detector is not None and self.options["stop_at_events"] and detector.finished:
+                    truncated = True
+                    break
+
+                # Проверка критерия стационарности
+                steady_steps = self.check_steady_state(n, T, T_old, energy, steady_steps,
+                                                       parallel.dT_max if parallel is not None else None)
+                if steady_steps >= self.options["steady_state_window"]:
+                    t_equilibrium = (n + 1) * self.dt
+                    if (self.options["steady_state_fill"] == "truncate" or not self.uniform_walls
+                            or self.heat_source is not None):
+                        truncated = True
+                    else:
+                        T, Q_heating = self.fill_after_equilibrium(n, T, energy, eta, Q_heating, energy_initial,
+                                                                   T_history, snapshots, probes, layers, detector)
+                    break
+        finally:
+            if parallel is not None:
+                parallel.close()
+
+        if truncated:
+            # Ряды обрезаются, расчет помечается как досрочно остановленный
+            energy = energy[..., :n + 1]
+            eta = eta[..., :n + 1]
+            if snapshots is not None:
+                snapshots.add(n, T)
+
+        if self.batch_shape == ():
+            Q_heating = float(Q_heating)
+            Q_source = float(Q_source)
+        events = detector.results() if detector is not None else ()
+        result = SimulationResult(self.params, self.options, self.x, energy, eta, T_history, T,
+                                  Q_heating, t_equilibrium, truncated, events)
+        result.snapshots = snapshots
+        result.Q_source = Q_source
+        result.probe_x = probes.x
+        result.probe_values = probes.series()
+        if layers is not None:
+            result.layer_names = layers.names
+            result.layer_energy = layers.series()
+        return result
+
+    def efficiency(self, energy, Q_heating):
+        """КПД системы: доля подведенного тепла, аккумулированная материалом"""
+        positive = (Q_heating > 0) & (energy > 0)
+        return np.where(positive, np.minimum(1.0, energy / np.where(positive, Q_heating, 1.0)), 0.0)
+
+    def check_steady_state(self, n, T, T_old, energy, steady_steps, dT_max=None):
+        """Подсчет подряд идущих шагов, удовлетворяющих критерию стационарности.
+
+        dT_max - max|T - T_old|, если он уже найден (многопоточным шагом).
+        """
+        tol = self.options["steady_state_tol"]
+        rtol = self.options["steady_state_energy_rtol"]
+        window = self.options["steady_state_window"]
+
+        # Критерий по max|dT/dt| на протяжении окна
+        if tol is not None:
+            dT_dt_max = (np.max(np.abs(T - T_old)) if dT_max is None else dT_max) / self.dt
+            steady_steps = steady_steps + 1 if dT_dt_max < tol else 0
+            if steady_steps >= window:
+                return steady_steps
+
+        # Критерий по относительному изменению энергии за окно
+        if rtol is not None and n >= window:
+            energy_change = np.abs(energy[..., n] - energy[..., n - window])
+            if np.all(energy_change <= rtol * np.maximum(np.abs(energy[..., n]), 1e-12)):
+                return window
+        return steady_steps
+
+    def fill_after_equilibrium(self, n, T, energy, eta, Q_heating, energy_initial,
+                               T_history=None, snapshots=None, probes=None, layers=None, detector=None):
+        """Аналитическое заполнение рядов после выхода на равновесие на шаге n.
+
+        Оставшиеся шаги описываются затуханием первой гармоники к температуре
+        стенки с постоянной времени tau = L^2 / (pi^2 * alpha). События
+        достижения целей на этом участке находятся по тому же закону. При
+        steady_state_fill = "truncate" остаток не рассчитывается, и цели, не
+        достигнутые до остановки, считаются недостигнутыми.
+        """
+        if n + 1 >= self.Nt:
+            return T, Q_heating
+
+        T_wall = self.column(self.T_wall)
+        tau = self.L**2 / (np.pi**2 * self.wall_diffusivity())
+        decay = np.exp(-np.arange(1, self.Nt - n) * self.dt / tau)
+
+        energy_wall = self.column(self.field_energy(np.broadcast_to(self.column(self.T_wall), T.shape))
+                                  - energy_initial)
+        energy_tail = energy_wall - (energy_wall - energy[..., n:n + 1]) * decay
+        # В стационаре все подведенное тепло идет на нагрев материала
+        Q_tail = self.column(Q_heating) + (energy_tail - energy[..., n:n + 1])
+
+        energy[..., n + 1:] = energy_tail
+        eta[..., n + 1:] = self.efficiency(energy_tail, Q_tail)
+
+        if T_history is not None:
+            T_history.extend(T_wall + (T - T_wall)[np.newaxis, :] * decay[:, np.newaxis])
+        if snapshots is not None:
+            for row in snapshots.rows:
+                if row > n:
+                    snapshots.add(row, T_wall + (T - T_wall) * decay[..., row - n - 1])
+        if probes is not None:
+            probe_T = probes.values[..., n:n + 1, :]
+            probes.values[..., n + 1:, :] = T_wall[..., np.newaxis] + (probe_T - T_wall[..., np.newaxis]) * decay[..., np.newaxis]
+            probes.count = self.Nt
+        if layers is not None:
+            layer_wall = self.fields.layer_energy(np.broadcast_to(T_wall, T.shape)) - layers.initial
+            layer_n = layers.values[..., n:n + 1, :]
+            layers.values[..., n + 1:, :] = layer_wall[..., np.newaxis, :] - (
+                layer_wall[..., np.newaxis, :] - layer_n) * decay[..., np.newaxis]
+            layers.count = self.Nt
+        if detector is not None:
+            detector.fill_after_equilibrium(n, T_wall[..., 0], tau[..., 0], self.Nt * self.dt)
+        return T_wall + (T - T_wall) * decay[..., -1:], Q_tail[..., -1]
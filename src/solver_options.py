@@ -0,0 +1,103 @@
+import json
+import os
+
+# Настройки решателя по умолчанию (не вынесены в поля ввода интерфейса)
+DEFAULT_SOLVER_OPTIONS = {
+    # Хранение поля: "full" - полная история, "snapshots" - только профили для графика и экспорта
+    "history_mode": "full",
+    # Точки контроля температуры, м (None - начало, середина и конец реактора)
+    "probes": None,
+    # Точность хранения истории температурного поля: "float64", "float32" или "int16"
+    "history_precision": "float64",
+    # Диапазон температур для квантования int16, °C (None - по начальной температуре и температурам стенок с запасом;
+    # при тепловом потоке на стенке или источнике тепла температуры могут выйти за него - значения
+    # обрезаются, их число и фактическая погрешность выводятся после расчета)
+    "history_range": None,
+    # Сжатие сохраняемых результатов: None, "zlib", "bz2" или "lzma"
+    "history_compression": "zlib",
+    # Количество временных слоев в одном сжатом блоке
+    "history_chunk_rows": 1024,
+    # Температурная зависимость теплопроводности lambda0 * (1 + b * (T - T0))
+    "conductivity_slope": 1e-3,
+    "conductivity_T0": 45.0,
+    # Материал с табличными λ(T), Cp(T) сухого вещества: имя из библиотеки субстратов
+    # или путь к CSV-файлу, или описание с таблицами (Material.to_spec; так материал передается
+    # на сервер заданий) (None - линейная зависимость теплопроводности и постоянная Cp)
+    "material": None,
+    # Шаг равномерной сетки интерполяции табличных свойств, K
+    "property_lookup_step": 0.1,
+    # Слои реактора от левой стенки к правой: список словарей с ключами thickness (м), name,
+    # material, rho, H, Cp_dry, lambda_dry (None - однородная среда; длина L - сумма толщин)
+    "layers": None,
+    # Граничные условия на левой (x = 0) и правой (x = L) стенках (None - постоянная T_wall):
+    # {"type": "temperature" | "flux" | "convection", "schedule": график, "h": Вт/(м²·K)}.
+    # График - число или {"kind": "table" | "step" | "sine", ...}, см. boundary_conditions.py;
+    # для convection график - температура среды, для flux - тепловой поток внутрь материала, Вт/м²
+    "boundary_left": None,
+    "boundary_right": None,
+    # Биологический источник тепла q = q_max * loading(t) * activity(T), Вт/м³ (None - не учитывать):
+    # {"model": "cardinal", "preset": "mesophilic" | "thermophilic", "q_max": ..., "loading": график,
+    #  "update_interval": 1 (пересчет мощности по температуре раз в столько шагов; больше 1 - быстрее,
+    #  но мощность запаздывает до (update_interval - 1) * dt, оценка ошибки - в heat_sources.py)}
+    # или {"model": "arrhenius", "q_max": ..., "T_ref": 35.0, "Ea": 60000.0, "T_max": ...}, см. heat_sources.py
+    "heat_source": None,
+    # Критерий стационарности по max|dT/dt|, K/с (None - не проверять)
+    "steady_state_tol": None,
+    # Критерий стационарности по относительному изменению энергии за окно (None - не проверять)
+    "steady_state_energy_rtol": None,
+    # Окно проверки критерия стационарности, шагов
+    "steady_state_window": 100,
+    # Действие после выхода на равновесие: "analytic" - досчитать ряды аналитически, "truncate" - обрезать
+    "steady_state_fill": "analytic",
+    # События достижения целевых температур: величина "probe" (точка x, м; None - центр),
+    # "min", "mean" или "max" по полю и список целевых температур, °C
+    "events": [{"quantity": "probe", "x": None, "targets": [37.0]}],
+    # Остановить расчет, когда все целевые температуры достигнуты
+    "stop_at_events": False,
+    # Считать в отдельном рабочем процессе (интерфейс не блокируется, результаты - в разделяемой памяти)
+    "run_in_worker_process": False,
+    # Адрес сервера заданий (job_server.py), например "http://127.0.0.1:8765" (None - считать локально)
+    "job_server_url": None,
+    # Период опроса сервера заданий, мс
+    "job_poll_interval": 500,
+    # Число потоков для шага схемы (1 - последовательный расчет); имеет смысл для сеток
+    # от сотен тысяч узлов, на малых сетках синхронизация потоков дороже самого шага
+    "threads": 1,
+    # Число процессов для серий расчетов (Монте-Карло, сходимость); None - по числу ядер
+    "parallel_workers": None,
+    # Монте-Карло: число реализаций, размер пакета (вариантов за один проход решателя),
+    # seed (None - случайный) и распределения параметров
+    # {"H": {"dist": "normal", "std": 5.0}, ...} (None - по умолчанию, см. monte_carlo.py)
+    "monte_carlo": {"samples": 1000, "batch_size": 50, "seed": None, "distributions": None},
+    # Проверка сходимости: число сеток, сколько из них мельче текущей, допустимая
+    # относительная ошибка итоговых энергии и КПД
+    "convergence_study": {"levels": 4, "finer": 1, "tolerance": 0.01},
+    # Рабочая область расчетов для сравнения: число расчетов, память под их ряды и профили, МБ,
+    # каталог для временной выгрузки давно не использовавшихся (None - удалять), число моментов в рядах
+    "run_workspace": {"max_runs": 20, "memory_limit_mb": 200, "spill_dir": None, "series_points": 2000},
+    # Журналы измерений SCADA: строк в части при чтении, интервал усреднения, с, наибольшее
+    # число хранимых моментов, каталог кэша (None - рядом с журналом)
+    "measured_log": {"chunk_rows": 200000, "bin_seconds": 60.0, "max_points": 100000, "cache_dir": None},
+}
+
+SOLVER_OPTIONS_FILE = "solver_options.json"
+
+
+def load_solver_options(filename=SOLVER_OPTIONS_FILE):
+    """Загрузка настроек решателя из JSON-файла поверх значений по умолчанию"""
+    options = dict(DEFAULT_SOLVER_OPTIONS)
+    if not os.path.exists(filename):
+        return options
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            user_options = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка чтения настроек решателя {filename}: {e}")
+        return options
+
+    for key, value in user_options.items():
+        if key not in DEFAULT_SOLVER_OPTIONS:
+            print(f"Предупреждение: неизвестная настройка решателя '{key}' пропущена")
+            continue
+        options[key] = value
+    return options
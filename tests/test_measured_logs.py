@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pytest
+
+from measured_logs import cache_filename, load_measured_log
+
+
+def write_log(path, rows=600, step=10.0):
+    """Журнал SCADA: даты с шагом step, с, два датчика с координатой и один без нее"""
+    start = np.datetime64("2024-03-01T00:00:00")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Время;T1 x=0,00 м;T2 x=0,50 м;T наружн.\n")
+        for k in range(rows):
+            stamp = (start + np.timedelta64(int(k * step), "s")).astype("datetime64[s]").item()
+            values = [20.0 + k * 0.01, 30.0 - k * 0.01, "---" if k % 7 == 0 else 5.0]
+            cells = [str(v).replace(".", ",") for v in values]
+            f.write(f"{stamp.strftime('%d.%m.%Y %H:%M:%S')};{';'.join(cells)}\n")
+
+
+def same_log(a, b):
+    np.testing.assert_array_equal(a.t, b.t)
+    np.testing.assert_array_equal(a.T, b.T)
+    np.testing.assert_array_equal(a.x, b.x)
+    assert (a.names, a.start, a.rows) == (b.names, b.start, b.rows)
+
+
+def test_cache_round_trip(tmp_path):
+    log_file = str(tmp_path / "scada.csv")
+    write_log(log_file)
+    cache_dir = str(tmp_path / "cache")
+
+    assert load_measured_log(log_file, cache_dir=cache_dir, cached_only=True) is None
+    log = load_measured_log(log_file, cache_dir=cache_dir)
+    assert os.path.exists(cache_filename(log_file, cache_dir))
+    assert log.rows == 600
+    assert log.names == ["T1 x=0,00 м", "T2 x=0,50 м", "T наружн."]
+    np.testing.assert_array_equal(log.x[:2], [0.0, 0.5])
+    assert np.isnan(log.x[2])
+
+    cached = load_measured_log(log_file, cache_dir=cache_dir, cached_only=True)
+    assert isinstance(cached.t, np.memmap)
+    same_log(cached, log)
+
+
+def test_cache_invalidated_by_settings_and_changes(tmp_path):
+    log_file = str(tmp_path / "scada.csv")
+    write_log(log_file)
+    load_measured_log(log_file, cache_dir=str(tmp_path))
+    # Другой интервал усреднения - другой ключ кэша
+    assert load_measured_log(log_file, bin_seconds=120.0, cache_dir=str(tmp_path), cached_only=True) is None
+
+    write_log(log_file, rows=300)
+    assert load_measured_log(log_file, cache_dir=str(tmp_path), cached_only=True) is None
+    assert load_measured_log(log_file, cache_dir=str(tmp_path)).rows == 300
+
+
+def test_times_start_at_first_bin(tmp_path):
+    log_file = str(tmp_path / "scada.csv")
+    write_log(log_file)
+    log = load_measured_log(log_file, cache_dir=str(tmp_path), bin_seconds=60.0)
+    # Записи по 10 с усредняются по минутам: первый момент - середина первой минуты
+    assert log.t[0] == 0.0
+    assert log.start == "2024-03-01T00:00:25"
+    np.testing.assert_allclose(np.diff(log.t), 60.0)
+    values = log.resample([0.0, 30.0])
+    assert np.all(np.isfinite(values[:, :2]))
+    assert values[0, 0] == pytest.approx(20.025, abs=1e-4)
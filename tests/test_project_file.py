@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from project_file import Project, load_project, maps_file, result_in_memory, save_project
+from solver import HeatSolver
+from solver_options import DEFAULT_SOLVER_OPTIONS
+
+PARAMS = {"T_wall": 40.0, "L": 0.5, "T_init": 20.0, "rho": 1000.0, "H": 50.0, "Cp_dry": 2500.0,
+          "lambda_dry": 0.3, "dx": 0.01, "dt": 10.0, "t_max": 7200.0}
+INPUTS = {"line_edit_temperatur_walls": "40", "line_edit_time_step": "10"}
+OVERRIDES = {"material": "Навоз КРС"}
+
+
+def run(**options):
+    events = [{"quantity": "probe", "x": None, "targets": [21.0, 39.0]}]
+    return HeatSolver(PARAMS, dict(DEFAULT_SOLVER_OPTIONS, events=events, **options)).run()
+
+
+def assert_same_result(loaded, result):
+    for name in ("x", "energy", "eta", "T_final", "probe_x", "probe_values"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(result, name))
+    assert loaded.params == result.params
+    assert loaded.Q_heating == result.Q_heating
+    assert loaded.events == result.events
+    for (n, profile), (m, expected) in zip(loaded.profiles(), result.profiles()):
+        assert n == m
+        np.testing.assert_array_equal(profile, expected)
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"history_precision": "int16"},
+    {"history_mode": "snapshots", "history_precision": "float32"},
+])
+def test_round_trip(tmp_path, options):
+    result = run(**options)
+    filename = str(tmp_path / "case.bgproj")
+    save_project(filename, Project(INPUTS, OVERRIDES, result))
+
+    project = load_project(filename)
+    assert project.inputs == INPUTS
+    assert project.overrides == OVERRIDES
+    assert_same_result(project.result, result)
+    # Массивы отображаются в память, а не читаются целиком
+    assert isinstance(project.result.energy, np.memmap)
+    assert maps_file(project.result, filename)
+
+
+def test_project_without_result(tmp_path):
+    filename = str(tmp_path / "empty.bgproj")
+    save_project(filename, Project(INPUTS, {}))
+    project = load_project(filename)
+    assert project.result is None
+    assert project.inputs == INPUTS
+
+
+def test_resave_open_project(tmp_path):
+    result = run()
+    filename = str(tmp_path / "case.bgproj")
+    save_project(filename, Project(INPUTS, {}, result))
+
+    opened = load_project(filename).result
+    copy = result_in_memory(opened)
+    assert not maps_file(copy, filename)
+    del opened
+    save_project(filename, Project(INPUTS, {"threads": 2}, copy))
+    project = load_project(filename)
+    assert project.overrides == {"threads": 2}
+    assert_same_result(project.result, result)
+
+
+def test_not_a_project(tmp_path):
+    filename = tmp_path / "other.bgproj"
+    filename.write_bytes(b"not a project file")
+    with pytest.raises(ValueError):
+        load_project(str(filename))
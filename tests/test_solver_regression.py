@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from solver import HeatSolver
+from solver_options import DEFAULT_SOLVER_OPTIONS
+
+# Конфигурация по умолчанию из полей ввода: L 1 м, T стенки 40 °C, T нач. 20 °C, dt 10 с, 10 ч
+DEFAULT_PARAMS = {"T_wall": 40.0, "L": 1.0, "T_init": 20.0, "rho": 1000.0, "H": 50.0, "Cp_dry": 2500.0,
+                  "lambda_dry": 0.3, "dx": 0.01, "dt": 10.0, "t_max": 36000.0}
+
+# Значения исходной схемы (расчет в calculations.py до выделения HeatSolver)
+BASELINE_STEPS = [0, 1, 10, 100, 1000, 3599]
+BASELINE_ENERGY = [17550.0, 34874.266870765015, 181511.2505307456, 1157912.067601927, 4839388.745288199,
+                   9740484.963429285]
+BASELINE_ETA = [0.9929311620810071, 0.992976683562981, 0.993231451760159, 0.9919803432421888,
+                0.988267543337617, 0.9871289590396406]
+BASELINE_NODES = [0, 1, 2, 25, 50, 99, 100]
+BASELINE_T = {
+    1: [40.0, 20.518156341072306, 20.00344501804772, 20.0, 20.0, 20.518156341072306, 40.0],
+    100: [40.0, 30.757914067352786, 24.518755526525148, 20.0, 20.0, 30.757914067352786, 40.0],
+    3599: [40.0, 38.366777647462094, 36.75046791623176, 20.207170144409147, 20.000014162356894,
+           38.366777647462094, 40.0],
+}
+BASELINE_Q_HEATING = 9867489.829196807
+BASELINE_SUMS = {"energy": 22646396646.713524, "eta": 3557.257991515082, "T": 8093427.36005724}
+
+
+@pytest.fixture(scope="module")
+def result():
+    return HeatSolver(DEFAULT_PARAMS, dict(DEFAULT_SOLVER_OPTIONS)).run()
+
+
+def test_grid(result):
+    assert result.Nt == 3600
+    assert result.x.shape == (101,)
+    assert len(result.T_history) == 3600
+
+
+def test_history_matches_baseline(result):
+    history = np.asarray(result.T_history[:])
+    for n, values in BASELINE_T.items():
+        np.testing.assert_array_equal(history[n, BASELINE_NODES], values)
+    assert history.sum() == pytest.approx(BASELINE_SUMS["T"], rel=1e-14)
+
+
+def test_energy_and_eta_match_baseline(result):
+    # Суммы энергии по узлам могут отличаться порядком сложения - только в последних разрядах
+    np.testing.assert_allclose(result.energy[BASELINE_STEPS], BASELINE_ENERGY, rtol=1e-13)
+    np.testing.assert_allclose(result.eta[BASELINE_STEPS], BASELINE_ETA, rtol=1e-13)
+    assert result.energy.sum() == pytest.approx(BASELINE_SUMS["energy"], rel=1e-13)
+    assert result.eta.sum() == pytest.approx(BASELINE_SUMS["eta"], rel=1e-13)
+    assert result.Q_heating == pytest.approx(BASELINE_Q_HEATING, rel=1e-14)